@@ -10,7 +10,7 @@ from pydantic import BaseModel, Field
 import uuid
 
 from utils.database import get_db
-from services.scoring_service import ScoringService
+from services.scoring_service import get_evidence_batch_size, iter_chunks
 from services.role_matching_service import RoleMatchingService
 from models.database_models import Student
 
@@ -28,6 +28,8 @@ class BulkScoreRequest(BaseModel):
     student_ids: Optional[List[str]] = None
     branch: Optional[str] = None
     batch_year: Optional[int] = None
+    full_recompute: bool = False  # Rescore every skill instead of only changed ones
+    min_compatibility: float = Field(60.0, ge=0.0, le=100.0)  # For refreshed role matches
 
 class BulkMatchRequest(BaseModel):
     student_ids: Optional[List[str]] = None
@@ -68,6 +70,13 @@ async def bulk_calculate_scores(
     """
     Bulk recalculate skill scores for multiple students
     
+    By default only skills whose evidence changed since they were last
+    scored are recalculated, and saved role matches are refreshed for the
+    roles using them. full_recompute rescores every skill. In both modes
+    a skill whose last piece of evidence was removed (e.g. a deleted
+    project) has its StudentSkill row removed rather than keeping the old
+    score.
+    
     This is a heavy operation, so it runs in the background
     """
     try:
@@ -83,16 +92,24 @@ async def bulk_calculate_scores(
             raise HTTPException(status_code=404, detail="No students found matching criteria")
         
         # Run scoring in background
+        # Students are scored in chunks that each read every evidence source
+        # with one IN query, instead of five queries per student
         def process_scores():
-            scoring_service = ScoringService(db)
+            matching_service = RoleMatchingService(db)
+            scoring_service = matching_service.scoring_service
+            student_ids = [student.id for student in students]
             processed = 0
             
-            for student in students:
+            for chunk in iter_chunks(student_ids, get_evidence_batch_size()):
                 try:
-                    scoring_service.update_student_skill_scores(student.id)
-                    processed += 1
+                    if request.full_recompute:
+                        scoring_service.update_scores_batch(chunk)
+                    else:
+                        matching_service.refresh_changed_students(chunk, request.min_compatibility)
+                    processed += len(chunk)
                 except Exception as e:
-                    print(f"Error processing student {student.id}: {str(e)}")
+                    db.rollback()
+                    print(f"Error processing students {chunk[0]}..{chunk[-1]}: {str(e)}")
             
             print(f"Bulk scoring complete: {processed}/{len(students)} students")
         
@@ -102,6 +119,7 @@ async def bulk_calculate_scores(
             'status': 'success',
             'message': f'Score calculation started for {len(students)} students',
             'student_count': len(students),
+            'mode': 'full' if request.full_recompute else 'incremental',
             'note': 'Processing in background. Scores will be updated shortly.'
         })
     
@@ -4,12 +4,16 @@ Handles CSV uploads and file uploads
 """
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Form
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from pydantic import BaseModel
 from typing import List, Optional
 import io
+import uuid
 
 from services.csv_upload_service import CSVUploadService, CSVValidationError
 from services.file_storage_service import FileStorageService
+from services.syllabus_pipeline import SyllabusPipeline
 from utils.database import get_db
 
 router = APIRouter(prefix="/api/ingestion", tags=["Data Ingestion"])
@@ -214,6 +218,36 @@ async def list_files(
     })
 
 
+class SyllabusMapRequest(BaseModel):
+    course_ids: Optional[List[str]] = None  # Default: every course with a syllabus
+    force: bool = False  # Re-extract unchanged syllabi
+
+
+@router.post("/syllabi/map")
+async def map_syllabi(
+    data: SyllabusMapRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Map course syllabi in storage to skills
+    
+    Syllabi are streamed page by page; files whose content and mapping
+    rules are unchanged since the last run are skipped.
+    
+    Returns:
+        Counts of mapped / unchanged / failed courses and per-course results
+    """
+    try:
+        course_ids = [uuid.UUID(c) for c in data.course_ids] if data.course_ids is not None else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid course ID format")
+    
+    pipeline = SyllabusPipeline(db, storage=storage_service)
+    summary = await run_in_threadpool(pipeline.ingest_courses, course_ids, data.force)
+    
+    return JSONResponse(content={'status': 'success', **summary})
+
+
 @router.get("/templates/download")
 async def download_template(template_type: str):
     """
@@ -4,9 +4,11 @@ REST API for skill management
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
+import os
 import uuid
 
 from utils.database import get_db
@@ -14,11 +16,15 @@ from services.skill_service import SkillService
 from services.skill_extraction_service import SkillExtractionService
 from services.certification_mapper import CertificationMapper
 from services.course_skill_mapper import CourseSkillMapper
+from services.model_registry import get_batching_metrics
 
 router = APIRouter(prefix="/api/skills", tags=["Skills"])
 
 
 # Pydantic models
+class SkillAliasCreate(BaseModel):
+    alias: str = Field(..., min_length=1, max_length=100)
+
 class AssessmentSubmit(BaseModel):
     student_id: str
     skill_id: str
@@ -26,13 +32,20 @@ class AssessmentSubmit(BaseModel):
     score: int = Field(..., ge=0, le=100)
     metadata: Optional[Dict[str, Any]] = None
 
+# Extraction modes: fast (exact), balanced (+ fuzzy), full (+ semantic)
+EXTRACTION_MODE_PATTERN = "^(fast|balanced|full)$"
+
 class ExtractFromProject(BaseModel):
     project_description: str
     student_id: Optional[str] = None
+    mode: str = Field('full', pattern=EXTRACTION_MODE_PATTERN)
+    deadline_ms: Optional[int] = Field(None, ge=1, le=60000)
 
 class ExtractFromResume(BaseModel):
     resume_text: str
     student_id: Optional[str] = None
+    mode: str = Field('full', pattern=EXTRACTION_MODE_PATTERN)
+    deadline_ms: Optional[int] = Field(None, ge=1, le=60000)
 
 class ExtractFromCertification(BaseModel):
     certification_title: str
@@ -45,6 +58,45 @@ class ExtractFromCourse(BaseModel):
     syllabus: Optional[str] = None
     student_id: Optional[str] = None
 
+class BatchExtractItem(BaseModel):
+    id: str
+    text: str
+    source: str = Field('project', pattern="^(project|resume|internship|course)$")
+
+class ExtractBatch(BaseModel):
+    items: List[BatchExtractItem] = Field(..., min_length=1, max_length=1000)
+    min_confidence: float = Field(0.6, ge=0.0, le=1.0)
+    mode: str = Field('full', pattern=EXTRACTION_MODE_PATTERN)
+
+
+def _extraction_deadline(requested: Optional[int]) -> Optional[int]:
+    """Request deadline, falling back to EXTRACTION_DEADLINE_MS"""
+    if requested is not None:
+        return requested
+    default = os.getenv('EXTRACTION_DEADLINE_MS')
+    return int(default) if default else None
+
+
+def _extraction_response(result, mode: str) -> JSONResponse:
+    """Response body for a deadline-bounded extraction"""
+    return JSONResponse(content={
+        'status': 'success',
+        'mode': mode,
+        'degraded': result.degraded,
+        'skipped_stages': result.skipped_stages,
+        'skills_found': len(result.matches),
+        'skills': [
+            {
+                'skill_id': m.skill_id,
+                'skill_name': m.skill_name,
+                'confidence': round(m.confidence, 3),
+                'evidence': m.evidence_text,
+                'match_type': m.match_type
+            }
+            for m in result.matches
+        ]
+    })
+
 
 @router.get("/")
 async def get_skills(
@@ -117,6 +169,69 @@ async def get_skill_stats(
         raise HTTPException(status_code=400, detail="Invalid skill ID format")
 
 
+@router.get("/{skill_id}/aliases")
+async def get_skill_aliases(
+    skill_id: str,
+    db: Session = Depends(get_db)
+):
+    """Get aliases (abbreviations, synonyms) of a skill"""
+    try:
+        aliases = SkillService.get_skill_aliases(db, uuid.UUID(skill_id))
+        
+        return JSONResponse(content={
+            'status': 'success',
+            'count': len(aliases),
+            'aliases': [{'id': str(a.id), 'alias': a.alias} for a in aliases]
+        })
+    
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid skill ID format")
+
+
+@router.post("/{skill_id}/aliases")
+async def add_skill_alias(
+    skill_id: str,
+    data: SkillAliasCreate,
+    db: Session = Depends(get_db)
+):
+    """Add an alias that extraction will match like the skill name"""
+    try:
+        skill_uuid = uuid.UUID(skill_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid skill ID format")
+    
+    if not SkillService.get_skill_by_id(db, skill_uuid):
+        raise HTTPException(status_code=404, detail="Skill not found")
+    
+    try:
+        alias = SkillService.add_skill_alias(db, skill_uuid, data.alias)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    return JSONResponse(content={
+        'status': 'success',
+        'alias': {'id': str(alias.id), 'skill_id': str(alias.skill_id), 'alias': alias.alias}
+    })
+
+
+@router.delete("/{skill_id}/aliases/{alias_id}")
+async def delete_skill_alias(
+    skill_id: str,
+    alias_id: str,
+    db: Session = Depends(get_db)
+):
+    """Remove an alias from a skill"""
+    try:
+        deleted = SkillService.delete_skill_alias(db, uuid.UUID(skill_id), uuid.UUID(alias_id))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid ID format")
+    
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Alias not found")
+    
+    return JSONResponse(content={'status': 'success', 'message': 'Alias deleted'})
+
+
 @router.post("/assessments")
 async def submit_assessment(
     assessment: AssessmentSubmit,
@@ -155,25 +270,26 @@ async def extract_skills_from_project(
     data: ExtractFromProject,
     db: Session = Depends(get_db)
 ):
-    """Extract skills from project description using NLP"""
+    """
+    Extract skills from project description using NLP
+    
+    The mode trades recall for latency: 'fast' runs exact matching only
+    (interactive tag suggestions), 'balanced' adds fuzzy matching and
+    'full' adds spaCy preprocessing and semantic matching. With a
+    deadline_ms (or EXTRACTION_DEADLINE_MS), stages that would not fit in
+    the budget are skipped and the response is flagged as degraded.
+    """
     try:
         extraction_service = SkillExtractionService(db)
-        matches = extraction_service.extract_from_project(data.project_description)
+        # Run off the event loop so concurrent requests can share encode batches
+        result = await run_in_threadpool(
+            extraction_service.extract_skills_with_deadline,
+            data.project_description, 'project',
+            deadline_ms=_extraction_deadline(data.deadline_ms),
+            mode=data.mode
+        )
         
-        return JSONResponse(content={
-            'status': 'success',
-            'skills_found': len(matches),
-            'skills': [
-                {
-                    'skill_id': m.skill_id,
-                    'skill_name': m.skill_name,
-                    'confidence': round(m.confidence, 3),
-                    'evidence': m.evidence_text,
-                    'match_type': m.match_type
-                }
-                for m in matches
-            ]
-        })
+        return _extraction_response(result, data.mode)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Extraction failed: {str(e)}")
 
@@ -183,29 +299,78 @@ async def extract_skills_from_resume(
     data: ExtractFromResume,
     db: Session = Depends(get_db)
 ):
-    """Extract skills from resume/CV text using NLP"""
+    """Extract skills from resume/CV text using NLP (see project endpoint for modes and deadlines)"""
+    try:
+        extraction_service = SkillExtractionService(db)
+        # Run off the event loop so concurrent requests can share encode batches
+        result = await run_in_threadpool(
+            extraction_service.extract_skills_with_deadline,
+            data.resume_text, 'resume',
+            deadline_ms=_extraction_deadline(data.deadline_ms),
+            mode=data.mode
+        )
+        
+        return _extraction_response(result, data.mode)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Extraction failed: {str(e)}")
+
+
+@router.post("/extract/batch")
+async def extract_skills_batch(
+    data: ExtractBatch,
+    db: Session = Depends(get_db)
+):
+    """
+    Extract skills from many texts in one request
+    
+    Intended for bulk imports: all texts are preprocessed and encoded in
+    a single batch instead of one round trip per document.
+    """
     try:
         extraction_service = SkillExtractionService(db)
-        matches = extraction_service.extract_from_resume(data.resume_text)
+        results = await run_in_threadpool(
+            extraction_service.extract_skills_batch,
+            [(item.text, item.source) for item in data.items],
+            min_confidence=data.min_confidence,
+            mode=data.mode
+        )
         
         return JSONResponse(content={
             'status': 'success',
-            'skills_found': len(matches),
-            'skills': [
+            'mode': data.mode,
+            'count': len(results),
+            'results': [
                 {
-                    'skill_id': m.skill_id,
-                    'skill_name': m.skill_name,
-                    'confidence': round(m.confidence, 3),
-                    'evidence': m.evidence_text,
-                    'match_type': m.match_type
+                    'id': item.id,
+                    'source': item.source,
+                    'skills_found': len(matches),
+                    'skills': [
+                        {
+                            'skill_id': m.skill_id,
+                            'skill_name': m.skill_name,
+                            'confidence': round(m.confidence, 3),
+                            'evidence': m.evidence_text,
+                            'match_type': m.match_type
+                        }
+                        for m in matches
+                    ]
                 }
-                for m in matches
+                for item, matches in zip(data.items, results)
             ]
         })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Extraction failed: {str(e)}")
 
 
+@router.get("/extract/metrics")
+async def get_extraction_metrics():
+    """Embedding micro-batching metrics (batch sizes and queue wait)"""
+    return JSONResponse(content={
+        'status': 'success',
+        'batching': get_batching_metrics()
+    })
+
+
 @router.post("/extract/certification")
 async def extract_skills_from_certification(
     data: ExtractFromCertification,
@@ -0,0 +1,80 @@
+"""
+Vector Index Benchmark
+Compares recall and latency of the brute force and IVF skill indexes on a
+synthetic taxonomy
+
+Usage:
+    python benchmark_vector_index.py [--skills 50000] [--dim 384] [--queries 200]
+"""
+import argparse
+import time
+import numpy as np
+
+from services.vector_index import BruteForceIndex, IVFIndex
+
+
+def make_vectors(count: int, dim: int, clusters: int, rng) -> np.ndarray:
+    """Normalized vectors grouped around random centres, like related skills"""
+    centres = rng.normal(size=(clusters, dim))
+    vectors = centres[rng.integers(clusters, size=count)] + 0.5 * rng.normal(size=(count, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def time_search(index, queries: np.ndarray, k: int):
+    """Search one query at a time (as extraction does per window) and time it"""
+    latencies = []
+    positions = []
+    for query in queries:
+        start = time.perf_counter()
+        _, result = index.search(query[None, :], k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        positions.append(result[0])
+    return np.array(positions), np.array(latencies)
+
+
+def run(skills: int, dim: int, queries: int, k: int):
+    rng = np.random.default_rng(0)
+    clusters = max(10, skills // 100)
+    vectors = make_vectors(skills, dim, clusters, rng)
+    query_vectors = make_vectors(queries, dim, clusters, rng)
+    keys = list(range(skills))
+
+    print("\n" + "="*60)
+    print(f"{skills} skills, {dim} dimensions, {queries} queries, top {k}")
+    print("="*60)
+
+    start = time.perf_counter()
+    brute_force = BruteForceIndex(keys, vectors)
+    print(f"\nBrute force build: {(time.perf_counter() - start) * 1000:.1f} ms")
+    exact, exact_latency = time_search(brute_force, query_vectors, k)
+    print(f"Brute force search: p50 {np.percentile(exact_latency, 50):.2f} ms, "
+          f"p95 {np.percentile(exact_latency, 95):.2f} ms")
+
+    start = time.perf_counter()
+    ivf = IVFIndex(keys, vectors)
+    print(f"\nIVF build ({ivf.n_lists} lists): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for n_probe in (1, 4, 8, 16, 32):
+        ivf.n_probe = n_probe
+        approximate, latency = time_search(ivf, query_vectors, k)
+        recall = np.mean([len(set(a) & set(e)) / k for a, e in zip(approximate, exact)])
+        print(f"IVF n_probe={n_probe:<3} recall@{k} {recall:.3f}, "
+              f"p50 {np.percentile(latency, 50):.2f} ms, p95 {np.percentile(latency, 95):.2f} ms")
+
+    # Incremental add of 1% new skills
+    added = make_vectors(max(1, skills // 100), dim, clusters, rng)
+    start = time.perf_counter()
+    ivf.add(list(range(skills, skills + len(added))), added)
+    print(f"\nIVF incremental add of {len(added)} skills: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark skill vector indexes")
+    parser.add_argument('--skills', type=int, default=50000)
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    for size in sorted({1000, 10000, args.skills}):
+        run(size, args.dim, args.queries, args.k)
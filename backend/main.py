@@ -19,6 +19,7 @@ from api.roles import router as roles_router
 from api.auth import router as auth_router
 from api.bulk_operations import router as bulk_router
 from api.analytics import router as analytics_router
+from services.model_registry import warm_up_models
 
 # Create FastAPI app
 app = FastAPI(
@@ -49,6 +50,16 @@ app.include_router(roles_router)
 app.include_router(bulk_router)      # Bulk operations for TPO
 app.include_router(analytics_router)  # Analytics for TPO dashboard
 
+# Load NLP models once per worker before serving requests
+@app.on_event("startup")
+async def warm_up_nlp_models():
+    """
+    Warm up shared NLP models at startup
+    """
+    if os.getenv('WARM_UP_MODELS', 'True') == 'True':
+        status = warm_up_models()
+        print(f"NLP models warmed up: {status}")
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
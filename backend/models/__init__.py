@@ -4,7 +4,10 @@ Initialize models package
 from .database_models import (
     Student,
     Course,
+    CourseSkill,
+    CourseSkillSync,
     Skill,
+    SkillAlias,
     StudentSkill,
     IndustryRole,
     StudentRoleMatch,
@@ -15,13 +18,21 @@ from .database_models import (
     Internship,
     User,
     AuditLog,
-    SkillMappingOverride
+    SkillMappingOverride,
+    ExtractionCacheEntry,
+    SkillEvidence,
+    EvidenceSync,
+    EvidenceChange,
+    SkillScoreChange
 )
 
 __all__ = [
     "Student",
     "Course",
+    "CourseSkill",
+    "CourseSkillSync",
     "Skill",
+    "SkillAlias",
     "StudentSkill",
     "IndustryRole",
     "StudentRoleMatch",
@@ -32,5 +43,10 @@ __all__ = [
     "Internship",
     "User",
     "AuditLog",
-    "SkillMappingOverride"
+    "SkillMappingOverride",
+    "ExtractionCacheEntry",
+    "SkillEvidence",
+    "EvidenceSync",
+    "EvidenceChange",
+    "SkillScoreChange"
 ]
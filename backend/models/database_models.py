@@ -2,7 +2,7 @@
 SQLAlchemy Database Models
 Maps to the PostgreSQL schema created in Phase 1
 """
-from sqlalchemy import Column, String, Integer, DECIMAL, Boolean, DateTime, ForeignKey, CheckConstraint, Text, Date
+from sqlalchemy import Column, String, Integer, DECIMAL, Boolean, DateTime, ForeignKey, CheckConstraint, Text, Date, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSONB, INET
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -54,11 +54,46 @@ class Course(Base):
     
     # Relationships
     student_courses = relationship("StudentCourse", back_populates="course")
+    skill_mappings = relationship("CourseSkill", back_populates="course", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<Course {self.course_code} - {self.course_name}>"
 
 
+class CourseSkill(Base):
+    """Skills mapped from a course, materialized once per course"""
+    __tablename__ = 'course_skills'
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    course_id = Column(UUID(as_uuid=True), ForeignKey('courses.id', ondelete='CASCADE'), nullable=False, index=True)
+    skill_id = Column(UUID(as_uuid=True), ForeignKey('skills.id', ondelete='CASCADE'), nullable=False)
+    confidence = Column(DECIMAL(3, 2), nullable=False)
+    match_type = Column(String(30), nullable=False)  # course_code_pattern, course_name_keyword, syllabus_keyword
+    evidence_text = Column(Text)
+    
+    # Relationships
+    course = relationship("Course", back_populates="skill_mappings")
+    skill = relationship("Skill")
+    
+    def __repr__(self):
+        return f"<CourseSkill {self.course_id} → {self.skill_id}: {self.confidence}>"
+
+
+class CourseSkillSync(Base):
+    """Inputs the course_skills rows of a course were computed from"""
+    __tablename__ = 'course_skill_sync'
+    
+    course_id = Column(UUID(as_uuid=True), ForeignKey('courses.id', ondelete='CASCADE'), primary_key=True)
+    rules_version = Column(String(64), nullable=False)  # Mapper rules and taxonomy version
+    source_hash = Column(String(64), nullable=False)  # Hash of code, name and syllabus URL
+    syllabus_hash = Column(String(64))  # Content hash of the last ingested syllabus
+    syllabus_rules_version = Column(String(64))  # Rules version the syllabus matches were computed with
+    mapped_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<CourseSkillSync {self.course_id} ({self.rules_version[:8]})>"
+
+
 class Skill(Base):
     """Skills taxonomy"""
     __tablename__ = 'skills'
@@ -74,11 +109,29 @@ class Skill(Base):
     # Relationships
     student_skills = relationship("StudentSkill", back_populates="skill")
     assessments = relationship("SkillAssessment", back_populates="skill")
+    aliases = relationship("SkillAlias", back_populates="skill", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<Skill {self.skill_name}>"
 
 
+class SkillAlias(Base):
+    """Alternative names for a skill (abbreviations, synonyms, tool names)"""
+    __tablename__ = 'skill_aliases'
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    skill_id = Column(UUID(as_uuid=True), ForeignKey('skills.id', ondelete='CASCADE'), nullable=False, index=True)
+    alias = Column(String(100), nullable=False)
+    alias_normalized = Column(String(100), unique=True, nullable=False)  # normalize_skill_name form; one skill per alias
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    skill = relationship("Skill", back_populates="aliases")
+    
+    def __repr__(self):
+        return f"<SkillAlias {self.alias} → {self.skill_id}>"
+
+
 class StudentSkill(Base):
     """Student skill scores with evidence"""
     __tablename__ = 'student_skills'
@@ -99,6 +152,8 @@ class StudentSkill(Base):
     __table_args__ = (
         CheckConstraint('raw_score BETWEEN 0 AND 100'),
         CheckConstraint('weighted_score BETWEEN 0 AND 100'),
+        # Conflict target of the bulk score upsert (same name as the schema's UNIQUE)
+        UniqueConstraint('student_id', 'skill_id', name='student_skills_student_id_skill_id_key'),
     )
     
     def __repr__(self):
@@ -301,3 +356,79 @@ class SkillMappingOverride(Base):
     
     def __repr__(self):
         return f"<Override {self.student_id} - {self.skill_id}: {self.original_score} → {self.overridden_score}>"
+
+
+class ExtractionCacheEntry(Base):
+    """Cached skill extraction results keyed by text and taxonomy version"""
+    __tablename__ = 'extraction_cache'
+    
+    cache_key = Column(String(64), primary_key=True)
+    text_hash = Column(String(64), nullable=False)
+    source = Column(String(30), nullable=False)
+    taxonomy_version = Column(String(64), nullable=False, index=True)
+    extractor_version = Column(String(100), nullable=False)
+    matches = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<ExtractionCacheEntry {self.cache_key[:12]} ({self.source})>"
+
+
+class SkillEvidence(Base):
+    """Skill evidence extracted from a student's records, stored for scoring"""
+    __tablename__ = 'skill_evidence'
+    __table_args__ = (
+        # Serves both per-student and per-(student, skill) lookups
+        Index('idx_skill_evidence_student_skill', 'student_id', 'skill_id'),
+    )
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    student_id = Column(UUID(as_uuid=True), ForeignKey('students.id', ondelete='CASCADE'), nullable=False)
+    skill_id = Column(UUID(as_uuid=True), ForeignKey('skills.id', ondelete='CASCADE'), nullable=False)
+    source_type = Column(String(20), nullable=False)  # project, certification, course, internship, assessment
+    source_id = Column(UUID(as_uuid=True), nullable=False)
+    confidence = Column(DECIMAL(5, 4), nullable=False)  # 0-1
+    evidence_date = Column(DateTime)  # Naive local time, as used by time decay
+    evidence_text = Column(Text)
+    
+    def __repr__(self):
+        return f"<SkillEvidence {self.student_id} → {self.skill_id} ({self.source_type})>"
+
+
+class EvidenceSync(Base):
+    """Version a student's stored evidence was fully built with"""
+    __tablename__ = 'evidence_sync'
+    
+    student_id = Column(UUID(as_uuid=True), ForeignKey('students.id', ondelete='CASCADE'), primary_key=True)
+    evidence_version = Column(String(64), nullable=False)  # Extractor, taxonomy and mapping rules
+    synced_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<EvidenceSync {self.student_id} ({self.evidence_version[:12]})>"
+
+
+class EvidenceChange(Base):
+    """A source record changed since its evidence was extracted"""
+    __tablename__ = 'evidence_changes'
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    student_id = Column(UUID(as_uuid=True), ForeignKey('students.id', ondelete='CASCADE'), nullable=False, index=True)
+    source_type = Column(String(20), nullable=False)  # project, certification, course, internship, assessment
+    source_id = Column(UUID(as_uuid=True), nullable=False)  # Record ID (course ID for enrollments)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<EvidenceChange {self.student_id} {self.source_type} {self.source_id}>"
+
+
+class SkillScoreChange(Base):
+    """A (student, skill) pair whose evidence changed since its score was written"""
+    __tablename__ = 'skill_score_changes'
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    student_id = Column(UUID(as_uuid=True), ForeignKey('students.id', ondelete='CASCADE'), nullable=False, index=True)
+    skill_id = Column(UUID(as_uuid=True), ForeignKey('skills.id', ondelete='CASCADE'), nullable=False)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<SkillScoreChange {self.student_id} → {self.skill_id}>"
@@ -0,0 +1,86 @@
+"""
+Embedding Quantization Report
+Compares float32, float16 and int8 skill embedding storage on the seed
+taxonomy and the sample project / internship descriptions: memory per
+worker, similarity error and agreement of the semantic matching decisions
+
+Usage:
+    python report_embedding_quantization.py [--top-k 10]
+"""
+import os
+import re
+import csv
+import argparse
+import numpy as np
+
+from services.embedding_quantization import QuantizedMatrix, STORAGE_DTYPES
+from services.model_registry import get_semantic_model, get_semantic_model_name
+from services.skill_extraction_service import SkillExtractionService
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SEED_SKILLS = os.path.join(BASE_DIR, '..', 'database', 'seed_skills.sql')
+TEMPLATES = os.path.join(BASE_DIR, 'data_templates')
+
+
+def load_seed_skills():
+    """(name, description) pairs from the seed taxonomy"""
+    with open(SEED_SKILLS, encoding='utf-8') as f:
+        return re.findall(r"^\('([^']*)', '[^']*', '([^']*)'", f.read(), re.MULTILINE)
+
+
+def load_sample_descriptions():
+    """Project abstracts and internship descriptions from the import templates"""
+    descriptions = []
+    for filename, column in (('projects_template.csv', 'Project Abstract'),
+                             ('internships_template.csv', 'Description')):
+        with open(os.path.join(TEMPLATES, filename), encoding='utf-8') as f:
+            descriptions.extend(row[column] for row in csv.DictReader(f) if row.get(column))
+    return descriptions
+
+
+def main(top_k: int):
+    model = get_semantic_model()
+    if model is None:
+        print("❌ ERROR: Could not load the semantic model")
+        return
+
+    skills = load_seed_skills()
+    descriptions = load_sample_descriptions()
+    print("\n" + " EMBEDDING QUANTIZATION REPORT ".center(60, "="))
+    print(f"Model: {get_semantic_model_name()}")
+    print(f"{len(skills)} skills, {len(descriptions)} descriptions, top {top_k}")
+
+    skill_matrix = model.encode([f"{name} {description}" for name, description in skills],
+                                normalize_embeddings=True)
+    documents = model.encode(descriptions, normalize_embeddings=True)
+
+    exact = documents @ skill_matrix.T
+    exact_top = np.argsort(-exact, axis=1)[:, :top_k]
+    exact_matches = exact >= SkillExtractionService.SEMANTIC_THRESHOLD
+
+    # Bytes per skill row, to project memory for larger taxonomies
+    print(f"\n{'dtype':<8} {'bytes/skill':>11} {'50k skills':>11} {'max err':>9} "
+          f"{'mean err':>9} {'top-k':>7} {'decisions':>10}")
+    for dtype in STORAGE_DTYPES:
+        quantized = QuantizedMatrix.quantize(skill_matrix, dtype)
+        approx = quantized.dot(documents)
+
+        error = np.abs(approx - exact)
+        approx_top = np.argsort(-approx, axis=1)[:, :top_k]
+        overlap = np.mean([len(set(a) & set(e)) / top_k for a, e in zip(approx_top, exact_top)])
+        agreement = np.mean((approx >= SkillExtractionService.SEMANTIC_THRESHOLD) == exact_matches)
+        bytes_per_row = quantized.nbytes / len(quantized)
+
+        print(f"{dtype:<8} {bytes_per_row:>11.0f} {bytes_per_row * 50000 / 2**20:>9.1f}MB "
+              f"{error.max():>9.5f} {error.mean():>9.6f} {overlap:>7.3f} {agreement:>10.4f}")
+
+    print("\nerr: absolute cosine similarity error against float32")
+    print("top-k: overlap of each description's top-k skills with float32")
+    print(f"decisions: agreement on similarity >= {SkillExtractionService.SEMANTIC_THRESHOLD}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report accuracy vs memory of embedding storage types")
+    parser.add_argument('--top-k', type=int, default=10)
+    args = parser.parse_args()
+    main(args.top_k)
@@ -2,12 +2,14 @@
 Certification to Skill Mapper
 Maps known certifications to predefined skill sets
 """
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
+import re
 from fuzzywuzzy import fuzz
 from sqlalchemy.orm import Session
 
-from models.database_models import Skill
+from services.skill_matchers import FuzzyCandidateIndex
+from services.taxonomy_service import TaxonomySkill, get_taxonomy_snapshot
 
 @dataclass
 class CertificationMapping:
@@ -164,6 +166,22 @@ class CertificationMapper:
         ),
     ]
     
+    # Lowest fuzz.partial_ratio between pattern and title that counts as a match
+    MATCH_THRESHOLD = 85
+    
+    REPUTABLE_PROVIDERS = frozenset([
+        'google', 'microsoft', 'amazon', 'aws', 'ibm', 'oracle',
+        'meta', 'facebook', 'coursera', 'udacity', 'edx',
+        'linkedin', 'salesforce', 'cisco', 'comptia', 'pmi',
+        'scrum.org', 'autodesk', 'adobe', 'red hat'
+    ])
+    
+    # Any reputable name contained in the provider, in one regex pass
+    _REPUTABLE_PATTERN = re.compile('|'.join(re.escape(name) for name in sorted(REPUTABLE_PROVIDERS)))
+    
+    # n-gram index over CERT_MAPPINGS patterns, built on first use
+    _pattern_index = None
+    
     def __init__(self, db: Session):
         """
         Initialize certification mapper
@@ -172,25 +190,46 @@ class CertificationMapper:
             db: Database session for skill lookups
         """
         self.db = db
-        self._skill_cache = {}
     
-    def _get_skill_by_name(self, skill_name: str) -> Optional[Skill]:
+    def _get_skill_by_name(self, skill_name: str) -> Optional[TaxonomySkill]:
         """
-        Get skill from database by name (cached)
+        Get skill by name or alias from the shared taxonomy snapshot
         
         Args:
             skill_name: Name of skill to find
             
         Returns:
-            Skill object or None
+            TaxonomySkill or None
+        """
+        return get_taxonomy_snapshot(self.db).resolve(skill_name)
+    
+    @classmethod
+    def _get_pattern_index(cls) -> FuzzyCandidateIndex:
+        """n-gram index shortlisting the patterns a title could match"""
+        if cls._pattern_index is None:
+            cls._pattern_index = FuzzyCandidateIndex(
+                ((mapping.cert_pattern, index) for index, mapping in enumerate(cls.CERT_MAPPINGS)),
+                min_score=cls.MATCH_THRESHOLD
+            )
+        return cls._pattern_index
+    
+    def _score_title(self, cert_lower: str) -> List[Tuple[CertificationMapping, int]]:
         """
-        if skill_name not in self._skill_cache:
-            skill = self.db.query(Skill).filter(
-                Skill.skill_name.ilike(f"%{skill_name}%")
-            ).first()
-            self._skill_cache[skill_name] = skill
+        Patterns matching a lowercased title, with their similarity
         
-        return self._skill_cache[skill_name]
+        Only patterns shortlisted by the n-gram index are scored; the index
+        never prunes a pattern that would reach MATCH_THRESHOLD. The
+        shortlist stands in for a vectorized scorer: fuzzywuzzy's
+        partial_ratio has no batched form, and a batched scorer from
+        another library aligns substrings differently and would change
+        which titles match.
+        """
+        scored = []
+        for pattern, index in self._get_pattern_index().candidates(cert_lower):
+            similarity = fuzz.partial_ratio(pattern, cert_lower)
+            if similarity >= self.MATCH_THRESHOLD:
+                scored.append((self.CERT_MAPPINGS[index], similarity))
+        return scored
     
     def map_certification(
         self,
@@ -209,47 +248,79 @@ class CertificationMapper:
         Returns:
             List of skill matches with confidence scores
         """
-        if not cert_title:
-            return []
+        return self.map_certifications([(cert_title, provider)], min_confidence)[0]
+    
+    def map_certifications(
+        self,
+        certifications: List[Tuple[str, Optional[str]]],
+        min_confidence: float = 0.75
+    ) -> List[List[Dict]]:
+        """
+        Map many certifications to skills
         
-        cert_lower = cert_title.lower()
-        matches = []
+        Titles are lowercased once and each distinct title is scored against
+        the patterns once, so a cohort where many students hold the same
+        certification costs one fuzzy pass per distinct title.
         
-        # Try exact pattern matching first
-        for mapping in self.CERT_MAPPINGS:
-            # Use fuzzy matching for flexibility
-            similarity = fuzz.partial_ratio(mapping.cert_pattern, cert_lower)
+        Args:
+            certifications: (certification title, provider) pairs
+            min_confidence: Minimum confidence threshold
+            
+        Returns:
+            List of skill matches per certification, in input order
+        """
+        scores_by_title: Dict[str, List[Tuple[CertificationMapping, int]]] = {}
+        reputable_by_provider: Dict[str, bool] = {}
+        snapshot = get_taxonomy_snapshot(self.db) if certifications else None
+        results = []
+        
+        for cert_title, provider in certifications:
+            if not cert_title:
+                results.append([])
+                continue
             
-            if similarity >= 85:  # 85% similarity threshold
+            cert_lower = cert_title.lower()
+            if cert_lower not in scores_by_title:
+                scores_by_title[cert_lower] = self._score_title(cert_lower)
+            
+            reputable = False
+            if provider:
+                if provider not in reputable_by_provider:
+                    reputable_by_provider[provider] = self._is_reputable_provider(provider)
+                reputable = reputable_by_provider[provider]
+            
+            # Keep the highest confidence per skill
+            unique_matches = {}
+            for mapping, similarity in scores_by_title[cert_lower]:
                 # Adjust confidence based on match quality
                 adjusted_confidence = mapping.confidence * (similarity / 100.0)
                 
                 # Boost confidence if provider is reputable
-                if provider and self._is_reputable_provider(provider):
+                if reputable:
                     adjusted_confidence = min(1.0, adjusted_confidence * 1.05)
                 
-                if adjusted_confidence >= min_confidence:
-                    # Get actual skill objects
-                    for skill_name in mapping.skill_names:
-                        skill = self._get_skill_by_name(skill_name)
-                        if skill:
-                            matches.append({
-                                'skill_id': str(skill.id),
-                                'skill_name': skill.skill_name,
-                                'confidence': adjusted_confidence,
-                                'source': 'certification',
-                                'evidence_text': f"Certification: {cert_title}",
-                                'match_type': 'certification_mapping'
-                            })
-        
-        # Remove duplicates (keep highest confidence)
-        unique_matches = {}
-        for match in matches:
-            skill_id = match['skill_id']
-            if skill_id not in unique_matches or match['confidence'] > unique_matches[skill_id]['confidence']:
-                unique_matches[skill_id] = match
+                if adjusted_confidence < min_confidence:
+                    continue
+                
+                for skill_name in mapping.skill_names:
+                    skill = snapshot.resolve(skill_name)
+                    if not skill:
+                        continue
+                    
+                    skill_id = str(skill.id)
+                    if skill_id not in unique_matches or adjusted_confidence > unique_matches[skill_id]['confidence']:
+                        unique_matches[skill_id] = {
+                            'skill_id': skill_id,
+                            'skill_name': skill.skill_name,
+                            'confidence': adjusted_confidence,
+                            'source': 'certification',
+                            'evidence_text': f"Certification: {cert_title}",
+                            'match_type': 'certification_mapping'
+                        }
+            
+            results.append(list(unique_matches.values()))
         
-        return list(unique_matches.values())
+        return results
     
     def _is_reputable_provider(self, provider: str) -> bool:
         """
@@ -261,12 +332,4 @@ class CertificationMapper:
         Returns:
             True if reputable
         """
-        reputable = [
-            'google', 'microsoft', 'amazon', 'aws', 'ibm', 'oracle',
-            'meta', 'facebook', 'coursera', 'udacity', 'edx',
-            'linkedin', 'salesforce', 'cisco', 'comptia', 'pmi',
-            'scrum.org', 'autodesk', 'adobe', 'red hat'
-        ]
-        
-        provider_lower = provider.lower()
-        return any(rep in provider_lower for rep in reputable)
+        return self._REPUTABLE_PATTERN.search(provider.lower()) is not None
@@ -2,11 +2,15 @@
 Course to Skill Mapper
 Maps course codes and names to related skills
 """
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterable, Optional, Tuple
+import hashlib
+import uuid
 import re
 from sqlalchemy.orm import Session
 
-from models.database_models import Skill, Course
+from models.database_models import Course, CourseSkill, CourseSkillSync, EvidenceChange, StudentCourse
+from services.skill_matchers import KeywordMatcher
+from services.taxonomy_service import TaxonomySkill, get_taxonomy_snapshot
 
 class CourseSkillMapper:
     """
@@ -98,6 +102,12 @@ class CourseSkillMapper:
         'construction': ['Construction Management', 'Project Management'],
     }
     
+    # Bump when matching logic or confidences change (mapping tables are hashed)
+    RULES_VERSION = '2'
+    
+    # Compiled syllabus matchers keyed by rules version
+    _syllabus_matchers: Dict[str, KeywordMatcher] = {}
+    
     def __init__(self, db: Session):
         """
         Initialize course mapper
@@ -106,17 +116,161 @@ class CourseSkillMapper:
             db: Database session
         """
         self.db = db
-        self._skill_cache = {}
     
-    def _get_skill_by_name(self, skill_name: str) -> Optional[Skill]:
-        """Get skill from database by name (cached)"""
-        if skill_name not in self._skill_cache:
-            skill = self.db.query(Skill).filter(
-                Skill.skill_name.ilike(f"%{skill_name}%")
-            ).first()
-            self._skill_cache[skill_name] = skill
+    def _get_skill_by_name(self, skill_name: str) -> Optional[TaxonomySkill]:
+        """Get skill by name or alias from the shared taxonomy snapshot"""
+        return get_taxonomy_snapshot(self.db).resolve(skill_name)
+    
+    def get_rules_version(self) -> str:
+        """
+        Hash of everything course mappings depend on besides the course
         
-        return self._skill_cache[skill_name]
+        Covers RULES_VERSION, the code prefix and keyword tables and the
+        taxonomy version (mapped skill names resolve against it).
+        """
+        digest = hashlib.sha1(self.RULES_VERSION.encode('utf-8'))
+        for table in (self.CODE_PREFIX_MAPPINGS, self.KEYWORD_MAPPINGS):
+            for key, skill_names in sorted(table.items()):
+                digest.update(f"{key}\x1f{'|'.join(skill_names)}\x1e".encode('utf-8'))
+        digest.update(get_taxonomy_snapshot(self.db).version.encode('utf-8'))
+        return digest.hexdigest()
+    
+    @staticmethod
+    def get_source_hash(course: Course) -> str:
+        """Hash of the course fields mappings are computed from"""
+        source = f"{course.course_code}\x1f{course.course_name}\x1f{course.syllabus_url or ''}"
+        return hashlib.sha1(source.encode('utf-8')).hexdigest()
+    
+    def is_current(self, course: Course, sync: Optional[CourseSkillSync], rules_version: Optional[str] = None) -> bool:
+        """
+        Check whether the stored mappings of a course are up to date
+        
+        Args:
+            course: Course row
+            sync: Its course_skill_sync row (None if never mapped)
+            rules_version: Precomputed get_rules_version()
+        """
+        return (
+            sync is not None
+            and sync.rules_version == (rules_version or self.get_rules_version())
+            and sync.source_hash == self.get_source_hash(course)
+        )
+    
+    def refresh_course_skills(
+        self,
+        courses: List[Course],
+        syllabi: Optional[Dict[uuid.UUID, Tuple[Iterable[str], str]]] = None,
+        force: bool = False,
+        queue_evidence: bool = True
+    ) -> int:
+        """
+        Recompute the materialized course_skills rows of stale courses
+        
+        A course is remapped when it was never mapped, its code, name or
+        syllabus URL changed, or the mapping rules / taxonomy changed.
+        Syllabus matches come from the syllabus pipeline; courses remapped
+        without syllabus pages keep their previous syllabus matches unless
+        the course fields (and so possibly the syllabus URL) changed, in
+        which case the syllabus hash is cleared so the pipeline re-reads it.
+        Kept matches retain the rules version they were computed with
+        (syllabus_rules_version), so the pipeline re-reads the syllabus
+        after a rules or taxonomy change.
+        Every enrollment in a remapped course is queued as an evidence
+        change, so stored course evidence picks up the new rows.
+        
+        Args:
+            courses: Courses to check
+            syllabi: Syllabus (pages, content hash) per course ID
+            force: Remap even if the stored mappings are current
+            queue_evidence: Queue evidence changes for the enrollments (off
+                when called while collecting evidence from the new rows)
+            
+        Returns:
+            Number of courses remapped
+        """
+        if not courses:
+            return 0
+        syllabi = syllabi or {}
+        
+        rules_version = self.get_rules_version()
+        syncs = {
+            sync.course_id: sync
+            for sync in self.db.query(CourseSkillSync).filter(
+                CourseSkillSync.course_id.in_([course.id for course in courses])
+            )
+        }
+        
+        stale = [
+            course for course in courses
+            if force or not self.is_current(course, syncs.get(course.id), rules_version)
+        ]
+        if not stale:
+            return 0
+        
+        stale_ids = [course.id for course in stale]
+        
+        # Previous syllabus matches only still apply to the same syllabus URL
+        keep_ids = {
+            course.id for course in stale
+            if course.id not in syllabi and course.id in syncs
+            and syncs[course.id].source_hash == self.get_source_hash(course)
+        }
+        kept_syllabus_matches: Dict[uuid.UUID, List[Dict]] = {}
+        for row in self.db.query(CourseSkill).filter(
+            CourseSkill.course_id.in_(keep_ids),
+            CourseSkill.match_type == 'syllabus_keyword'
+        ):
+            kept_syllabus_matches.setdefault(row.course_id, []).append({
+                'skill_id': str(row.skill_id),
+                'confidence': float(row.confidence),
+                'evidence_text': row.evidence_text,
+                'match_type': row.match_type
+            })
+        
+        self.db.query(CourseSkill).filter(
+            CourseSkill.course_id.in_(stale_ids)
+        ).delete(synchronize_session=False)
+        
+        for course in stale:
+            matches = self.map_course(course_code=course.course_code, course_name=course.course_name)
+            if course.id in syllabi:
+                pages, _ = syllabi[course.id]
+                matches.extend(self.map_syllabus_pages(pages))
+            else:
+                matches.extend(kept_syllabus_matches.get(course.id, []))
+            
+            for match in self._dedupe(matches):
+                self.db.add(CourseSkill(
+                    course_id=course.id,
+                    skill_id=uuid.UUID(match['skill_id']),
+                    confidence=round(match['confidence'], 2),
+                    match_type=match['match_type'],
+                    evidence_text=match['evidence_text']
+                ))
+            
+            sync = syncs.get(course.id)
+            if sync is None:
+                sync = CourseSkillSync(course_id=course.id)
+                self.db.add(sync)
+            sync.rules_version = rules_version
+            sync.source_hash = self.get_source_hash(course)
+            if course.id in syllabi:
+                sync.syllabus_hash = syllabi[course.id][1]
+                sync.syllabus_rules_version = rules_version
+            elif course.id not in keep_ids:
+                sync.syllabus_hash = None
+                sync.syllabus_rules_version = None
+        
+        if queue_evidence:
+            for student_id, course_id in self.db.query(
+                StudentCourse.student_id, StudentCourse.course_id
+            ).filter(
+                StudentCourse.course_id.in_(stale_ids)
+            ).distinct():
+                self.db.add(EvidenceChange(student_id=student_id, source_type='course', source_id=course_id))
+        
+        self.db.commit()
+        return len(stale)
     
     def map_course(
         self,
@@ -152,7 +306,11 @@ class CourseSkillMapper:
             syllabus_matches = self._match_by_syllabus(syllabus)
             matches.extend(syllabus_matches)
         
-        # Remove duplicates (keep highest confidence)
+        return self._dedupe(matches)
+    
+    @staticmethod
+    def _dedupe(matches: List[Dict]) -> List[Dict]:
+        """Remove duplicates (keep highest confidence)"""
         unique_matches = {}
         for match in matches:
             skill_id = match['skill_id']
@@ -212,32 +370,80 @@ class CourseSkillMapper:
     
     def _match_by_syllabus(self, syllabus: str) -> List[Dict]:
         """Match skills by syllabus content (basic keyword extraction)"""
-        matches = []
-        syllabus_lower = syllabus.lower()
+        return self.map_syllabus_pages([syllabus])
+    
+    def _get_syllabus_matcher(self) -> KeywordMatcher:
+        """
+        Single automaton over the course keywords, skill names and aliases
         
-        # Use same keyword mappings as course name
-        for keyword, skill_names in self.KEYWORD_MAPPINGS.items():
-            if keyword in syllabus_lower:
-                for skill_name in skill_names:
-                    skill = self._get_skill_by_name(skill_name)
-                    if skill:
-                        # Extract evidence snippet
-                        evidence = self._extract_evidence(syllabus, keyword)
-                        
-                        matches.append({
-                            'skill_id': str(skill.id),
-                            'skill_name': skill.skill_name,
-                            'confidence': 0.75,
-                            'source': 'course',
-                            'evidence_text': evidence,
-                            'match_type': 'syllabus_keyword'
-                        })
+        Course keywords keep their substring semantics ('circuits' in
+        'circuitsim'); skill names and aliases match whole words only.
+        """
+        rules_version = self.get_rules_version()
+        matcher = self._syllabus_matchers.get(rules_version)
+        if matcher is None:
+            skills = get_taxonomy_snapshot(self.db).skills
+            matcher = KeywordMatcher(
+                keywords=[
+                    (name, ('skill', skill.skill_name))
+                    for skill in skills for name in dict.fromkeys((skill.normalized_name, *skill.aliases))
+                ],
+                partial_keywords=[(keyword, ('keyword', keyword)) for keyword in self.KEYWORD_MAPPINGS]
+            )
+            if len(self._syllabus_matchers) >= 4:
+                self._syllabus_matchers.clear()
+            self._syllabus_matchers[rules_version] = matcher
+        return matcher
+    
+    def map_syllabus_pages(self, pages: Iterable[str]) -> List[Dict]:
+        """
+        Match skills in a syllabus, one page at a time
         
-        return matches
+        Each page is scanned once for every keyword and alias, so the cost
+        grows with syllabus length only, and pages are never held together
+        in memory.
+        
+        Args:
+            pages: Page texts, in order
+            
+        Returns:
+            List of skill matches; evidence is the first mention
+        """
+        matcher = self._get_syllabus_matcher()
+        
+        # First mention of each keyword: evidence snippet
+        evidence: Dict[Tuple[str, str], str] = {}
+        for page in pages:
+            for key, start, end in matcher.iter_matches(page.lower()):
+                if key not in evidence:
+                    evidence[key] = self._extract_evidence(page, page[start:end], position=start)
+        
+        matches = []
+        for (kind, value), snippet in evidence.items():
+            skill_names = self.KEYWORD_MAPPINGS[value] if kind == 'keyword' else [value]
+            for skill_name in skill_names:
+                skill = self._get_skill_by_name(skill_name)
+                if skill:
+                    matches.append({
+                        'skill_id': str(skill.id),
+                        'skill_name': skill.skill_name,
+                        'confidence': 0.75,
+                        'source': 'course',
+                        'evidence_text': snippet,
+                        'match_type': 'syllabus_keyword'
+                    })
+        
+        return self._dedupe(matches)
     
-    def _extract_evidence(self, text: str, keyword: str, context_chars: int = 80) -> str:
+    def _extract_evidence(
+        self,
+        text: str,
+        keyword: str,
+        context_chars: int = 80,
+        position: Optional[int] = None
+    ) -> str:
         """Extract text snippet containing keyword"""
-        pos = text.lower().find(keyword)
+        pos = text.lower().find(keyword) if position is None else position
         if pos == -1:
             return text[:context_chars] + "..."
         
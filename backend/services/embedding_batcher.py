@@ -0,0 +1,158 @@
+"""
+Embedding Batcher
+Dynamic micro-batching of concurrent encode requests into single model calls
+"""
+import time
+import queue
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Dict, List
+import numpy as np
+
+
+@dataclass
+class _EncodeRequest:
+    """Texts submitted by one caller, waiting to be batched"""
+    texts: List[str]
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class EmbeddingBatcher:
+    """
+    Collects encode requests from concurrent callers and runs them as one
+    batched model call
+
+    A background worker takes the first waiting request, keeps collecting
+    requests until either the batching window has elapsed or max_batch_size
+    texts are queued, runs one encode over all of them and hands each caller
+    its own rows. CPU inference throughput then scales with concurrency
+    instead of paying per-call overhead for every small request.
+    """
+
+    def __init__(self, model, window_ms: float = 5.0, max_batch_size: int = 32):
+        """
+        Initialize batcher
+
+        Args:
+            model: Sentence-transformer model with an encode() method
+            window_ms: How long to wait for more requests after the first one
+            max_batch_size: Maximum number of texts per model call
+        """
+        self.model = model
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+
+        self._queue: "queue.Queue[_EncodeRequest]" = queue.Queue()
+        self._metrics_lock = threading.Lock()
+        self._reset_metrics()
+
+        self._worker = threading.Thread(target=self._run, name='embedding-batcher', daemon=True)
+        self._worker.start()
+
+    def _reset_metrics(self):
+        self._batches = 0
+        self._texts = 0
+        self._requests = 0
+        self._max_batch = 0
+        self._batch_size_histogram: Dict[int, int] = {}
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts, sharing the model call with concurrent callers
+
+        Args:
+            texts: Texts to encode
+
+        Returns:
+            Normalized embedding matrix with one row per text
+        """
+        request = _EncodeRequest(texts=list(texts))
+        self._queue.put(request)
+        return request.future.result()
+
+    def _collect_batch(self) -> List[_EncodeRequest]:
+        """Block for one request, then gather more until the window closes"""
+        batch = [self._queue.get()]
+        size = len(batch[0].texts)
+        deadline = time.perf_counter() + self.window
+
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            size += len(request.texts)
+
+        return batch
+
+    def _run(self):
+        """Worker loop: batch, encode, fan results back out"""
+        while True:
+            batch = self._collect_batch()
+            started = time.perf_counter()
+            texts = [text for request in batch for text in request.texts]
+
+            try:
+                embeddings = self.model.encode(texts, normalize_embeddings=True)
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+
+            offset = 0
+            for request in batch:
+                request.future.set_result(embeddings[offset:offset + len(request.texts)])
+                offset += len(request.texts)
+
+            self._record(batch, len(texts), started)
+
+    def _record(self, batch: List[_EncodeRequest], size: int, started: float):
+        """Update batch size and queue wait metrics"""
+        waits = [started - request.enqueued_at for request in batch]
+
+        # Histogram buckets are powers of two (1, 2, 4, 8, ...)
+        bucket = 1
+        while bucket < size:
+            bucket *= 2
+
+        with self._metrics_lock:
+            self._batches += 1
+            self._texts += size
+            self._requests += len(batch)
+            self._max_batch = max(self._max_batch, size)
+            self._batch_size_histogram[bucket] = self._batch_size_histogram.get(bucket, 0) + 1
+            self._total_wait += sum(waits)
+            self._max_wait = max(self._max_wait, max(waits))
+
+    def get_metrics(self) -> Dict:
+        """
+        Batch size and queue wait statistics since startup
+
+        Returns:
+            Dictionary of batching metrics
+        """
+        with self._metrics_lock:
+            return {
+                'batches': self._batches,
+                'requests': self._requests,
+                'texts': self._texts,
+                'avg_batch_size': round(self._texts / self._batches, 2) if self._batches else 0.0,
+                'max_batch_size': self._max_batch,
+                'batch_size_histogram': {
+                    f"<={bucket}": count
+                    for bucket, count in sorted(self._batch_size_histogram.items())
+                },
+                'avg_queue_wait_ms': round(self._total_wait / self._requests * 1000, 3) if self._requests else 0.0,
+                'max_queue_wait_ms': round(self._max_wait * 1000, 3),
+                'queue_depth': self._queue.qsize(),
+                'window_ms': self.window * 1000,
+                'max_batch_size_limit': self.max_batch_size
+            }
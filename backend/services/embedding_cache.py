@@ -0,0 +1,239 @@
+"""
+Skill Embedding Cache
+Persists the skill embedding matrix to disk so it survives restarts and is
+shared by every worker process
+"""
+import os
+import re
+import json
+import hashlib
+import tempfile
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from dotenv import load_dotenv
+
+from services.embedding_quantization import QuantizedMatrix, get_storage_dtype
+
+load_dotenv()
+
+# Memory-mapped matrix last opened by this process per cache directory, as
+# (file path, matrix); superseded matrices are dropped rather than kept open
+_loaded_matrices: Dict[str, Tuple[str, QuantizedMatrix]] = {}
+_lock = threading.Lock()
+
+# File names of cached matrices: <taxonomy_key>.npy / .json / .scales.npy
+_CACHE_FILE_PATTERN = re.compile(r'^([0-9a-f]{40})\.(?:npy|json|scales\.npy)$')
+
+
+class SkillEmbeddingCache:
+    """
+    On-disk cache of normalized skill embeddings
+
+    Each taxonomy is stored as <cache_dir>/<model>/<taxonomy_key>.npy, where
+    the key hashes the model name and every skill's id, name and description.
+    Files are opened memory-mapped, so workers share one copy through the OS
+    page cache. When the taxonomy changes, rows for unchanged skills are
+    reused from the most recent file and only changed skills are encoded;
+    files of earlier taxonomies are deleted once the new one is published.
+    Matrices can be stored as float16 or per-row int8 (EMBEDDING_STORAGE_DTYPE)
+    to cut the memory every worker maps.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: Optional[str] = None,
+        storage_dtype: Optional[str] = None
+    ):
+        """
+        Initialize cache
+
+        Args:
+            model_name: Name of the embedding model (part of the cache key)
+            cache_dir: Root cache directory (defaults to EMBEDDING_CACHE_DIR)
+            storage_dtype: 'float32', 'float16' or 'int8' (defaults to EMBEDDING_STORAGE_DTYPE)
+        """
+        self.model_name = model_name
+        self.storage_dtype = storage_dtype or get_storage_dtype()
+        cache_root = cache_dir or os.getenv('EMBEDDING_CACHE_DIR', 'cache/embeddings')
+        model_slug = re.sub(r'[^A-Za-z0-9_.-]', '_', model_name)
+        self.directory = os.path.join(cache_root, model_slug)
+        # (encoded, reused) row counts of the last matrix this instance built
+        self.last_build: Optional[Tuple[int, int]] = None
+
+    @staticmethod
+    def row_key(skill_id: str, skill_name: str, description: Optional[str]) -> str:
+        """Content hash of one skill row"""
+        content = f"{skill_id}\x1f{skill_name}\x1f{description or ''}"
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+    def taxonomy_key(self, row_keys: List[str]) -> str:
+        """Content hash of the whole taxonomy for this model"""
+        digest = hashlib.sha1(self.model_name.encode('utf-8'))
+        if self.storage_dtype != 'float32':
+            digest.update(self.storage_dtype.encode('ascii'))
+        for row_key in row_keys:
+            digest.update(row_key.encode('ascii'))
+        return digest.hexdigest()
+
+    def _paths(self, taxonomy_key: str):
+        base = os.path.join(self.directory, taxonomy_key)
+        return base + '.npy', base + '.json'
+
+    @staticmethod
+    def _scales_path(matrix_path: str) -> str:
+        return matrix_path[:-len('.npy')] + '.scales.npy'
+
+    def _open_matrix(self, path: str) -> Optional[QuantizedMatrix]:
+        """Open a cached matrix memory-mapped (reused while it is the current one)"""
+        loaded = _loaded_matrices.get(self.directory)
+        matrix = loaded[1] if loaded is not None and loaded[0] == path else None
+        if matrix is None and os.path.exists(path):
+            try:
+                data = np.load(path, mmap_mode='r')
+                scales = None
+                if data.dtype == np.int8:
+                    scales = np.load(self._scales_path(path), mmap_mode='r')
+            except (OSError, ValueError) as e:
+                print(f"WARNING: Ignoring unreadable embedding cache {path}: {e}")
+                return None
+            matrix = QuantizedMatrix(data, scales)
+            _loaded_matrices[self.directory] = (path, matrix)
+        return matrix
+
+    def _load_previous_rows(self) -> Tuple[Optional[QuantizedMatrix], Dict[str, int]]:
+        """Most recently written matrix and its row number per row hash"""
+        try:
+            with open(os.path.join(self.directory, 'latest.json')) as f:
+                latest_key = json.load(f)['taxonomy_key']
+            matrix_path, index_path = self._paths(latest_key)
+            with open(index_path) as f:
+                row_keys = json.load(f)['row_keys']
+        except (OSError, ValueError, KeyError):
+            return None, {}
+
+        matrix = self._open_matrix(matrix_path)
+        if matrix is None or len(matrix) != len(row_keys) or matrix.dtype != self.storage_dtype:
+            return None, {}
+
+        return matrix, {row_key: i for i, row_key in enumerate(row_keys)}
+
+    def _write_atomic(self, path: str, write: Callable):
+        """Write a file via a temp file and rename so readers never see partial data"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _save(self, taxonomy_key: str, row_keys: List[str], matrix: QuantizedMatrix):
+        """Persist a matrix and its row index, then mark it as latest"""
+        os.makedirs(self.directory, exist_ok=True)
+        matrix_path, index_path = self._paths(taxonomy_key)
+
+        # Scales go first so a visible int8 matrix always has them
+        if matrix.scales is not None:
+            self._write_atomic(self._scales_path(matrix_path), lambda f: np.save(f, matrix.scales))
+        self._write_atomic(matrix_path, lambda f: np.save(f, matrix.data))
+        self._write_atomic(index_path, lambda f: f.write(
+            json.dumps({'model': self.model_name, 'row_keys': row_keys}).encode('utf-8')
+        ))
+        self._write_atomic(os.path.join(self.directory, 'latest.json'), lambda f: f.write(
+            json.dumps({'taxonomy_key': taxonomy_key}).encode('utf-8')
+        ))
+
+    def _prune(self, taxonomy_key: str):
+        """
+        Delete the files of every taxonomy but the given one
+
+        Workers still mapping a deleted matrix keep reading it (the data
+        stays until it is unmapped); files that cannot be deleted are left
+        for the next prune.
+        """
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            match = _CACHE_FILE_PATTERN.match(name)
+            if match and match.group(1) != taxonomy_key:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def get_embeddings(
+        self,
+        row_keys: List[str],
+        texts: List[str],
+        encode: Callable[[List[str]], np.ndarray]
+    ) -> QuantizedMatrix:
+        """
+        Get the embedding matrix for a taxonomy, encoding only what is missing
+
+        Args:
+            row_keys: Row hash per skill (see row_key), in matrix order
+            texts: Text to embed per skill, in the same order
+            encode: Function returning normalized embeddings for a list of texts
+
+        Returns:
+            Embedding matrix in the storage type, one row per skill
+            (memory-mapped when cached)
+        """
+        if not row_keys:
+            return QuantizedMatrix.quantize(np.empty((0, 0), dtype=np.float32), self.storage_dtype)
+
+        taxonomy_key = self.taxonomy_key(row_keys)
+        matrix_path, _ = self._paths(taxonomy_key)
+
+        matrix = self._open_matrix(matrix_path)
+        if matrix is not None and len(matrix) == len(row_keys):
+            return matrix
+
+        with _lock:
+            # Another thread may have built it while we waited
+            matrix = self._open_matrix(matrix_path)
+            if matrix is not None and len(matrix) == len(row_keys):
+                return matrix
+
+            previous, previous_rows = self._load_previous_rows()
+            missing = [i for i, row_key in enumerate(row_keys) if row_key not in previous_rows]
+            reused = [i for i, row_key in enumerate(row_keys) if row_key in previous_rows]
+
+            # Reused rows are copied still quantized, so they are not rounded twice
+            new_rows = None
+            if missing:
+                new_rows = QuantizedMatrix.quantize(encode([texts[i] for i in missing]), self.storage_dtype)
+            dimension = new_rows.shape[1] if new_rows is not None else previous.shape[1]
+            template = new_rows if new_rows is not None else previous
+
+            data = np.empty((len(row_keys), dimension), dtype=template.data.dtype)
+            scales = np.empty(len(row_keys), dtype=np.float32) if template.scales is not None else None
+            if reused:
+                source_rows = np.array([previous_rows[row_keys[i]] for i in reused])
+                data[reused] = previous.data[source_rows]
+                if scales is not None:
+                    scales[reused] = previous.scales[source_rows]
+            if missing:
+                data[missing] = new_rows.data
+                if scales is not None:
+                    scales[missing] = new_rows.scales
+            matrix = QuantizedMatrix(data, scales)
+
+            try:
+                self._save(taxonomy_key, row_keys, matrix)
+            except OSError as e:
+                print(f"WARNING: Could not persist skill embeddings: {e}")
+                return matrix
+
+            self.last_build = (len(missing), len(reused))
+            # Map the new file before pruning, in case another process
+            # publishes (and prunes) a different taxonomy meanwhile
+            published = self._open_matrix(matrix_path) or matrix
+            self._prune(taxonomy_key)
+            return published
@@ -0,0 +1,136 @@
+"""
+Embedding Quantization
+Compact float16 / per-row int8 storage for normalized embedding matrices
+"""
+import os
+from typing import Optional
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+STORAGE_DTYPES = ('float32', 'float16', 'int8')
+
+
+def get_storage_dtype() -> str:
+    """Configured embedding storage type (EMBEDDING_STORAGE_DTYPE)"""
+    dtype = os.getenv('EMBEDDING_STORAGE_DTYPE', 'float32')
+    if dtype not in STORAGE_DTYPES:
+        print(f"WARNING: Unknown EMBEDDING_STORAGE_DTYPE '{dtype}', using float32")
+        return 'float32'
+    return dtype
+
+
+class QuantizedMatrix:
+    """
+    Embedding matrix stored as float32, float16 or int8 with a scale per row
+
+    int8 rows are stored as round(row / scale) with scale = max(|row|) / 127,
+    so each row keeps its own dynamic range. Inner products are computed in
+    row blocks that are upcast to float32 on the fly, so the full-precision
+    matrix is never materialized.
+    """
+
+    # Rows upcast per block during inner products
+    BLOCK_ROWS = 4096
+
+    def __init__(self, data: np.ndarray, scales: Optional[np.ndarray] = None):
+        """
+        Wrap stored data
+
+        Args:
+            data: Stored matrix (float32, float16 or int8)
+            scales: Per-row scale factors (int8 only)
+        """
+        self.data = data
+        self.scales = scales
+
+    @classmethod
+    def quantize(cls, matrix: np.ndarray, dtype: str = 'float32') -> 'QuantizedMatrix':
+        """
+        Convert a float matrix to the given storage type
+
+        Args:
+            matrix: Float matrix, one embedding per row
+            dtype: 'float32', 'float16' or 'int8'
+
+        Returns:
+            QuantizedMatrix holding the compact representation
+        """
+        matrix = np.asarray(matrix, dtype=np.float32)
+        if dtype == 'float32':
+            return cls(matrix)
+        if dtype == 'float16':
+            return cls(matrix.astype(np.float16))
+        if dtype == 'int8':
+            scales = np.abs(matrix).max(axis=1) / 127.0 if len(matrix) else np.empty(0)
+            scales = np.where(scales == 0, 1.0, scales).astype(np.float32)
+            data = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+            return cls(data, scales)
+        raise ValueError(f"Unsupported embedding storage dtype: {dtype}")
+
+    @property
+    def dtype(self) -> str:
+        return str(self.data.dtype)
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, rows) -> np.ndarray:
+        """Rows dequantized to float32"""
+        values = np.asarray(self.data[rows], dtype=np.float32)
+        if self.scales is not None:
+            values = values * (self.scales[rows][..., None] if values.ndim > 1 else self.scales[rows])
+        return values
+
+    def take(self, rows: np.ndarray) -> 'QuantizedMatrix':
+        """Subset of rows, still quantized"""
+        return QuantizedMatrix(
+            self.data[rows],
+            self.scales[rows] if self.scales is not None else None
+        )
+
+    def append(self, other: 'QuantizedMatrix') -> 'QuantizedMatrix':
+        """New matrix with the rows of other appended (same storage type)"""
+        scales = None
+        if self.scales is not None:
+            scales = np.concatenate([self.scales, other.scales])
+        return QuantizedMatrix(np.concatenate([self.data, other.data]), scales)
+
+    def dot(self, queries: np.ndarray) -> np.ndarray:
+        """
+        Inner products of float queries with every stored row
+
+        Args:
+            queries: Float32 matrix (n, dim) or vector (dim,)
+
+        Returns:
+            Float32 similarities of shape (n, rows), or (rows,) for a vector
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        if self.data.dtype == np.float32:
+            return queries @ self.data.T
+
+        result = np.empty(queries.shape[:-1] + (len(self.data),), dtype=np.float32)
+        for start in range(0, len(self.data), self.BLOCK_ROWS):
+            block = self.data[start:start + self.BLOCK_ROWS].astype(np.float32)
+            result[..., start:start + len(block)] = queries @ block.T
+
+        if self.scales is not None:
+            result *= self.scales
+        return result
+
+
+def as_quantized(vectors) -> QuantizedMatrix:
+    """Wrap a plain float matrix (or pass a QuantizedMatrix through)"""
+    if isinstance(vectors, QuantizedMatrix):
+        return vectors
+    return QuantizedMatrix(np.asarray(vectors, dtype=np.float32))
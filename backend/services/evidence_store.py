@@ -0,0 +1,371 @@
+"""
+Evidence Store
+Persisted skill evidence per student, kept in step with the source records
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from collections import defaultdict
+from datetime import date, datetime
+import uuid
+from sqlalchemy import Row, event, insert, select
+from sqlalchemy.orm import Session
+
+from models.database_models import (
+    Skill, SkillEvidence, EvidenceSync, EvidenceChange, SkillScoreChange,
+    Project, Certification, Course, StudentCourse, Internship, SkillAssessment
+)
+
+# Records evidence is extracted from (all carry student_id), by source type
+EVIDENCE_SOURCE_MODELS = {
+    'project': Project,
+    'certification': Certification,
+    'course': StudentCourse,
+    'internship': Internship,
+    'assessment': SkillAssessment
+}
+
+
+def _record_changes(connection, changes):
+    """Queue changed source records (same transaction as the change)"""
+    if changes:
+        connection.execute(insert(EvidenceChange.__table__), [
+            {'id': uuid.uuid4(), 'student_id': student_id, 'source_type': source_type, 'source_id': source_id}
+            for student_id, source_type, source_id in changes
+        ])
+
+
+def _source_changed(source_type):
+    def listener(mapper, connection, target):
+        if target.student_id is None:
+            return
+        # Course evidence is keyed by course rather than enrollment
+        source_id = target.course_id if source_type == 'course' else target.id
+        if source_id is not None:
+            _record_changes(connection, [(target.student_id, source_type, source_id)])
+    return listener
+
+
+def _enrollment_updated(mapper, connection, target):
+    """A moved enrollment changes the evidence of both courses"""
+    # Read the stored course before the UPDATE; attribute history is empty
+    # when the instance was expired before being modified
+    stored_course_id = connection.execute(
+        select(StudentCourse.course_id).where(StudentCourse.id == target.id)
+    ).scalar()
+    _record_changes(connection, [
+        (target.student_id, 'course', course_id)
+        for course_id in {stored_course_id, target.course_id} if course_id is not None
+    ])
+
+
+def _course_changed(mapper, connection, target):
+    """Course edits change the course evidence of every enrolled student"""
+    student_ids = connection.execute(
+        select(StudentCourse.student_id).where(StudentCourse.course_id == target.id)
+    ).scalars()
+    _record_changes(connection, [(student_id, 'course', target.id) for student_id in set(student_ids)])
+
+
+for _source_type, _model in EVIDENCE_SOURCE_MODELS.items():
+    for _event_name in ('after_insert', 'after_update', 'after_delete'):
+        if _model is StudentCourse and _event_name == 'after_update':
+            event.listen(_model, 'before_update', _enrollment_updated)
+        else:
+            event.listen(_model, _event_name, _source_changed(_source_type))
+event.listen(Course, 'after_update', _course_changed)
+
+
+def _as_local_datetime(value) -> Optional[datetime]:
+    """Evidence date as a naive local datetime (dates become midnight)"""
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        return datetime.combine(value, datetime.min.time()) if isinstance(value, date) else None
+    if value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def _evidence_row(student_id: uuid.UUID, evidence) -> SkillEvidence:
+    """SkillEvidence row for an Evidence object"""
+    return SkillEvidence(
+        student_id=student_id,
+        skill_id=uuid.UUID(str(evidence.skill_id)),
+        source_type=evidence.source_type,
+        source_id=uuid.UUID(str(evidence.source_id)),
+        confidence=round(evidence.confidence, 4),
+        evidence_date=_as_local_datetime(evidence.date),
+        evidence_text=evidence.evidence_text
+    )
+
+
+class EvidenceStore:
+    """
+    Reads and updates the stored evidence of students
+
+    Changes to a student's projects, certifications, course enrollments,
+    internships or assessments queue an evidence_changes row in the writing
+    transaction. Syncing re-extracts only the queued records and replaces
+    their evidence rows; every (student, skill) pair whose evidence was
+    added or removed is queued in skill_score_changes for rescoring. A
+    student is rebuilt from scratch only when their evidence was built with
+    an older evidence version (extractor, taxonomy and mapping rules).
+
+    Queue rows are deleted by ID once processed, so a change made while
+    evidence is being rebuilt stays queued.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize store
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+
+    def get_sync_state(self, student_id: uuid.UUID, evidence_version: str) -> bool:
+        """
+        Check whether a student's stored evidence was built with the current version
+
+        Args:
+            student_id: Student UUID
+            evidence_version: Current evidence version
+
+        Returns:
+            True if only queued changes (if any) need to be applied
+        """
+        return self.get_sync_states([student_id], evidence_version)[student_id]
+
+    def get_sync_states(self, student_ids: Sequence[uuid.UUID], evidence_version: str) -> Dict[uuid.UUID, bool]:
+        """
+        Check the evidence version of many students
+
+        Args:
+            student_ids: Student UUIDs (one IN query; callers chunk large lists)
+            evidence_version: Current evidence version
+
+        Returns:
+            Dictionary mapping each student to whether their version is current
+        """
+        versions = dict(
+            self.db.query(EvidenceSync.student_id, EvidenceSync.evidence_version).filter(
+                EvidenceSync.student_id.in_(student_ids)
+            ).all()
+        )
+        return {student_id: versions.get(student_id) == evidence_version for student_id in student_ids}
+
+    def get_changes(self, student_ids: Sequence[uuid.UUID]) -> List[Row]:
+        """
+        Queued source record changes of students
+
+        Returns:
+            Rows of (id, student_id, source_type, source_id); plain rows stay
+            readable after the commits that apply and delete them
+        """
+        return self.db.query(
+            EvidenceChange.id, EvidenceChange.student_id,
+            EvidenceChange.source_type, EvidenceChange.source_id
+        ).filter(
+            EvidenceChange.student_id.in_(student_ids)
+        ).all()
+
+    def replace(
+        self,
+        student_id: uuid.UUID,
+        evidence: Iterable,
+        evidence_version: str,
+        changes: Sequence[Row] = ()
+    ):
+        """
+        Replace a student's stored evidence
+
+        Args:
+            student_id: Student UUID
+            evidence: Evidence objects (skill_id, source_type, source_id,
+                confidence, date, evidence_text)
+            evidence_version: Evidence version it was built with
+            changes: Queued changes read before the evidence was collected
+        """
+        self.replace_many({student_id: evidence}, evidence_version, changes)
+
+    def replace_many(
+        self,
+        evidence_by_student: Dict[uuid.UUID, Iterable],
+        evidence_version: str,
+        changes: Sequence[Row] = ()
+    ):
+        """
+        Replace the stored evidence of many students in one transaction
+
+        Every skill the students had or now have evidence for is queued for
+        rescoring.
+
+        Args:
+            evidence_by_student: Evidence objects per student
+            evidence_version: Evidence version they were built with
+            changes: Queued changes of these students read before the
+                evidence was collected (now applied)
+        """
+        student_ids = list(evidence_by_student)
+        if not student_ids:
+            return
+
+        dirty = defaultdict(set)
+        for student_id, skill_id in self.db.query(SkillEvidence.student_id, SkillEvidence.skill_id).filter(
+            SkillEvidence.student_id.in_(student_ids)
+        ).distinct():
+            dirty[student_id].add(skill_id)
+
+        self.db.query(SkillEvidence).filter(
+            SkillEvidence.student_id.in_(student_ids)
+        ).delete(synchronize_session=False)
+
+        rows = [
+            _evidence_row(student_id, e)
+            for student_id, evidence in evidence_by_student.items()
+            for e in evidence
+        ]
+        self.db.add_all(rows)
+        for row in rows:
+            dirty[row.student_id].add(row.skill_id)
+
+        syncs = {
+            sync.student_id: sync
+            for sync in self.db.query(EvidenceSync).filter(EvidenceSync.student_id.in_(student_ids))
+        }
+        for student_id in student_ids:
+            sync = syncs.get(student_id)
+            if sync is None:
+                sync = EvidenceSync(student_id=student_id)
+                self.db.add(sync)
+            sync.evidence_version = evidence_version
+
+        self._finish_changes(changes, dirty)
+
+    def apply_changes(self, changes: Sequence[Row], evidence_by_student: Dict[uuid.UUID, Iterable]):
+        """
+        Replace the evidence of changed source records
+
+        Args:
+            changes: Queued changes being applied
+            evidence_by_student: Evidence now extracted from the changed
+                records (deleted records have none)
+        """
+        if not changes:
+            return
+
+        changed = {(c.student_id, c.source_type, c.source_id) for c in changes}
+        dirty = defaultdict(set)
+
+        stale_ids = []
+        for row_id, student_id, skill_id, source_type, source_id in self.db.query(
+            SkillEvidence.id, SkillEvidence.student_id, SkillEvidence.skill_id,
+            SkillEvidence.source_type, SkillEvidence.source_id
+        ).filter(
+            SkillEvidence.student_id.in_({c.student_id for c in changes}),
+            SkillEvidence.source_id.in_({c.source_id for c in changes})
+        ):
+            if (student_id, source_type, source_id) in changed:
+                stale_ids.append(row_id)
+                dirty[student_id].add(skill_id)
+
+        if stale_ids:
+            self.db.query(SkillEvidence).filter(
+                SkillEvidence.id.in_(stale_ids)
+            ).delete(synchronize_session=False)
+
+        rows = [
+            _evidence_row(student_id, e)
+            for student_id, evidence in evidence_by_student.items()
+            for e in evidence
+        ]
+        self.db.add_all(rows)
+        for row in rows:
+            dirty[row.student_id].add(row.skill_id)
+
+        self._finish_changes(changes, dirty)
+
+    def _finish_changes(self, changes: Sequence[Row], dirty: Dict[uuid.UUID, Set[uuid.UUID]]):
+        """Dequeue applied changes, queue the dirty skills and commit"""
+        if changes:
+            self.db.query(EvidenceChange).filter(
+                EvidenceChange.id.in_([c.id for c in changes])
+            ).delete(synchronize_session=False)
+
+        self.db.add_all([
+            SkillScoreChange(student_id=student_id, skill_id=skill_id)
+            for student_id, skill_ids in dirty.items()
+            for skill_id in skill_ids
+        ])
+
+        self.db.commit()
+
+    def get_dirty_skills(self, student_ids: Sequence[uuid.UUID]) -> List[Row]:
+        """Queued (student, skill) pairs awaiting rescoring, as (id, student_id, skill_id) rows"""
+        return self.db.query(
+            SkillScoreChange.id, SkillScoreChange.student_id, SkillScoreChange.skill_id
+        ).filter(
+            SkillScoreChange.student_id.in_(student_ids)
+        ).all()
+
+    def clear_dirty_skills(self, marks: Sequence[Row]):
+        """Dequeue rescored pairs (committed by the caller with the scores)"""
+        if marks:
+            self.db.query(SkillScoreChange).filter(
+                SkillScoreChange.id.in_([mark.id for mark in marks])
+            ).delete(synchronize_session=False)
+
+    def load(
+        self,
+        student_id: uuid.UUID,
+        skill_id: Optional[uuid.UUID] = None
+    ) -> List[Tuple[SkillEvidence, str]]:
+        """
+        Stored evidence of a student
+
+        Both lookups are served by the (student_id, skill_id) index, so
+        loading one skill reads only that skill's rows.
+
+        Args:
+            student_id: Student UUID
+            skill_id: Only evidence for this skill
+
+        Returns:
+            List of (SkillEvidence, skill name)
+        """
+        query = self.db.query(SkillEvidence, Skill.skill_name).join(
+            Skill, SkillEvidence.skill_id == Skill.id
+        ).filter(
+            SkillEvidence.student_id == student_id
+        )
+        if skill_id is not None:
+            query = query.filter(SkillEvidence.skill_id == skill_id)
+        return query.all()
+
+    def load_many(
+        self,
+        student_ids: Sequence[uuid.UUID],
+        skill_ids: Optional[Sequence[uuid.UUID]] = None
+    ) -> Dict[uuid.UUID, List[Tuple[SkillEvidence, str]]]:
+        """
+        Stored evidence of many students
+
+        Args:
+            student_ids: Student UUIDs (one IN query; callers chunk large lists)
+            skill_ids: Only evidence for these skills
+
+        Returns:
+            Dictionary mapping each student to a list of (SkillEvidence, skill name)
+        """
+        query = self.db.query(SkillEvidence, Skill.skill_name).join(
+            Skill, SkillEvidence.skill_id == Skill.id
+        ).filter(
+            SkillEvidence.student_id.in_(student_ids)
+        )
+        if skill_ids is not None:
+            query = query.filter(SkillEvidence.skill_id.in_(skill_ids))
+
+        rows = {student_id: [] for student_id in student_ids}
+        for row, skill_name in query:
+            rows[row.student_id].append((row, skill_name))
+        return rows
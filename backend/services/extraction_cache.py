@@ -0,0 +1,191 @@
+"""
+Extraction Result Cache
+Content-addressed cache of skill extraction results with an in-memory LRU
+tier and a persistent database tier
+"""
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from dotenv import load_dotenv
+
+from models.database_models import ExtractionCacheEntry
+
+load_dotenv()
+
+
+class _LRUCache:
+    """Thread-safe LRU mapping shared by every ExtractionCache in the process"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, List[Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: List[Dict]):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_memory_tier = _LRUCache(int(os.getenv('EXTRACTION_CACHE_SIZE', 4096)))
+
+# Taxonomy versions whose stale database rows have already been purged
+_purged_versions = set()
+
+
+class ExtractionCache:
+    """
+    Cache of extraction results keyed by
+    (hash of text, source, taxonomy version, extractor version, options)
+
+    Because the taxonomy version is a content hash of the skills table, any
+    change to the taxonomy produces new keys, so stale results are never
+    served. Database rows from older taxonomy versions are purged the first
+    time a new version is written.
+    """
+
+    def __init__(
+        self,
+        db: Optional[Session],
+        taxonomy_version: str,
+        extractor_version: str
+    ):
+        """
+        Initialize cache
+
+        Args:
+            db: Database session for the persistent tier (None for memory only)
+            taxonomy_version: Content hash of the current skill taxonomy
+            extractor_version: Version of the extraction logic and model
+        """
+        self.db = db
+        self.taxonomy_version = taxonomy_version
+        self.extractor_version = extractor_version
+        self.persist = db is not None and os.getenv('EXTRACTION_CACHE_PERSIST', 'True') == 'True'
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        """Content hash of an input text"""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def make_key(self, text_hash: str, source: str, options: Dict[str, Any]) -> str:
+        """Build the cache key for one extraction request"""
+        key_parts = json.dumps([
+            text_hash, source, self.taxonomy_version, self.extractor_version, options
+        ], sort_keys=True)
+        return hashlib.sha256(key_parts.encode('utf-8')).hexdigest()
+
+    def get(self, text: str, source: str, options: Dict[str, Any]) -> Optional[List[Dict]]:
+        """
+        Look up cached matches
+
+        Args:
+            text: Raw input text
+            source: Data source
+            options: Extraction options that affect the result
+
+        Returns:
+            List of match dictionaries, or None on a miss
+        """
+        key = self.make_key(self.hash_text(text), source, options)
+
+        matches = _memory_tier.get(key)
+        if matches is not None or not self.persist:
+            return matches
+
+        try:
+            entry = self.db.query(ExtractionCacheEntry).filter(
+                ExtractionCacheEntry.cache_key == key
+            ).first()
+        except SQLAlchemyError as e:
+            print(f"WARNING: Extraction cache lookup failed: {e}")
+            return None
+
+        if entry is None:
+            return None
+
+        _memory_tier.put(key, entry.matches)
+        return entry.matches
+
+    def put(self, text: str, source: str, options: Dict[str, Any], matches: List[Dict]):
+        """Store matches in both tiers"""
+        self.put_many([(text, source, matches)], options)
+
+    def put_many(self, entries: List[Tuple[str, str, List[Dict]]], options: Dict[str, Any]):
+        """
+        Store the matches of many texts in both tiers
+
+        The database tier is written through its own session so a cache
+        write never commits or rolls back the caller's transaction; all
+        entries share one existing-key lookup and one commit.
+
+        Args:
+            entries: (text, source, matches) per extracted text
+            options: Extraction options shared by the entries
+        """
+        rows = {}
+        for text, source, matches in entries:
+            text_hash = self.hash_text(text)
+            key = self.make_key(text_hash, source, options)
+            _memory_tier.put(key, matches)
+            rows[key] = (text_hash, source, matches)
+
+        if not self.persist or not rows:
+            return
+
+        session = Session(bind=self.db.get_bind())
+        try:
+            if self.taxonomy_version not in _purged_versions:
+                session.query(ExtractionCacheEntry).filter(
+                    ExtractionCacheEntry.taxonomy_version != self.taxonomy_version
+                ).delete(synchronize_session=False)
+
+            existing = {
+                entry.cache_key: entry
+                for entry in session.query(ExtractionCacheEntry).filter(
+                    ExtractionCacheEntry.cache_key.in_(list(rows))
+                )
+            }
+            for key, (text_hash, source, matches) in rows.items():
+                entry = existing.get(key)
+                if entry is None:
+                    session.add(ExtractionCacheEntry(
+                        cache_key=key,
+                        text_hash=text_hash,
+                        source=source,
+                        taxonomy_version=self.taxonomy_version,
+                        extractor_version=self.extractor_version,
+                        matches=matches
+                    ))
+                else:
+                    entry.matches = matches
+            session.commit()
+            _purged_versions.add(self.taxonomy_version)
+        except SQLAlchemyError as e:
+            session.rollback()
+            print(f"WARNING: Extraction cache write failed: {e}")
+        finally:
+            session.close()
+
+
+def clear_memory_cache():
+    """Drop every in-memory cached result (e.g. after a manual reindex)"""
+    _memory_tier.clear()
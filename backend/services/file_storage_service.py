@@ -1,10 +1,12 @@
 """
-File Storage Service (MinIO/S3)
+File Storage Service (MinIO/S3/local filesystem)
 Handles document uploads for syllabi, project PDFs, certificates
 """
 import os
+import shutil
 from typing import Optional, BinaryIO
 from datetime import datetime, timedelta
+from urllib.parse import urlparse, unquote
 import mimetypes
 from minio import Minio
 from minio.error import S3Error
@@ -26,6 +28,8 @@ class FileStorageService:
         
         if self.storage_type == 'minio':
             self._init_minio()
+        elif self.storage_type == 'local':
+            self._init_local()
         else:
             self._init_s3()
     
@@ -57,6 +61,61 @@ class FileStorageService:
         )
         self.bucket_name = os.getenv('S3_BUCKET_NAME', 'esr-documents')
     
+    def _init_local(self):
+        """Initialize local filesystem storage (offline stand-in for a bucket)"""
+        self.bucket_name = os.getenv('MINIO_BUCKET_NAME', 'esr-documents')
+        self.local_root = os.path.abspath(os.getenv('LOCAL_STORAGE_DIR', './storage'))
+        os.makedirs(self.local_root, exist_ok=True)
+    
+    def _local_path(self, object_name: str) -> str:
+        """Filesystem path of an object, confined to the storage directory"""
+        path = os.path.abspath(os.path.join(self.local_root, object_name))
+        if os.path.commonpath([path, self.local_root]) != self.local_root:
+            raise ValueError(f"Object name escapes storage directory: {object_name}")
+        return path
+    
+    def object_name_from_url(self, url: str) -> str:
+        """
+        Object name referenced by a stored URL
+        
+        Accepts s3://bucket/key URLs, http(s) object or presigned URLs
+        (path-style, bucket first) and plain object names.
+        """
+        parsed = urlparse(url)
+        if parsed.scheme == 's3':
+            return unquote(parsed.path.lstrip('/'))
+        if parsed.scheme in ('http', 'https'):
+            path = unquote(parsed.path.lstrip('/'))
+            bucket_prefix = f"{self.bucket_name}/"
+            return path[len(bucket_prefix):] if path.startswith(bucket_prefix) else path
+        if parsed.scheme == 'file':
+            return os.path.relpath(unquote(parsed.path), getattr(self, 'local_root', '/'))
+        return url
+    
+    def open_file(self, object_name: str) -> BinaryIO:
+        """
+        Open a stored file for streaming reads
+        
+        Returns:
+            Binary file-like object; the caller releases it with close_file
+        """
+        if self.storage_type == 'minio':
+            return self.minio_client.get_object(
+                bucket_name=self.bucket_name,
+                object_name=object_name
+            )
+        if self.storage_type == 'local':
+            return open(self._local_path(object_name), 'rb')
+        return self.s3_client.get_object(Bucket=self.bucket_name, Key=object_name)['Body']
+    
+    def close_file(self, stream: BinaryIO):
+        """Close a stream from open_file (MinIO also returns its pooled connection)"""
+        try:
+            stream.close()
+        finally:
+            if self.storage_type == 'minio':
+                stream.release_conn()
+    
     def validate_file(self, filename: str, file_size: int) -> tuple[bool, Optional[str]]:
         """
         Validate file before upload
@@ -133,6 +192,13 @@ class FileStorageService:
                     content_type=content_type,
                     metadata=metadata or {}
                 )
+            elif self.storage_type == 'local':
+                # Copy to the storage directory
+                file_content.seek(0)
+                path = self._local_path(object_name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'wb') as f:
+                    shutil.copyfileobj(file_content, f)
             else:
                 # Upload to S3
                 file_content.seek(0)
@@ -158,7 +224,7 @@ class FileStorageService:
                 'uploaded_at': datetime.now().isoformat()
             }
         
-        except (S3Error, ClientError) as e:
+        except (S3Error, ClientError, OSError, ValueError) as e:
             return {
                 'success': False,
                 'error': str(e)
@@ -182,6 +248,8 @@ class FileStorageService:
                     object_name=object_name,
                     expires=timedelta(hours=expiry_hours)
                 )
+            elif self.storage_type == 'local':
+                url = f"file://{self._local_path(object_name)}"
             else:
                 url = self.s3_client.generate_presigned_url(
                     'get_object',
@@ -210,6 +278,8 @@ class FileStorageService:
                     bucket_name=self.bucket_name,
                     object_name=object_name
                 )
+            elif self.storage_type == 'local':
+                os.remove(self._local_path(object_name))
             else:
                 self.s3_client.delete_object(
                     Bucket=self.bucket_name,
@@ -218,7 +288,7 @@ class FileStorageService:
             
             return True
         
-        except (S3Error, ClientError) as e:
+        except (S3Error, ClientError, OSError, ValueError) as e:
             print(f"Error deleting file: {e}")
             return False
     
@@ -244,6 +314,20 @@ class FileStorageService:
                     }
                     for obj in objects
                 ]
+            elif self.storage_type == 'local':
+                files = []
+                for directory, _, filenames in os.walk(self.local_root):
+                    for filename in filenames:
+                        path = os.path.join(directory, filename)
+                        object_name = os.path.relpath(path, self.local_root).replace(os.sep, '/')
+                        if object_name.startswith(prefix):
+                            stat = os.stat(path)
+                            files.append({
+                                'object_name': object_name,
+                                'size': stat.st_size,
+                                'last_modified': datetime.fromtimestamp(stat.st_mtime)
+                            })
+                return files
             else:
                 response = self.s3_client.list_objects_v2(
                     Bucket=self.bucket_name,
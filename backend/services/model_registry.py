@@ -0,0 +1,117 @@
+"""
+Model Registry
+Process-wide cache of NLP models shared by every extraction service
+"""
+import os
+import threading
+from typing import Dict, Optional
+from sentence_transformers import SentenceTransformer
+from dotenv import load_dotenv
+
+from services.text_preprocessor import TextPreprocessor, get_preprocessor
+from services.embedding_batcher import EmbeddingBatcher
+
+load_dotenv()
+
+# Loaded models keyed by model name (None marks a model that failed to load)
+_semantic_models: Dict[str, Optional[SentenceTransformer]] = {}
+_batchers: Dict[str, EmbeddingBatcher] = {}
+_lock = threading.Lock()
+
+
+def get_semantic_model_name() -> str:
+    """Name of the configured sentence-transformer model"""
+    return os.getenv('SENTENCE_TRANSFORMER_MODEL', 'all-MiniLM-L6-v2')
+
+
+def get_semantic_model(model_name: Optional[str] = None) -> Optional[SentenceTransformer]:
+    """
+    Get the shared sentence-transformer model, loading it on first use
+
+    Args:
+        model_name: Model to load (defaults to SENTENCE_TRANSFORMER_MODEL)
+
+    Returns:
+        Loaded model, or None if it could not be loaded
+    """
+    model_name = model_name or get_semantic_model_name()
+
+    if model_name not in _semantic_models:
+        with _lock:
+            # Another thread may have loaded it while we waited
+            if model_name not in _semantic_models:
+                try:
+                    _semantic_models[model_name] = SentenceTransformer(model_name)
+                except Exception as e:
+                    print(f"WARNING: Could not load semantic model: {e}")
+                    _semantic_models[model_name] = None
+
+    return _semantic_models[model_name]
+
+
+def get_embedding_batcher(model_name: Optional[str] = None) -> Optional[EmbeddingBatcher]:
+    """
+    Get the shared micro-batcher in front of the sentence-transformer model
+
+    Configured by EMBEDDING_BATCH_WINDOW_MS and EMBEDDING_BATCH_MAX_SIZE;
+    set EMBEDDING_BATCHING=False to encode directly on the calling thread.
+
+    Args:
+        model_name: Model to batch for (defaults to SENTENCE_TRANSFORMER_MODEL)
+
+    Returns:
+        Batcher, or None if batching is disabled or the model is unavailable
+    """
+    if os.getenv('EMBEDDING_BATCHING', 'True') != 'True':
+        return None
+
+    model_name = model_name or get_semantic_model_name()
+    model = get_semantic_model(model_name)
+    if model is None:
+        return None
+
+    if model_name not in _batchers:
+        with _lock:
+            if model_name not in _batchers:
+                _batchers[model_name] = EmbeddingBatcher(
+                    model,
+                    window_ms=float(os.getenv('EMBEDDING_BATCH_WINDOW_MS', 5)),
+                    max_batch_size=int(os.getenv('EMBEDDING_BATCH_MAX_SIZE', 32))
+                )
+
+    return _batchers[model_name]
+
+
+def get_batching_metrics() -> Dict[str, Dict]:
+    """Batching metrics for every active batcher, keyed by model name"""
+    return {name: batcher.get_metrics() for name, batcher in _batchers.items()}
+
+
+def get_text_preprocessor() -> TextPreprocessor:
+    """Get the shared text preprocessor (spaCy pipeline)"""
+    return get_preprocessor()
+
+
+def warm_up_models() -> Dict[str, bool]:
+    """
+    Load all models and run one inference through each
+
+    Called at application startup so the first request does not pay
+    model load and first-inference costs.
+
+    Returns:
+        Dictionary of model name to whether it is ready
+    """
+    status = {}
+
+    semantic_model = get_semantic_model()
+    if semantic_model:
+        semantic_model.encode(["warm up"], normalize_embeddings=True)
+    status[get_semantic_model_name()] = semantic_model is not None
+
+    preprocessor = get_text_preprocessor()
+    if preprocessor.nlp:
+        preprocessor.nlp("warm up")
+    status['spacy'] = preprocessor.nlp is not None
+
+    return status
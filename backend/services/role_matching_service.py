@@ -2,13 +2,15 @@
 Role Matching Service
 Matches students to industry roles based on skill scores
 """
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
+from collections import defaultdict
 from dataclasses import dataclass
 from sqlalchemy.orm import Session
 import uuid
 
-from models.database_models import IndustryRole, Skill, RoleSkill, StudentRoleMatch
+from models.database_models import IndustryRole, StudentRoleMatch, StudentSkill
 from services.scoring_service import ScoringService
+from services.taxonomy_service import get_taxonomy_snapshot
 
 @dataclass
 class RoleMatch:
@@ -23,6 +25,17 @@ class RoleMatch:
     missing_mandatory_skills: List[str]
     skill_breakdown: List[Dict]
 
+
+def _role_companies(role: IndustryRole) -> str:
+    """Typical hiring companies of a role, comma separated"""
+    return ', '.join(role.typical_companies or [])
+
+
+def _role_ctc(role: IndustryRole) -> str:
+    """Average CTC of a role as text ('' if unknown)"""
+    return f"{float(role.avg_ctc):.2f}" if role.avg_ctc else ''
+
+
 class RoleMatchingService:
     """
     Match students to roles based on skill proficiency
@@ -41,7 +54,8 @@ class RoleMatchingService:
     def calculate_compatibility(
         self,
         student_id: uuid.UUID,
-        role_id: uuid.UUID
+        role_id: uuid.UUID,
+        student_skills: Optional[Dict[str, Dict]] = None
     ) -> Optional[RoleMatch]:
         """
         Calculate compatibility between student and role
@@ -49,6 +63,7 @@ class RoleMatchingService:
         Args:
             student_id: Student UUID
             role_id: Role UUID
+            student_skills: Student's skill scores, if already aggregated
             
         Returns:
             RoleMatch object or None if disqualified
@@ -62,18 +77,30 @@ class RoleMatchingService:
             return None
         
         # Get student's skill scores
-        student_skills = self.scoring_service.aggregate_all_skills(student_id)
+        if student_skills is None:
+            student_skills = self.scoring_service.aggregate_all_skills(student_id)
         
-        # Get role requirements
-        role_skills = self.db.query(RoleSkill, Skill).join(
-            Skill, RoleSkill.skill_id == Skill.id
-        ).filter(
-            RoleSkill.role_id == role_id
-        ).all()
+        return self._match_role(role, student_skills)
+    
+    def _match_role(self, role: IndustryRole, student_skills: Dict[str, Dict]) -> Optional[RoleMatch]:
+        """
+        Compatibility of a student's skill scores with a role's requirements
         
+        Args:
+            role: Role with its required_skills entries (skill_name,
+                min_score, mandatory, weight)
+            student_skills: Student's skill scores by skill ID
+            
+        Returns:
+            RoleMatch object or None if disqualified
+        """
+        # Get role requirements
+        role_skills = role.required_skills or []
         if not role_skills:
             return None
         
+        snapshot = get_taxonomy_snapshot(self.db)
+        
         # Calculate compatibility
         total_score = 0.0
         total_weight = 0.0
@@ -81,20 +108,24 @@ class RoleMatchingService:
         missing_mandatory = []
         skill_breakdown = []
         
-        for role_skill, skill in role_skills:
+        for requirement in role_skills:
+            skill_name = requirement.get('skill_name')
+            skill = snapshot.resolve(skill_name) if skill_name else None
+            
             # Get student's score for this skill (0 if not found)
-            student_score = student_skills.get(str(skill.id), {}).get('score', 0.0)
+            student_score = student_skills.get(str(skill.id), {}).get('score', 0.0) if skill else 0.0
             
-            # Benchmark is the required score for this role
-            benchmark = skill.benchmark_score
+            # Minimum score is the required score for this role
+            benchmark = requirement.get('min_score', 70)
+            is_mandatory = requirement.get('mandatory', False)
             
             # Check mandatory skills
-            if role_skill.is_mandatory:
+            if is_mandatory:
                 # Must meet at least 80% of benchmark
                 min_required = benchmark * 0.8
                 
                 if student_score < min_required:
-                    missing_mandatory.append(skill.skill_name)
+                    missing_mandatory.append(skill_name)
                     # Disqualified if any mandatory skill is missing
                     continue
             
@@ -102,7 +133,7 @@ class RoleMatchingService:
             skill_match = min(student_score / benchmark, 1.0) if benchmark > 0 else 0.0
             
             # Weight for this skill in the role
-            skill_weight = role_skill.weight_percentage / 100.0
+            skill_weight = requirement.get('weight', 0.25)
             
             # Add to totals
             total_score += skill_match * skill_weight
@@ -114,11 +145,11 @@ class RoleMatchingService:
             
             # Breakdown
             skill_breakdown.append({
-                'skill_name': skill.skill_name,
+                'skill_name': skill_name,
                 'student_score': round(student_score, 1),
                 'required_score': benchmark,
                 'gap': max(0, benchmark - student_score),
-                'is_mandatory': role_skill.is_mandatory,
+                'is_mandatory': is_mandatory,
                 'meets_requirement': student_score >= benchmark
             })
         
@@ -132,8 +163,8 @@ class RoleMatchingService:
         return RoleMatch(
             role_id=str(role.id),
             role_title=role.role_title,
-            company=role.company,
-            ctc_range=role.ctc_range,
+            company=_role_companies(role),
+            ctc_range=_role_ctc(role),
             compatibility_percentage=round(compatibility, 2),
             matched_skills=matched_count,
             total_required_skills=len(role_skills),
@@ -193,23 +224,127 @@ class RoleMatchingService:
         # Insert new matches
         saved_count = 0
         for match in matches:
-            role_match = StudentRoleMatch(
-                student_id=student_id,
-                role_id=uuid.UUID(match.role_id),
-                compatibility_score=match.compatibility_percentage,
-                matched_skills_count=match.matched_skills,
-                skill_gap_details={
-                    'total_skills': match.total_required_skills,
-                    'matched': match.matched_skills,
-                    'breakdown': match.skill_breakdown
-                }
-            )
-            self.db.add(role_match)
+            self.db.add(self._to_saved_match(student_id, match))
             saved_count += 1
         
         self.db.commit()
         return saved_count
     
+    def _to_saved_match(self, student_id: uuid.UUID, match: RoleMatch) -> StudentRoleMatch:
+        """StudentRoleMatch row for a RoleMatch"""
+        # Same missing_skills entries as RoleService.match_student_to_roles
+        return StudentRoleMatch(
+            student_id=student_id,
+            role_id=uuid.UUID(match.role_id),
+            match_score=match.compatibility_percentage,
+            missing_skills=[
+                {
+                    'skill_name': skill['skill_name'],
+                    'current_score': skill['student_score'],
+                    'required_score': skill['required_score'],
+                    'gap': skill['gap'],
+                    'mandatory': skill['is_mandatory']
+                }
+                for skill in match.skill_breakdown if not skill['meets_requirement']
+            ]
+        )
+    
+    def refresh_role_matches(
+        self,
+        rescored: Dict[uuid.UUID, Set[str]],
+        min_compatibility: float = 60.0
+    ) -> int:
+        """
+        Recompute saved matches only for roles that use rescored skills
+        
+        Roles are mapped to skills through the skill names in their
+        required_skills; each student's matches for the affected roles are
+        recomputed from their stored scores (read for all students in one
+        query) and replaced, and their other saved matches are left as they
+        are.
+        
+        Args:
+            rescored: Skill IDs rescored per student
+            min_compatibility: Minimum compatibility percentage to save
+            
+        Returns:
+            Number of (student, role) matches recomputed
+        """
+        skill_ids = {uuid.UUID(skill_id) for skill_ids in rescored.values() for skill_id in skill_ids}
+        if not skill_ids:
+            return 0
+        
+        snapshot = get_taxonomy_snapshot(self.db)
+        roles = {role.id: role for role in self.db.query(IndustryRole).all()}
+        roles_by_skill = defaultdict(set)
+        for role in roles.values():
+            for requirement in role.required_skills or []:
+                skill = snapshot.resolve(requirement.get('skill_name') or '')
+                if skill is not None and skill.id in skill_ids:
+                    roles_by_skill[str(skill.id)].add(role.id)
+        
+        role_ids_by_student = {
+            student_id: set().union(*(roles_by_skill[skill_id] for skill_id in student_skill_ids))
+            for student_id, student_skill_ids in rescored.items()
+        }
+        affected = [student_id for student_id, role_ids in role_ids_by_student.items() if role_ids]
+        if not affected:
+            return 0
+        
+        scores = defaultdict(dict)
+        for student_id, skill_id, weighted_score in self.db.query(
+            StudentSkill.student_id, StudentSkill.skill_id, StudentSkill.weighted_score
+        ).filter(
+            StudentSkill.student_id.in_(affected)
+        ):
+            scores[student_id][str(skill_id)] = {'score': float(weighted_score or 0)}
+        
+        refreshed = 0
+        for student_id in affected:
+            role_ids = role_ids_by_student[student_id]
+            
+            self.db.query(StudentRoleMatch).filter(
+                StudentRoleMatch.student_id == student_id,
+                StudentRoleMatch.role_id.in_(role_ids)
+            ).delete(synchronize_session=False)
+            
+            for role_id in role_ids:
+                match = self._match_role(roles[role_id], scores[student_id])
+                if match and match.compatibility_percentage >= min_compatibility:
+                    self.db.add(self._to_saved_match(student_id, match))
+                refreshed += 1
+        
+        self.db.commit()
+        return refreshed
+    
+    def refresh_changed_students(
+        self,
+        student_ids: List[uuid.UUID],
+        min_compatibility: float = 60.0
+    ) -> Dict:
+        """
+        Incrementally rescore students after their records changed
+        
+        Only the (student, skill) pairs whose evidence changed are
+        rescored, and only saved matches for roles using those skills are
+        recomputed.
+        
+        Args:
+            student_ids: Student UUIDs
+            min_compatibility: Minimum compatibility percentage to save
+            
+        Returns:
+            Summary with the number of students and skills rescored and
+            role matches recomputed
+        """
+        rescored = self.scoring_service.update_dirty_scores(student_ids)
+        
+        return {
+            'students_rescored': len(rescored),
+            'skills_rescored': sum(len(skill_ids) for skill_ids in rescored.values()),
+            'role_matches_refreshed': self.refresh_role_matches(rescored, min_compatibility)
+        }
+    
     def get_saved_matches(
         self,
         student_id: uuid.UUID,
@@ -230,7 +365,7 @@ class RoleMatchingService:
         ).filter(
             StudentRoleMatch.student_id == student_id
         ).order_by(
-            StudentRoleMatch.compatibility_score.desc()
+            StudentRoleMatch.match_score.desc()
         ).limit(limit).all()
         
         results = []
@@ -238,11 +373,11 @@ class RoleMatchingService:
             results.append({
                 'role_id': str(role.id),
                 'role_title': role.role_title,
-                'company': role.company,
-                'ctc_range': role.ctc_range,
-                'compatibility': round(match.compatibility_score, 2),
-                'matched_skills': match.matched_skills_count,
-                'total_skills': match.skill_gap_details.get('total_skills', 0),
+                'company': _role_companies(role),
+                'ctc_range': _role_ctc(role),
+                'compatibility': round(float(match.match_score), 2),
+                'matched_skills': len(role.required_skills or []) - len(match.missing_skills or []),
+                'total_skills': len(role.required_skills or []),
                 'calculated_at': match.calculated_at.isoformat() if match.calculated_at else None
             })
         
@@ -2,20 +2,41 @@
 Scoring Service
 Multi-source evidence aggregation with credibility weighting and time decay
 """
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from collections import defaultdict
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+from dotenv import load_dotenv
 from sqlalchemy.orm import Session
 from sqlalchemy import func
+import hashlib
+import os
 import uuid
 
 from models.database_models import (
     Student, Skill, StudentSkill, Project, Certification, 
-    Course, StudentCourse, Internship, SkillAssessment
+    Course, CourseSkill, CourseSkillSync, StudentCourse, Internship, SkillAssessment
 )
 from services.skill_extraction_service import SkillExtractionService
 from services.certification_mapper import CertificationMapper
 from services.course_skill_mapper import CourseSkillMapper
+from services.evidence_store import EvidenceStore
+from services.scoring_kernel import aggregate_evidence
+from services.student_skill_writer import upsert_student_skills
+
+load_dotenv()
+
+
+def get_evidence_batch_size() -> int:
+    """Students per batched evidence query (EVIDENCE_BATCH_SIZE)"""
+    return max(1, int(os.getenv('EVIDENCE_BATCH_SIZE', 500)))
+
+
+def iter_chunks(items: Sequence, size: int) -> Iterator[Sequence]:
+    """Consecutive slices of at most size items"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
 
 @dataclass
 class Evidence:
@@ -42,6 +63,10 @@ class ScoringService:
         'course': 0.70
     }
     
+    # Bump when evidence collection changes in a way the extractor, taxonomy
+    # and course rules versions do not capture
+    EVIDENCE_VERSION = '1'
+    
     def __init__(self, db: Session):
         """
         Initialize scoring service
@@ -53,6 +78,7 @@ class ScoringService:
         self.extraction_service = SkillExtractionService(db)
         self.cert_mapper = CertificationMapper(db)
         self.course_mapper = CourseSkillMapper(db)
+        self.evidence_store = EvidenceStore(db)
     
     def calculate_time_decay(self, evidence_date: datetime) -> float:
         """
@@ -78,49 +104,77 @@ class ScoringService:
     
     def collect_evidence_from_projects(self, student_id: uuid.UUID) -> List[Evidence]:
         """Collect skill evidence from student projects"""
-        evidence = []
-        
-        projects = self.db.query(Project).filter(
-            Project.student_id == student_id
-        ).all()
-        
-        for project in projects:
-            # Extract skills from project description
-            if project.description:
-                skill_matches = self.extraction_service.extract_from_project(
-                    project.description
-                )
-                
-                for match in skill_matches:
-                    evidence.append(Evidence(
-                        source_type='project',
-                        source_id=str(project.id),
-                        skill_id=match.skill_id,
-                        skill_name=match.skill_name,
-                        confidence=match.confidence,
-                        date=project.end_date or project.start_date,
-                        evidence_text=f"Project: {project.title}"
-                    ))
-        
-        return evidence
+        return self._collect_projects([student_id]).get(student_id, [])
     
     def collect_evidence_from_certifications(self, student_id: uuid.UUID) -> List[Evidence]:
         """Collect skill evidence from certifications"""
-        evidence = []
-        
-        certs = self.db.query(Certification).filter(
-            Certification.student_id == student_id
-        ).all()
+        return self._collect_certifications([student_id]).get(student_id, [])
+    
+    def collect_evidence_from_courses(self, student_id: uuid.UUID) -> List[Evidence]:
+        """Collect skill evidence from courses"""
+        return self._collect_courses([student_id]).get(student_id, [])
+    
+    def collect_evidence_from_internships(self, student_id: uuid.UUID) -> List[Evidence]:
+        """Collect skill evidence from internships"""
+        return self._collect_internships([student_id]).get(student_id, [])
+    
+    def collect_evidence_from_assessments(self, student_id: uuid.UUID) -> List[Evidence]:
+        """Collect skill evidence from direct assessments"""
+        return self._collect_assessments([student_id]).get(student_id, [])
+    
+    def _collect_projects(
+        self,
+        student_ids: List[uuid.UUID],
+        source_ids: Optional[List[uuid.UUID]] = None
+    ) -> Dict[uuid.UUID, List[Evidence]]:
+        """Project evidence of many students (one query, one extraction batch)"""
+        evidence = defaultdict(list)
+        
+        query = self.db.query(Project).filter(Project.student_id.in_(student_ids))
+        if source_ids is not None:
+            query = query.filter(Project.id.in_(source_ids))
+        projects = [project for project in query.all() if project.description]
+        
+        # Extract skills from all project descriptions in one batch
+        all_matches = self.extraction_service.extract_skills_batch(
+            [(project.description, 'project') for project in projects]
+        )
+        
+        for project, skill_matches in zip(projects, all_matches):
+            for match in skill_matches:
+                evidence[project.student_id].append(Evidence(
+                    source_type='project',
+                    source_id=str(project.id),
+                    skill_id=match.skill_id,
+                    skill_name=match.skill_name,
+                    confidence=match.confidence,
+                    date=project.end_date or project.start_date,
+                    evidence_text=f"Project: {project.title}"
+                ))
         
-        for cert in certs:
-            # Map certification to skills
-            skill_matches = self.cert_mapper.map_certification(
-                cert_title=cert.certification_name,
-                provider=cert.issuing_organization
-            )
-            
+        return evidence
+    
+    def _collect_certifications(
+        self,
+        student_ids: List[uuid.UUID],
+        source_ids: Optional[List[uuid.UUID]] = None
+    ) -> Dict[uuid.UUID, List[Evidence]]:
+        """Certification evidence of many students (one query, one mapping batch)"""
+        evidence = defaultdict(list)
+        
+        query = self.db.query(Certification).filter(Certification.student_id.in_(student_ids))
+        if source_ids is not None:
+            query = query.filter(Certification.id.in_(source_ids))
+        certs = query.all()
+        
+        # Map all certifications to skills in one batch
+        all_matches = self.cert_mapper.map_certifications(
+            [(cert.certification_name, cert.issuing_organization) for cert in certs]
+        )
+        
+        for cert, skill_matches in zip(certs, all_matches):
             for match in skill_matches:
-                evidence.append(Evidence(
+                evidence[cert.student_id].append(Evidence(
                     source_type='certification',
                     source_id=str(cert.id),
                     skill_id=match['skill_id'],
@@ -132,78 +186,130 @@ class ScoringService:
         
         return evidence
     
-    def collect_evidence_from_courses(self, student_id: uuid.UUID) -> List[Evidence]:
-        """Collect skill evidence from courses"""
-        evidence = []
+    def _collect_courses(
+        self,
+        student_ids: List[uuid.UUID],
+        source_ids: Optional[List[uuid.UUID]] = None
+    ) -> Dict[uuid.UUID, List[Evidence]]:
+        """Course evidence of many students from the materialized course skills"""
+        evidence = defaultdict(list)
+        
+        rows = self._query_course_skills(student_ids, source_ids)
+        
+        # Courses mapped the first time, or whose course / rules changed
+        rules_version = self.course_mapper.get_rules_version()
+        stale = {
+            course.id: course for _, course, sync, _, _ in rows
+            if not self.course_mapper.is_current(course, sync, rules_version)
+        }
+        if stale:
+            # Evidence is built from the new rows right here; course edits
+            # already queued the other enrollments and rule changes bump the
+            # evidence version
+            self.course_mapper.refresh_course_skills(list(stale.values()), queue_evidence=False)
+            rows = self._query_course_skills(student_ids, source_ids)
+        
+        for student_course, course, _, course_skill, skill_name in rows:
+            if course_skill is None:
+                continue
+            
+            evidence[student_course.student_id].append(Evidence(
+                source_type='course',
+                source_id=str(course.id),
+                skill_id=str(course_skill.skill_id),
+                skill_name=skill_name,
+                confidence=float(course_skill.confidence),
+                date=student_course.created_at or datetime.now(),
+                evidence_text=f"Course: {course.course_name}"
+            ))
+        
+        return evidence
+    
+    def _query_course_skills(
+        self,
+        student_ids: List[uuid.UUID],
+        course_ids: Optional[List[uuid.UUID]] = None
+    ):
+        """
+        Student courses with their sync state and materialized skill mappings
         
-        student_courses = self.db.query(StudentCourse, Course).join(
+        Args:
+            student_ids: Students whose courses to read
+            course_ids: Only these courses
+        
+        Returns:
+            Rows of (StudentCourse, Course, CourseSkillSync or None,
+            CourseSkill or None, skill name or None)
+        """
+        query = self.db.query(
+            StudentCourse, Course, CourseSkillSync, CourseSkill, Skill.skill_name
+        ).join(
             Course, StudentCourse.course_id == Course.id
+        ).outerjoin(
+            CourseSkillSync, CourseSkillSync.course_id == Course.id
+        ).outerjoin(
+            CourseSkill, CourseSkill.course_id == Course.id
+        ).outerjoin(
+            Skill, Skill.id == CourseSkill.skill_id
         ).filter(
-            StudentCourse.student_id == student_id
-        ).all()
-        
-        for student_course, course in student_courses:
-            # Map course to skills
-            skill_matches = self.course_mapper.map_course(
-                course_code=course.course_code,
-                course_name=course.course_name
-            )
-            
+            StudentCourse.student_id.in_(student_ids)
+        )
+        if course_ids is not None:
+            query = query.filter(StudentCourse.course_id.in_(course_ids))
+        return query.all()
+    
+    def _collect_internships(
+        self,
+        student_ids: List[uuid.UUID],
+        source_ids: Optional[List[uuid.UUID]] = None
+    ) -> Dict[uuid.UUID, List[Evidence]]:
+        """Internship evidence of many students (one query, one extraction batch)"""
+        evidence = defaultdict(list)
+        
+        query = self.db.query(Internship).filter(Internship.student_id.in_(student_ids))
+        if source_ids is not None:
+            query = query.filter(Internship.id.in_(source_ids))
+        internships = [internship for internship in query.all() if internship.description]
+        
+        # Extract skills from all descriptions in one batch
+        all_matches = self.extraction_service.extract_skills_batch(
+            [(internship.description, 'internship') for internship in internships]
+        )
+        
+        for internship, skill_matches in zip(internships, all_matches):
             for match in skill_matches:
-                evidence.append(Evidence(
-                    source_type='course',
-                    source_id=str(course.id),
-                    skill_id=match['skill_id'],
-                    skill_name=match['skill_name'],
-                    confidence=match['confidence'],
-                    date=student_course.completed_date or datetime.now(),
-                    evidence_text=f"Course: {course.course_name}"
+                evidence[internship.student_id].append(Evidence(
+                    source_type='internship',
+                    source_id=str(internship.id),
+                    skill_id=match.skill_id,
+                    skill_name=match.skill_name,
+                    confidence=match.confidence,
+                    date=internship.end_date or internship.start_date,
+                    evidence_text=f"Internship: {internship.company_name}"
                 ))
         
         return evidence
     
-    def collect_evidence_from_internships(self, student_id: uuid.UUID) -> List[Evidence]:
-        """Collect skill evidence from internships"""
-        evidence = []
-        
-        internships = self.db.query(Internship).filter(
-            Internship.student_id == student_id
-        ).all()
-        
-        for internship in internships:
-            # Extract skills from description
-            if internship.description:
-                skill_matches = self.extraction_service.extract_skills(
-                    text=internship.description,
-                    source='internship'
-                )
-                
-                for match in skill_matches:
-                    evidence.append(Evidence(
-                        source_type='internship',
-                        source_id=str(internship.id),
-                        skill_id=match.skill_id,
-                        skill_name=match.skill_name,
-                        confidence=match.confidence,
-                        date=internship.end_date or internship.start_date,
-                        evidence_text=f"Internship: {internship.company_name}"
-                    ))
-        
-        return evidence
-    
-    def collect_evidence_from_assessments(self, student_id: uuid.UUID) -> List[Evidence]:
-        """Collect skill evidence from direct assessments"""
-        evidence = []
+    def _collect_assessments(
+        self,
+        student_ids: List[uuid.UUID],
+        source_ids: Optional[List[uuid.UUID]] = None
+    ) -> Dict[uuid.UUID, List[Evidence]]:
+        """Assessment evidence of many students (one query)"""
+        evidence = defaultdict(list)
         
-        assessments = self.db.query(SkillAssessment, Skill).join(
+        query = self.db.query(SkillAssessment, Skill).join(
             Skill, SkillAssessment.skill_id == Skill.id
         ).filter(
-            SkillAssessment.student_id == student_id
-        ).all()
+            SkillAssessment.student_id.in_(student_ids)
+        )
+        if source_ids is not None:
+            query = query.filter(SkillAssessment.id.in_(source_ids))
+        assessments = query.all()
         
         for assessment, skill in assessments:
             # Direct score (convert 0-100 to 0-1 confidence)
-            evidence.append(Evidence(
+            evidence[assessment.student_id].append(Evidence(
                 source_type='assessment',
                 source_id=str(assessment.id),
                 skill_id=str(skill.id),
@@ -225,67 +331,216 @@ class ScoringService:
         Returns:
             List of all evidence pieces
         """
-        all_evidence = []
+        return self.collect_all_evidence_batch([student_id])[student_id]
+    
+    def collect_all_evidence_batch(self, student_ids: List[uuid.UUID]) -> Dict[uuid.UUID, List[Evidence]]:
+        """
+        Collect all evidence for many students
+        
+        Each source table is read with one IN query per chunk of
+        EVIDENCE_BATCH_SIZE students and the rows are grouped per student in
+        memory, so the number of queries depends on the batch size rather
+        than the number of students. Descriptions and certifications of the
+        whole chunk go through the extractor and mapper in one batch.
+        
+        Args:
+            student_ids: Student UUIDs
+            
+        Returns:
+            Dictionary mapping each student to their evidence pieces
+        """
+        all_evidence = {student_id: [] for student_id in student_ids}
         
-        all_evidence.extend(self.collect_evidence_from_projects(student_id))
-        all_evidence.extend(self.collect_evidence_from_certifications(student_id))
-        all_evidence.extend(self.collect_evidence_from_courses(student_id))
-        all_evidence.extend(self.collect_evidence_from_internships(student_id))
-        all_evidence.extend(self.collect_evidence_from_assessments(student_id))
+        for chunk in iter_chunks(list(all_evidence), get_evidence_batch_size()):
+            for collect in self._source_collectors().values():
+                for student_id, evidence in collect(chunk).items():
+                    all_evidence[student_id].extend(evidence)
         
         return all_evidence
     
-    def calculate_skill_score(
+    def _source_collectors(self) -> Dict[str, Callable]:
+        """Batch collector per evidence source type, in collection order"""
+        return {
+            'project': self._collect_projects,
+            'certification': self._collect_certifications,
+            'course': self._collect_courses,
+            'internship': self._collect_internships,
+            'assessment': self._collect_assessments
+        }
+    
+    def collect_changed_evidence(self, changes: List) -> Dict[uuid.UUID, List[Evidence]]:
+        """
+        Evidence of changed source records
+        
+        Each source type with changes is read with one IN query on the
+        changed record IDs.
+        
+        Args:
+            changes: Queued changes (student_id, source_type, source_id)
+            
+        Returns:
+            Dictionary mapping students to the evidence of their changed records
+        """
+        by_type = defaultdict(set)
+        for change in changes:
+            by_type[change.source_type].add((change.student_id, str(change.source_id)))
+        
+        collectors = self._source_collectors()
+        all_evidence = defaultdict(list)
+        for source_type, changed in by_type.items():
+            student_ids = list({student_id for student_id, _ in changed})
+            source_ids = list({uuid.UUID(source_id) for _, source_id in changed})
+            
+            for student_id, evidence in collectors[source_type](student_ids, source_ids).items():
+                # Course IDs are shared; keep only the enrollments that changed
+                all_evidence[student_id].extend(
+                    e for e in evidence if (student_id, e.source_id) in changed
+                )
+        
+        return all_evidence
+    
+    def get_evidence_version(self) -> str:
+        """Version of everything stored evidence is derived from besides the records"""
+        version = (
+            f"{self.EVIDENCE_VERSION}:{self.extraction_service.get_extractor_version()}:"
+            f"{self.course_mapper.get_rules_version()}"
+        )
+        return hashlib.sha1(version.encode('utf-8')).hexdigest()
+    
+    def sync_evidence(self, student_id: uuid.UUID) -> bool:
+        """
+        Bring a student's stored evidence up to date
+        
+        Only records that changed since they were extracted are re-extracted;
+        everything is rebuilt only when the extractor, taxonomy or mapping
+        rules changed.
+        
+        Args:
+            student_id: Student UUID
+            
+        Returns:
+            True if any evidence was updated
+        """
+        return self.sync_evidence_batch([student_id]) > 0
+    
+    def get_evidence(
         self,
         student_id: uuid.UUID,
-        skill_id: uuid.UUID
-    ) -> Tuple[float, List[Evidence]]:
+        skill_id: Optional[uuid.UUID] = None
+    ) -> List[Evidence]:
         """
-        Calculate weighted score for a specific skill
+        Stored evidence of a student, rebuilt first if out of date
         
         Args:
             student_id: Student UUID
-            skill_id: Skill UUID
+            skill_id: Only evidence for this skill
             
         Returns:
-            Tuple of (final_score, evidence_list)
+            List of evidence pieces
         """
-        # Collect all evidence
-        all_evidence = self.collect_all_evidence(student_id)
+        self.sync_evidence(student_id)
         
-        # Filter for this skill
-        skill_evidence = [
-            e for e in all_evidence
-            if e.skill_id == str(skill_id)
+        return [
+            self._to_evidence(row, skill_name)
+            for row, skill_name in self.evidence_store.load(student_id, skill_id)
         ]
+    
+    def sync_evidence_batch(self, student_ids: List[uuid.UUID]) -> int:
+        """
+        Bring the stored evidence of many students up to date
         
-        if not skill_evidence:
-            return 0.0, []
+        Per chunk, sync states and queued changes are read with one query
+        each. Students built with an older evidence version are rebuilt;
+        for the rest only the changed records are re-extracted. Either way
+        the affected (student, skill) pairs are queued for rescoring.
         
-        # Calculate weighted score
-        total_score = 0.0
-        total_weight = 0.0
+        Args:
+            student_ids: Student UUIDs
+            
+        Returns:
+            Number of students whose evidence was updated
+        """
+        evidence_version = self.get_evidence_version()
+        updated = 0
         
-        for evidence in skill_evidence:
-            # Base score (0-100)
-            base_score = evidence.confidence * 100
+        for chunk in iter_chunks(list(student_ids), get_evidence_batch_size()):
+            states = self.evidence_store.get_sync_states(chunk, evidence_version)
+            changes = self.evidence_store.get_changes(chunk)
             
-            # Credibility weight
-            credibility = self.CREDIBILITY_WEIGHTS.get(evidence.source_type, 0.5)
+            stale = {student_id for student_id in chunk if not states[student_id]}
+            if stale:
+                self.evidence_store.replace_many(
+                    self.collect_all_evidence_batch(list(stale)),
+                    evidence_version,
+                    [change for change in changes if change.student_id in stale]
+                )
             
-            # Time decay
-            time_decay = self.calculate_time_decay(evidence.date)
+            changes = [change for change in changes if change.student_id not in stale]
+            if changes:
+                self.evidence_store.apply_changes(changes, self.collect_changed_evidence(changes))
             
-            # Weighted contribution
-            weighted_score = base_score * credibility * time_decay
+            updated += len(stale | {change.student_id for change in changes})
+        
+        return updated
+    
+    def get_evidence_batch(self, student_ids: List[uuid.UUID]) -> Dict[uuid.UUID, List[Evidence]]:
+        """
+        Stored evidence of many students, rebuilt first where out of date
+        
+        Args:
+            student_ids: Student UUIDs
+            
+        Returns:
+            Dictionary mapping each student to their evidence pieces
+        """
+        self.sync_evidence_batch(student_ids)
+        
+        all_evidence = {}
+        for chunk in iter_chunks(list(student_ids), get_evidence_batch_size()):
+            for student_id, rows in self.evidence_store.load_many(chunk).items():
+                all_evidence[student_id] = [
+                    self._to_evidence(row, skill_name) for row, skill_name in rows
+                ]
+        return all_evidence
+    
+    def _to_evidence(self, row, skill_name: str) -> Evidence:
+        """Evidence from a stored skill_evidence row"""
+        return Evidence(
+            source_type=row.source_type,
+            source_id=str(row.source_id),
+            skill_id=str(row.skill_id),
+            skill_name=skill_name,
+            confidence=float(row.confidence),
+            date=row.evidence_date,
+            evidence_text=row.evidence_text
+        )
+    
+    def calculate_skill_score(
+        self,
+        student_id: uuid.UUID,
+        skill_id: uuid.UUID
+    ) -> Tuple[float, List[Evidence]]:
+        """
+        Calculate weighted score for a specific skill
+        
+        Only the stored evidence for this (student, skill) pair is loaded,
+        so the cost does not depend on the student's other skills.
+        
+        Args:
+            student_id: Student UUID
+            skill_id: Skill UUID
             
-            total_score += weighted_score
-            total_weight += credibility
+        Returns:
+            Tuple of (final_score, evidence_list)
+        """
+        # Stored evidence for this skill
+        skill_evidence = self.get_evidence(student_id, skill_id)
         
-        # Final score
-        final_score = total_score / total_weight if total_weight > 0 else 0.0
+        if not skill_evidence:
+            return 0.0, []
         
-        return min(100.0, final_score), skill_evidence
+        scores = self._aggregate_evidence_batch({student_id: skill_evidence})[student_id]
+        return scores[str(skill_id)]['score'], skill_evidence
     
     def aggregate_all_skills(self, student_id: uuid.UUID) -> Dict[str, Dict]:
         """
@@ -297,47 +552,27 @@ class ScoringService:
         Returns:
             Dictionary mapping skill_id to score details
         """
-        # Collect all evidence
-        all_evidence = self.collect_all_evidence(student_id)
-        
-        # Group by skill
-        skills_map = {}
-        for evidence in all_evidence:
-            if evidence.skill_id not in skills_map:
-                skills_map[evidence.skill_id] = {
-                    'skill_name': evidence.skill_name,
-                    'evidence': []
-                }
-            skills_map[evidence.skill_id]['evidence'].append(evidence)
-        
-        # Calculate score for each skill
-        results = {}
-        for skill_id, data in skills_map.items():
-            evidence_list = data['evidence']
-            
-            # Calculate weighted score
-            total_score = 0.0
-            total_weight = 0.0
-            
-            for evidence in evidence_list:
-                base_score = evidence.confidence * 100
-                credibility = self.CREDIBILITY_WEIGHTS.get(evidence.source_type, 0.5)
-                time_decay = self.calculate_time_decay(evidence.date)
-                
-                weighted_score = base_score * credibility * time_decay
-                total_score += weighted_score
-                total_weight += credibility
-            
-            final_score = total_score / total_weight if total_weight > 0 else 0.0
-            
-            results[skill_id] = {
-                'skill_name': data['skill_name'],
-                'score': min(100.0, final_score),
-                'evidence_count': len(evidence_list),
-                'last_updated': max(e.date for e in evidence_list if e.date)
-            }
+        # Stored evidence (re-extracted only when records changed)
+        return self._aggregate_evidence_batch({student_id: self.get_evidence(student_id)})[student_id]
+    
+    def _aggregate_evidence_batch(
+        self,
+        evidence_by_student: Dict[uuid.UUID, List[Evidence]]
+    ) -> Dict[uuid.UUID, Dict[str, Dict]]:
+        """
+        Score each skill in the evidence of many students
+        
+        Evidence is packed into arrays and scored by the vectorized kernel,
+        with CREDIBILITY_WEIGHTS (0.5 for unknown sources) and the same time
+        decay as calculate_time_decay.
         
-        return results
+        Args:
+            evidence_by_student: All evidence per student
+            
+        Returns:
+            Dictionary mapping each student to {skill_id: score details}
+        """
+        return aggregate_evidence(evidence_by_student, self.CREDIBILITY_WEIGHTS, default_credibility=0.5)
     
     def update_student_skill_scores(self, student_id: uuid.UUID) -> int:
         """
@@ -349,32 +584,131 @@ class ScoringService:
         Returns:
             Number of skills updated
         """
-        # Calculate all scores
-        skill_scores = self.aggregate_all_skills(student_id)
+        return self.update_scores_batch([student_id])
+    
+    def update_scores_batch(self, student_ids: List[uuid.UUID]) -> int:
+        """
+        Update all skill scores of many students in database
         
-        # Update or create StudentSkill records
+        Per chunk of EVIDENCE_BATCH_SIZE students, evidence is synced and
+        loaded, then all scores are upserted in one commit. Skills queued
+        for rescoring that no longer have any evidence lose their
+        StudentSkill row.
+        
+        Args:
+            student_ids: Student UUIDs
+            
+        Returns:
+            Number of skills updated
+        """
         updated_count = 0
-        for skill_id, data in skill_scores.items():
-            student_skill = self.db.query(StudentSkill).filter(
-                StudentSkill.student_id == student_id,
-                StudentSkill.skill_id == uuid.UUID(skill_id)
-            ).first()
+        
+        for chunk in iter_chunks(list(student_ids), get_evidence_batch_size()):
+            skill_scores_by_student = self._aggregate_evidence_batch(self.get_evidence_batch(chunk))
+            marks = self.evidence_store.get_dirty_skills(chunk)
+            updated_count += self._write_scores(skill_scores_by_student, marks)
+        
+        return updated_count
+    
+    def update_dirty_scores(self, student_ids: List[uuid.UUID]) -> Dict[uuid.UUID, Set[str]]:
+        """
+        Rescore only the (student, skill) pairs whose evidence changed
+        
+        Evidence is synced first (re-extracting only changed records), then
+        the queued pairs are re-aggregated from their stored evidence and
+        written; pairs left without evidence lose their score.
+        
+        Args:
+            student_ids: Student UUIDs
             
-            if student_skill:
-                # Update existing
-                student_skill.proficiency_score = data['score']
-                student_skill.last_assessed = datetime.now()
-            else:
-                # Create new
-                student_skill = StudentSkill(
-                    student_id=student_id,
-                    skill_id=uuid.UUID(skill_id),
-                    proficiency_score=data['score'],
-                    last_assessed=datetime.now()
-                )
-                self.db.add(student_skill)
+        Returns:
+            Dictionary mapping students to the skill IDs that were rescored
+        """
+        rescored = defaultdict(set)
+        
+        for chunk in iter_chunks(list(student_ids), get_evidence_batch_size()):
+            self.sync_evidence_batch(chunk)
+            marks = self.evidence_store.get_dirty_skills(chunk)
+            if not marks:
+                continue
+            
+            dirty = defaultdict(set)
+            for mark in marks:
+                dirty[mark.student_id].add(str(mark.skill_id))
+            
+            rows = self.evidence_store.load_many(
+                list(dirty), list({mark.skill_id for mark in marks})
+            )
+            evidence_by_student = {
+                student_id: [
+                    self._to_evidence(row, skill_name)
+                    for row, skill_name in rows[student_id]
+                    if str(row.skill_id) in dirty[student_id]
+                ]
+                for student_id in dirty
+            }
             
-            updated_count += 1
+            self._write_scores(self._aggregate_evidence_batch(evidence_by_student), marks)
+            for student_id, skill_ids in dirty.items():
+                rescored[student_id] |= skill_ids
         
+        return rescored
+    
+    def _write_scores(self, skill_scores_by_student: Dict[uuid.UUID, Dict[str, Dict]], marks: List) -> int:
+        """
+        Write skill scores and dequeue the rescored pairs in one commit
+        
+        Scores are upserted in bulk (one INSERT ... ON CONFLICT statement per
+        chunk) rather than read and updated row by row.
+        
+        Args:
+            skill_scores_by_student: {skill_id: score details} per student
+            marks: Queued dirty pairs covered by these scores; those without
+                a score no longer have evidence and their score is removed
+            
+        Returns:
+            Number of skills updated
+        """
+        now = datetime.now()
+        rows = [
+            {
+                'student_id': student_id,
+                'skill_id': uuid.UUID(skill_id),
+                'raw_score': int(data['score']),
+                'weighted_score': round(data['score'], 2),
+                # Confidence based on evidence count
+                'confidence_level': round(min(1.0, data['evidence_count'] * 0.2), 2),
+                'evidence_sources': [
+                    {'type': source_type, 'score': score}
+                    for source_type, score in data['sources'].items()
+                ],
+                'last_updated': now
+            }
+            for student_id, skill_scores in skill_scores_by_student.items()
+            for skill_id, data in skill_scores.items()
+        ]
+        updated_count = upsert_student_skills(self.db, rows)
+        
+        # Skills whose last evidence was removed
+        removed = {
+            (mark.student_id, mark.skill_id) for mark in marks
+            if str(mark.skill_id) not in skill_scores_by_student.get(mark.student_id, {})
+        }
+        if removed:
+            stale_ids = [
+                row_id for row_id, student_id, skill_id in self.db.query(
+                    StudentSkill.id, StudentSkill.student_id, StudentSkill.skill_id
+                ).filter(
+                    StudentSkill.student_id.in_({student_id for student_id, _ in removed}),
+                    StudentSkill.skill_id.in_({skill_id for _, skill_id in removed})
+                ).all()
+                if (student_id, skill_id) in removed
+            ]
+            if stale_ids:
+                self.db.query(StudentSkill).filter(
+                    StudentSkill.id.in_(stale_ids)
+                ).delete(synchronize_session=False)
+        
+        self.evidence_store.clear_dirty_skills(marks)
         self.db.commit()
         return updated_count
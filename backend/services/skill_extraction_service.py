@@ -3,14 +3,60 @@ Skill Extraction Service
 Core NLP-based skill extraction engine using multiple matching strategies
 """
 from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict, field
+import math
+import re
+import threading
+import time
 from fuzzywuzzy import fuzz
-from sentence_transformers import SentenceTransformer
 import numpy as np
 from sqlalchemy.orm import Session
 
-from models.database_models import Skill
-from services.text_preprocessor import get_preprocessor
+from services.model_registry import (
+    get_semantic_model, get_semantic_model_name, get_embedding_batcher, get_text_preprocessor
+)
+from services.embedding_cache import SkillEmbeddingCache
+from services.embedding_quantization import QuantizedMatrix
+from services.extraction_cache import ExtractionCache
+from services.skill_matchers import KeywordMatcher, FuzzyCandidateIndex
+from services.taxonomy_service import TaxonomySkill, compute_taxonomy_version, get_taxonomy_snapshot
+from services.vector_index import sync_index
+
+# Compiled matchers keyed by (kind, taxonomy version), shared across instances
+_compiled_matchers: Dict[Tuple[str, str], object] = {}
+_MAX_CACHED_MATCHERS = 16
+
+# Skill vector indexes keyed by model name, updated incrementally as the
+# taxonomy grows
+_vector_indexes: Dict[str, object] = {}
+_vector_index_lock = threading.Lock()
+
+# Moving average of each stage's cost in seconds per input character, used
+# to skip stages that would not finish before a deadline. Skipping a stage
+# decays its estimate by the same factor, so a stage priced out by one slow
+# run is tried (and re-measured) again after a few requests.
+_stage_costs: Dict[str, float] = {}
+_STAGE_COST_SMOOTHING = 0.2
+
+
+def _expected_stage_cost(stage: str, chars: int) -> float:
+    """Expected duration in seconds of a stage on a text of this length"""
+    return _stage_costs.get(stage, 0.0) * chars
+
+
+def _record_stage_cost(stage: str, seconds: float, chars: int):
+    """Fold one complete run of a stage into its per-character average"""
+    cost = seconds / max(chars, 1)
+    previous = _stage_costs.get(stage)
+    _stage_costs[stage] = cost if previous is None else (
+        (1 - _STAGE_COST_SMOOTHING) * previous + _STAGE_COST_SMOOTHING * cost
+    )
+
+
+def _decay_stage_cost(stage: str):
+    """Lower the estimate of a skipped stage so it is probed again later"""
+    if stage in _stage_costs:
+        _stage_costs[stage] *= 1 - _STAGE_COST_SMOOTHING
 
 @dataclass
 class SkillMatch:
@@ -20,7 +66,14 @@ class SkillMatch:
     confidence: float  # 0-1
     source: str  # 'project', 'resume', 'certification', 'course'
     evidence_text: str  # The text snippet that matched
-    match_type: str  # 'exact', 'fuzzy', 'semantic'
+    match_type: str  # 'exact', 'alias', 'fuzzy', 'semantic'
+
+@dataclass
+class ExtractionResult:
+    """Matches from a deadline-bounded extraction"""
+    matches: List[SkillMatch]
+    degraded: bool = False  # True if a stage was skipped or cut short for lack of time
+    skipped_stages: List[str] = field(default_factory=list)  # 'fuzzy', 'semantic'
 
 class SkillExtractionService:
     """
@@ -30,6 +83,44 @@ class SkillExtractionService:
     3. Semantic similarity (sentence-transformers)
     """
     
+    # Bump whenever a change to the matching logic changes extraction results
+    EXTRACTOR_VERSION = '3'
+    
+    # Strategy sets selectable per request, cheapest first:
+    #   fast     - exact keyword matching only: one Aho-Corasick pass over
+    #              the cleaned text, no spaCy and no model. Cost grows with
+    #              text length only; suited to interactive tag suggestions.
+    #   balanced - fast plus fuzzy matching of the skills shortlisted by the
+    #              n-gram index. Still no spaCy or model; adds a few
+    #              fuzz.partial_ratio calls per document.
+    #   full     - balanced plus spaCy preprocessing and semantic matching.
+    #              Dominated by the sentence-transformer encode (per window
+    #              for long documents); intended for offline recomputes.
+    EXTRACTION_MODES = ('fast', 'balanced', 'full')
+    
+    # Minimum fuzz.partial_ratio score (0-1) for a fuzzy match
+    FUZZY_THRESHOLD = 0.9
+    
+    # Minimum cosine similarity for a semantic match
+    SEMANTIC_THRESHOLD = 0.7
+    
+    # Maximum number of semantic matches considered per document
+    SEMANTIC_TOP_K = 10
+    
+    # Documents longer than this (characters) are embedded window by window,
+    # since the model truncates long inputs and one vector blurs every mention
+    LONG_DOCUMENT_CHARS = 1000
+    
+    # Upper bound on windows encoded per document (keeps latency bounded)
+    MAX_SEMANTIC_WINDOWS = 32
+    
+    # Windows encoded per call under a deadline; the deadline is checked
+    # between calls
+    DEADLINE_WINDOW_BATCH = 8
+    
+    # Windows shorter than this (words) are too small to embed on their own
+    MIN_WINDOW_WORDS = 3
+    
     def __init__(self, db: Session):
         """
         Initialize extraction service
@@ -38,63 +129,165 @@ class SkillExtractionService:
             db: Database session for skill queries
         """
         self.db = db
-        self.preprocessor = get_preprocessor()
         
-        # Load sentence transformer model for semantic similarity
-        try:
-            self.semantic_model = SentenceTransformer('all-MiniLM-L6-v2')
-        except Exception as e:
-            print(f"WARNING: Could not load semantic model: {e}")
-            self.semantic_model = None
+        # Shared models, loaded once per process by the model registry
+        self.preprocessor = get_text_preprocessor()
+        self.semantic_model = get_semantic_model()
+        
+        # Document encodes are micro-batched with concurrent requests
+        batcher = get_embedding_batcher()
+        self.batcher = batcher if batcher and batcher.model is self.semantic_model else None
         
         # Cache skills from database
         self._skill_cache = None
         self._skill_embeddings = None
+        self._skill_row_keys = None
+        self._vector_index = None
+        self._taxonomy_version = None
         
-    def _load_skills(self) -> List[Skill]:
-        """Load all skills from database and cache"""
+    def _load_skills(self) -> List[TaxonomySkill]:
+        """Load all skills from the shared taxonomy snapshot and cache"""
         if self._skill_cache is None:
-            self._skill_cache = self.db.query(Skill).all()
+            snapshot = get_taxonomy_snapshot(self.db)
+            self._skill_cache = list(snapshot.skills)
+            self._taxonomy_version = snapshot.version
         return self._skill_cache
     
-    def _get_skill_embeddings(self) -> Tuple[List[str], np.ndarray]:
+    def _get_skill_embeddings(self) -> Optional[Tuple[List[TaxonomySkill], QuantizedMatrix]]:
         """
         Get or create sentence embeddings for all skills
         
+        Rows are L2-normalized so a single matrix product with a normalized
+        text embedding yields cosine similarities for the whole taxonomy.
+        The matrix is persisted by SkillEmbeddingCache, so only skills that
+        changed since the last build are encoded, and may be stored as
+        float16 or int8 (EMBEDDING_STORAGE_DTYPE).
+        
         Returns:
-            Tuple of (skill_names, embeddings_matrix)
+            Tuple of (skills, embeddings_matrix) or None if no model is loaded
         """
         if self._skill_embeddings is None and self.semantic_model:
             skills = self._load_skills()
+            cache = SkillEmbeddingCache(get_semantic_model_name())
+            
+            row_keys = [
+                cache.row_key(str(skill.id), skill.skill_name, skill.description)
+                for skill in skills
+            ]
+            self._skill_row_keys = row_keys
             skill_texts = [f"{skill.skill_name} {skill.description or ''}" for skill in skills]
+            
             self._skill_embeddings = (
-                [skill.skill_name for skill in skills],
-                self.semantic_model.encode(skill_texts)
+                skills,
+                cache.get_embeddings(
+                    row_keys,
+                    skill_texts,
+                    lambda texts: self.semantic_model.encode(texts, normalize_embeddings=True)
+                )
             )
         return self._skill_embeddings
     
-    def _exact_match(self, text: str, skill_name: str) -> float:
+    def _get_vector_index(self):
+        """
+        Get the nearest-neighbour index over the skill embeddings
+        
+        Exact brute force for small taxonomies and an IVF index once the
+        taxonomy reaches VECTOR_INDEX_ANN_THRESHOLD skills (see
+        services.vector_index). The index is shared by every instance and
+        only the skills added since it was built are indexed. Updates hold
+        the lock; searches do not, since indexes publish new arrays instead
+        of mutating the ones being searched.
+        
+        Returns:
+            Tuple of (index, skills by row key) or None if no model is loaded
+        """
+        if self._vector_index is None:
+            embeddings = self._get_skill_embeddings()
+            if not embeddings or not len(embeddings[0]):
+                return None
+            
+            skills, skill_matrix = embeddings
+            model_name = get_semantic_model_name()
+            with _vector_index_lock:
+                index = sync_index(_vector_indexes.get(model_name), self._skill_row_keys, skill_matrix)
+                _vector_indexes[model_name] = index
+            
+            self._vector_index = (index, dict(zip(self._skill_row_keys, skills)))
+        return self._vector_index
+    
+    def get_taxonomy_version(self) -> str:
+        """
+        Content hash of the loaded skill taxonomy
+        
+        Changes whenever a skill is added, removed, renamed or re-described,
+        or an alias is added or removed, so anything compiled from the
+        taxonomy can be keyed by it.
+        """
+        if self._taxonomy_version is None:
+            self._taxonomy_version = compute_taxonomy_version(self._load_skills())
+        return self._taxonomy_version
+    
+    def _get_compiled_matcher(self, kind: str, builder):
+        """
+        Get a matcher compiled from the current taxonomy version
+        
+        Args:
+            kind: Matcher kind ('exact', 'fuzzy')
+            builder: Callable building the matcher from the loaded skills
+        """
+        cache_key = (kind, self.get_taxonomy_version())
+        matcher = _compiled_matchers.get(cache_key)
+        
+        if matcher is None:
+            matcher = builder(self._load_skills())
+            if len(_compiled_matchers) >= _MAX_CACHED_MATCHERS:
+                _compiled_matchers.clear()
+            _compiled_matchers[cache_key] = matcher
+        
+        return matcher
+    
+    def _get_exact_matcher(self) -> KeywordMatcher:
+        """
+        Get the compiled exact matcher for the current taxonomy version
+        
+        Skill names and aliases are compiled into the same automaton, keyed
+        by (skill_id, via_alias), so aliases cost nothing extra per document.
+        """
+        def build(skills):
+            keywords = [(skill.skill_name, (str(skill.id), False)) for skill in skills]
+            keywords.extend(
+                (alias, (str(skill.id), True)) for skill in skills for alias in skill.aliases
+            )
+            return KeywordMatcher(keywords)
+        
+        return self._get_compiled_matcher('exact', build)
+    
+    def _get_fuzzy_index(self) -> FuzzyCandidateIndex:
+        """Get the fuzzy candidate index for the current taxonomy version"""
+        return self._get_compiled_matcher('fuzzy', lambda skills: FuzzyCandidateIndex(
+            ((skill.skill_name, str(skill.id)) for skill in skills),
+            min_score=int(self.FUZZY_THRESHOLD * 100)
+        ))
+    
+    def _exact_match(self, text: str) -> Dict[str, Tuple[int, int, bool]]:
         """
-        Check for exact keyword match
+        Find whole-word mentions of every skill and alias in a single pass
         
         Args:
             text: Input text (preprocessed)
-            skill_name: Skill name to match
             
         Returns:
-            Confidence score (1.0 if match, 0.0 otherwise)
+            Dictionary mapping skill_id to (start, end, via_alias) of its
+            first mention in the text. A mention of the skill name is
+            preferred over an alias.
         """
-        # Normalize both
-        text_lower = text.lower()
-        skill_lower = skill_name.lower()
-        
-        # Check if skill name appears as whole word
-        import re
-        pattern = r'\b' + re.escape(skill_lower) + r'\b'
-        if re.search(pattern, text_lower):
-            return 1.0
-        
-        return 0.0
+        mentions = {}
+        for (skill_id, via_alias), offsets in self._get_exact_matcher().find_all(text).items():
+            start, end = offsets[0]
+            current = mentions.get(skill_id)
+            if current is None or (current[2], current[0]) > (via_alias, start):
+                mentions[skill_id] = (start, end, via_alias)
+        return mentions
     
     def _fuzzy_match(self, text: str, skill_name: str) -> float:
         """
@@ -114,38 +307,183 @@ class SkillExtractionService:
         normalized = score / 100.0
         
         # Only return if above threshold (90%)
-        if normalized >= 0.9:
+        if normalized >= self.FUZZY_THRESHOLD:
             return normalized
         
         return 0.0
     
-    def _semantic_match(self, text: str, skill_name: str) -> float:
+    def _fuzzy_candidates(self, text: str) -> Dict[str, str]:
+        """
+        Shortlist skills that could fuzzy-match the text
+        
+        Skills sharing too few character n-grams with the text cannot reach
+        the fuzzy threshold and are skipped without being scored.
+        
+        Args:
+            text: Input text (preprocessed)
+            
+        Returns:
+            Dictionary mapping skill_id to skill name for shortlisted skills
+        """
+        return {skill_id: name for name, skill_id in self._get_fuzzy_index().candidates(text)}
+    
+    def _semantic_match(self, text: str, top_k: Optional[int] = None) -> Dict[str, float]:
         """
         Semantic similarity matching using sentence transformers
         
+        Encodes the text once and scores it against the cached skill
+        embedding matrix in a single matrix product.
+        
         Args:
             text: Input text
-            skill_name: Skill name
+            top_k: Maximum number of skills to return (default SEMANTIC_TOP_K)
             
         Returns:
-            Cosine similarity score (0-1)
+            Dictionary mapping skill_id to cosine similarity (0-1) for the
+            top_k skills above the semantic threshold
+        """
+        return self._semantic_match_many([text], top_k)[0]
+    
+    def _semantic_match_many(
+        self,
+        texts: List[str],
+        top_k: Optional[int] = None
+    ) -> List[Dict[str, float]]:
         """
-        if not self.semantic_model:
-            return 0.0
+        Semantic matching for a batch of texts with one encode call
         
-        # Encode both texts
-        text_embedding = self.semantic_model.encode([text])
-        skill_embedding = self.semantic_model.encode([skill_name])
+        Args:
+            texts: Input texts
+            top_k: Maximum number of skills to return per text
+            
+        Returns:
+            List of {skill_id: similarity} dictionaries, one per text
+        """
+        documents = self._semantic_match_documents([[text] for text in texts], top_k)
+        return [scores for scores, _ in documents]
+    
+    def _semantic_match_documents(
+        self,
+        documents: List[List[str]],
+        top_k: Optional[int] = None
+    ) -> List[Tuple[Dict[str, float], Dict[str, str]]]:
+        """
+        Semantic matching for documents split into windows
         
-        # Compute cosine similarity
-        from sklearn.metrics.pairwise import cosine_similarity
-        similarity = cosine_similarity(text_embedding, skill_embedding)[0][0]
+        Every window of every document is encoded in one call. Each skill's
+        score for a document is its best similarity over the document's
+        windows (max pooling), so a skill mentioned in one bullet of a long
+        resume is not diluted by the rest of it.
+        
+        Args:
+            documents: List of documents, each a non-empty list of windows
+            top_k: Maximum number of skills to return per document
+            
+        Returns:
+            List of (scores, evidence) per document, where scores maps
+            skill_id to similarity and evidence maps skill_id to the window
+            that produced it (only for documents with several windows)
+        """
+        vector_index = self._get_vector_index()
+        if not documents or not vector_index:
+            return [({}, {}) for _ in documents]
         
-        # Only return if above threshold
-        if similarity >= 0.7:
-            return float(similarity)
+        index, skills_by_key = vector_index
+        top_k = top_k or self.SEMANTIC_TOP_K
         
-        return 0.0
+        # One encode call for all windows, one index search for all of them
+        texts = [window for windows in documents for window in windows]
+        if self.batcher:
+            text_embeddings = self.batcher.encode(texts)
+        else:
+            text_embeddings = self.semantic_model.encode(texts, normalize_embeddings=True)
+        
+        # Each window's top_k neighbours include every skill that can make
+        # the document's top_k after max pooling
+        neighbour_scores, neighbour_positions = index.search(text_embeddings, top_k)
+        
+        results = []
+        offset = 0
+        for windows in documents:
+            # Best (similarity, window) per skill above the threshold
+            best: Dict[str, Tuple[float, int]] = {}
+            for window in range(len(windows)):
+                row = offset + window
+                for score, position in zip(neighbour_scores[row], neighbour_positions[row]):
+                    if score < self.SEMANTIC_THRESHOLD or position < 0:
+                        continue
+                    skill = skills_by_key.get(index.keys[position])
+                    if skill is None:
+                        continue
+                    skill_id = str(skill.id)
+                    if skill_id not in best or score > best[skill_id][0]:
+                        best[skill_id] = (float(score), window)
+            offset += len(windows)
+            
+            top = sorted(best.items(), key=lambda item: item[1][0], reverse=True)[:top_k]
+            scores = {skill_id: score for skill_id, (score, _) in top}
+            evidence = {}
+            if len(windows) > 1:
+                evidence = {skill_id: windows[window] for skill_id, (_, window) in top}
+            
+            results.append((scores, evidence))
+        
+        return results
+    
+    def _document_windows(self, cleaned_text: str, bullet_points: Optional[List[str]]) -> List[str]:
+        """
+        Split a preprocessed document into windows for semantic matching
+        
+        Short documents are a single window. Long documents are split into
+        their bullet points, or into sentences when they have no bullets.
+        Windows too short to embed meaningfully are merged into the next
+        one, and adjacent windows are joined when there are more than
+        MAX_SEMANTIC_WINDOWS, so the whole text is still covered.
+        
+        Args:
+            cleaned_text: Preprocessed text
+            bullet_points: Bullet points from the preprocessor (if extracted)
+            
+        Returns:
+            Non-empty list of window texts
+        """
+        if len(cleaned_text) <= self.LONG_DOCUMENT_CHARS:
+            return [cleaned_text]
+        
+        pieces = [piece.strip() for piece in (bullet_points or []) if piece.strip()]
+        if len(pieces) <= 1:
+            pieces = [piece for piece in re.split(r'(?<=[.!?])\s+', cleaned_text) if piece]
+        
+        # Deduplicate and fold fragments into the following window
+        windows = []
+        seen = set()
+        fragment = ''
+        for piece in pieces:
+            if piece in seen:
+                continue
+            seen.add(piece)
+            
+            piece = f"{fragment} {piece}".strip()
+            if len(piece.split()) < self.MIN_WINDOW_WORDS:
+                fragment = piece
+                continue
+            fragment = ''
+            windows.append(piece)
+        
+        if fragment:
+            if windows:
+                windows[-1] = f"{windows[-1]} {fragment}"
+            else:
+                windows.append(fragment)
+        
+        if len(windows) > self.MAX_SEMANTIC_WINDOWS:
+            group_size = math.ceil(len(windows) / self.MAX_SEMANTIC_WINDOWS)
+            windows = [
+                ' '.join(windows[i:i + group_size])
+                for i in range(0, len(windows), group_size)
+            ]
+        
+        return windows or [cleaned_text]
     
     def _calculate_confidence(
         self,
@@ -193,49 +531,410 @@ class SkillExtractionService:
         
         return final_confidence, match_type
     
+    def get_extractor_version(self) -> str:
+        """Version of the extraction logic plus the semantic model in use"""
+        model = get_semantic_model_name() if self.semantic_model else 'lexical'
+        return f"{self.EXTRACTOR_VERSION}:{model}"
+    
+    def _get_result_cache(self) -> ExtractionCache:
+        """Result cache for the current taxonomy and extractor versions"""
+        return ExtractionCache(
+            self.db, self.get_taxonomy_version(), self.get_extractor_version()
+        )
+    
+    def _check_mode(self, mode: str):
+        """Reject unknown extraction modes"""
+        if mode not in self.EXTRACTION_MODES:
+            raise ValueError(
+                f"Unknown extraction mode '{mode}', expected one of {', '.join(self.EXTRACTION_MODES)}"
+            )
+    
     def extract_skills(
         self,
         text: str,
         source: str,
-        min_confidence: float = 0.6
+        min_confidence: float = 0.6,
+        use_cache: bool = True,
+        mode: str = 'full'
     ) -> List[SkillMatch]:
         """
         Extract skills from text using multiple strategies
         
+        Results are cached by text content, so unchanged descriptions are
+        not run through the NLP pipeline again until the taxonomy or the
+        extractor changes.
+        
         Args:
             text: Input text (project description, resume, etc.)
             source: Data source ('project', 'resume', 'certification', 'course')
             min_confidence: Minimum confidence threshold
+            use_cache: Whether to read and write the result cache
+            mode: Strategies to run: 'fast', 'balanced' or 'full'
+                (see EXTRACTION_MODES)
             
         Returns:
             List of SkillMatch objects
         """
+        self._check_mode(mode)
         if not text:
             return []
         
+        if not use_cache:
+            return self._extract_skills_uncached(text, source, min_confidence, mode)
+        
+        cache = self._get_result_cache()
+        options = {'min_confidence': min_confidence, 'mode': mode}
+        
+        cached = cache.get(text, source, options)
+        if cached is not None:
+            return [SkillMatch(**match) for match in cached]
+        
+        matches = self._extract_skills_uncached(text, source, min_confidence, mode)
+        cache.put(text, source, options, [asdict(match) for match in matches])
+        
+        return matches
+    
+    def extract_skills_batch(
+        self,
+        items: List[Tuple[str, str]],
+        min_confidence: float = 0.6,
+        use_cache: bool = True,
+        mode: str = 'full'
+    ) -> List[List[SkillMatch]]:
+        """
+        Extract skills from many texts at once
+        
+        Cache misses are preprocessed through spaCy nlp.pipe and encoded in
+        a single batched model call, which is far cheaper per document than
+        calling extract_skills in a loop.
+        
+        Args:
+            items: List of (text, source) pairs
+            min_confidence: Minimum confidence threshold
+            use_cache: Whether to read and write the result cache
+            mode: Strategies to run: 'fast', 'balanced' or 'full'
+            
+        Returns:
+            List of SkillMatch lists, in the same order as items
+        """
+        self._check_mode(mode)
+        results: List[Optional[List[SkillMatch]]] = [None] * len(items)
+        cache = self._get_result_cache() if use_cache else None
+        options = {'min_confidence': min_confidence, 'mode': mode}
+        
+        # Group cache misses by (text, source) so duplicates run once
+        pending: Dict[Tuple[str, str], List[int]] = {}
+        for index, (text, source) in enumerate(items):
+            if not text:
+                results[index] = []
+                continue
+            
+            cached = cache.get(text, source, options) if cache else None
+            if cached is not None:
+                results[index] = [SkillMatch(**match) for match in cached]
+            else:
+                pending.setdefault((text, source), []).append(index)
+        
+        if pending:
+            keys = list(pending)
+            if mode == 'full':
+                processed = self.preprocessor.preprocess_many(
+                    [text for text, _ in keys], extract_bullets=True, with_terms=False
+                )
+                cleaned_texts = [p['cleaned'] for p in processed]
+                semantic_results = self._semantic_match_documents([
+                    self._document_windows(p['cleaned'], p['bullet_points']) for p in processed
+                ])
+            else:
+                # Lexical modes only need the cleaned text
+                cleaned_texts = [self.preprocessor.clean_text(text) for text, _ in keys]
+                semantic_results = [({}, {}) for _ in keys]
+            
+            new_entries = []
+            for (text, source), cleaned_text, (scores, evidence) in zip(keys, cleaned_texts, semantic_results):
+                matches = self._score_document(
+                    cleaned_text, source, min_confidence, scores, evidence,
+                    use_fuzzy=mode != 'fast'
+                )
+                new_entries.append((text, source, [asdict(match) for match in matches]))
+                
+                for index in pending[(text, source)]:
+                    results[index] = list(matches)
+            
+            if cache:
+                cache.put_many(new_entries, options)
+        
+        return results
+    
+    def _extract_skills_uncached(
+        self,
+        text: str,
+        source: str,
+        min_confidence: float,
+        mode: str = 'full'
+    ) -> List[SkillMatch]:
+        """Run the matching strategies of the given mode over the text"""
+        if mode != 'full':
+            # Lexical modes skip spaCy and the model entirely
+            return self._score_document(
+                self.preprocessor.clean_text(text), source, min_confidence, {},
+                use_fuzzy=mode == 'balanced'
+            )
+        
         # Preprocess text
-        processed = self.preprocessor.preprocess(text, extract_bullets=True)
+        processed = self.preprocessor.preprocess(text, extract_bullets=True, with_terms=False)
         cleaned_text = processed['cleaned']
         
+        # Semantic scores for the whole taxonomy in one pass (per window for
+        # long documents)
+        windows = self._document_windows(cleaned_text, processed['bullet_points'])
+        semantic_scores, semantic_evidence = self._semantic_match_documents([windows])[0]
+        
+        return self._score_document(
+            cleaned_text, source, min_confidence, semantic_scores, semantic_evidence
+        )
+    
+    def extract_skills_with_deadline(
+        self,
+        text: str,
+        source: str,
+        min_confidence: float = 0.6,
+        deadline_ms: Optional[float] = None,
+        mode: str = 'full',
+        use_cache: bool = True
+    ) -> ExtractionResult:
+        """
+        Extract skills within a time budget
+        
+        Stages run cheapest first (exact, fuzzy, semantic). Before each
+        optional stage the remaining budget is compared with that stage's
+        recent average cost per character times the text length; stages
+        that would overrun are skipped and the result is flagged as
+        degraded. Long documents are encoded a batch of windows at a time
+        and the semantic stage stops early (also degraded) once the next
+        batch would overrun. Exact matching always runs. Degraded results
+        are not cached.
+        
+        Args:
+            text: Input text
+            source: Data source
+            min_confidence: Minimum confidence threshold
+            deadline_ms: Time budget in milliseconds (None for no limit)
+            mode: Strategies to attempt: 'fast', 'balanced' or 'full'
+            use_cache: Whether to read and write the result cache
+            
+        Returns:
+            ExtractionResult with matches, degraded flag and skipped stages
+        """
+        self._check_mode(mode)
+        if not text:
+            return ExtractionResult(matches=[])
+        
+        started = time.perf_counter()
+        deadline = started + deadline_ms / 1000.0 if deadline_ms is not None else None
+        
+        cache = self._get_result_cache() if use_cache else None
+        options = {'min_confidence': min_confidence, 'mode': mode}
+        if cache:
+            cached = cache.get(text, source, options)
+            if cached is not None:
+                return ExtractionResult(matches=[SkillMatch(**match) for match in cached])
+        
+        skipped = []
+        
+        def fits(stage: str) -> bool:
+            if deadline is None or time.perf_counter() + _expected_stage_cost(stage, len(text)) <= deadline:
+                return True
+            skipped.append(stage)
+            _decay_stage_cost(stage)
+            return False
+        
+        cleaned_text = self.preprocessor.clean_text(text)
+        exact_mentions = self._timed('exact', len(text), self._exact_match, cleaned_text)
+        
+        fuzzy_scores = {}
+        if mode in ('balanced', 'full') and fits('fuzzy'):
+            fuzzy_scores = self._timed('fuzzy', len(text), self._fuzzy_scores, cleaned_text, exact_mentions)
+        
+        semantic_scores, semantic_evidence = {}, {}
+        if mode == 'full' and fits('semantic'):
+            # Building the skill embeddings and index is a one-time cost,
+            # not part of the per-character estimate
+            self._get_vector_index()
+            
+            stage_started = time.perf_counter()
+            semantic_scores, semantic_evidence, complete = self._semantic_stage(text, deadline)
+            if complete:
+                _record_stage_cost('semantic', time.perf_counter() - stage_started, len(text))
+            else:
+                skipped.append('semantic')
+        
+        matches = self._combine_scores(
+            cleaned_text, source, min_confidence,
+            exact_mentions, fuzzy_scores, semantic_scores, semantic_evidence
+        )
+        
+        if cache and not skipped:
+            cache.put(text, source, options, [asdict(match) for match in matches])
+        
+        return ExtractionResult(matches=matches, degraded=bool(skipped), skipped_stages=skipped)
+    
+    def _timed(self, stage: str, chars: int, function, *args):
+        """Run one stage on a text of chars characters and record its cost"""
+        started = time.perf_counter()
+        result = function(*args)
+        _record_stage_cost(stage, time.perf_counter() - started, chars)
+        return result
+    
+    def _semantic_stage(
+        self,
+        text: str,
+        deadline: Optional[float] = None
+    ) -> Tuple[Dict[str, float], Dict[str, str], bool]:
+        """
+        spaCy preprocessing plus semantic matching for one raw text
+        
+        Under a deadline, windows are encoded DEADLINE_WINDOW_BATCH at a
+        time, stopping before a batch expected to take longer than the time
+        left (as long as the previous one). Max pooling per batch and then
+        across batches gives the same scores as encoding every window at
+        once.
+        
+        Args:
+            text: Raw input text
+            deadline: time.perf_counter() value to finish by (None for no limit)
+            
+        Returns:
+            Tuple of (scores, evidence, whether every window was matched)
+        """
+        processed = self.preprocessor.preprocess(text, extract_bullets=True, with_terms=False)
+        windows = self._document_windows(processed['cleaned'], processed['bullet_points'])
+        if deadline is None:
+            return (*self._semantic_match_documents([windows])[0], True)
+        
+        best: Dict[str, Tuple[float, str]] = {}
+        batch_seconds = 0.0
+        complete = True
+        for start in range(0, len(windows), self.DEADLINE_WINDOW_BATCH):
+            batch_started = time.perf_counter()
+            if start and batch_started + batch_seconds > deadline:
+                complete = False
+                break
+            
+            batch = windows[start:start + self.DEADLINE_WINDOW_BATCH]
+            scores, evidence = self._semantic_match_documents([batch])[0]
+            for skill_id, score in scores.items():
+                if skill_id not in best or score > best[skill_id][0]:
+                    best[skill_id] = (score, evidence.get(skill_id, batch[0]))
+            batch_seconds = time.perf_counter() - batch_started
+        
+        top = sorted(best.items(), key=lambda item: item[1][0], reverse=True)[:self.SEMANTIC_TOP_K]
+        scores = {skill_id: score for skill_id, (score, _) in top}
+        evidence = {skill_id: window for skill_id, (_, window) in top} if len(windows) > 1 else {}
+        return scores, evidence, complete
+    
+    def _fuzzy_scores(self, cleaned_text: str, exact_mentions: Dict[str, Tuple[int, int, bool]]) -> Dict[str, float]:
+        """
+        Fuzzy scores for shortlisted skills
+        
+        Fuzzy scoring only matters without an exact hit, and only for skills
+        the n-gram index could not rule out.
+        """
+        return {
+            skill_id: self._fuzzy_match(cleaned_text, name)
+            for skill_id, name in self._fuzzy_candidates(cleaned_text).items()
+            if skill_id not in exact_mentions
+        }
+    
+    def _score_document(
+        self,
+        cleaned_text: str,
+        source: str,
+        min_confidence: float,
+        semantic_scores: Dict[str, float],
+        semantic_evidence: Optional[Dict[str, str]] = None,
+        use_fuzzy: bool = True
+    ) -> List[SkillMatch]:
+        """
+        Run the lexical stages and combine them with semantic scores for one
+        preprocessed document
+        
+        Args:
+            cleaned_text: Preprocessed text
+            source: Data source
+            min_confidence: Minimum confidence threshold
+            semantic_scores: Semantic stage output for this document
+            semantic_evidence: Best-matching window per skill (long documents)
+            use_fuzzy: Whether to run fuzzy matching
+            
+        Returns:
+            List of SkillMatch objects sorted by confidence
+        """
+        # Exact mentions for the whole taxonomy in one pass
+        exact_mentions = self._exact_match(cleaned_text)
+        fuzzy_scores = self._fuzzy_scores(cleaned_text, exact_mentions) if use_fuzzy else {}
+        
+        return self._combine_scores(
+            cleaned_text, source, min_confidence,
+            exact_mentions, fuzzy_scores, semantic_scores, semantic_evidence
+        )
+    
+    def _combine_scores(
+        self,
+        cleaned_text: str,
+        source: str,
+        min_confidence: float,
+        exact_mentions: Dict[str, Tuple[int, int, bool]],
+        fuzzy_scores: Dict[str, float],
+        semantic_scores: Dict[str, float],
+        semantic_evidence: Optional[Dict[str, str]] = None
+    ) -> List[SkillMatch]:
+        """
+        Combine per-stage scores into matches
+        
+        Args:
+            cleaned_text: Preprocessed text
+            source: Data source
+            min_confidence: Minimum confidence threshold
+            exact_mentions: Exact stage output (first mention offsets)
+            fuzzy_scores: Fuzzy stage output
+            semantic_scores: Semantic stage output
+            semantic_evidence: Best-matching window per skill (long documents)
+            
+        Returns:
+            List of SkillMatch objects sorted by confidence
+        """
         # Load all skills
         skills = self._load_skills()
         matches = []
         
         for skill in skills:
             # Try all matching strategies
-            exact_score = self._exact_match(cleaned_text, skill.skill_name)
-            fuzzy_score = self._fuzzy_match(cleaned_text, skill.skill_name)
-            semantic_score = self._semantic_match(cleaned_text, skill.skill_name)
+            mention = exact_mentions.get(str(skill.id))
+            exact_score = 1.0 if mention else 0.0
+            fuzzy_score = fuzzy_scores.get(str(skill.id), 0.0)
+            semantic_score = semantic_scores.get(str(skill.id), 0.0)
             
             # Calculate final confidence
             confidence, match_type = self._calculate_confidence(
                 exact_score, fuzzy_score, semantic_score, source
             )
             
+            # Alias-only mentions are exact matches, reported separately
+            if match_type == 'exact' and mention[2]:
+                match_type = 'alias'
+            
             # Add if above threshold
             if confidence >= min_confidence:
-                # Extract evidence snippet
-                evidence = self._extract_evidence(cleaned_text, skill.skill_name)
+                # Extract evidence snippet (semantic matches on long
+                # documents point at the window that matched)
+                if match_type == 'semantic' and semantic_evidence and str(skill.id) in semantic_evidence:
+                    evidence = semantic_evidence[str(skill.id)]
+                else:
+                    evidence = self._extract_evidence(
+                        cleaned_text, skill.skill_name,
+                        position=mention[0] if mention else None
+                    )
                 
                 matches.append(SkillMatch(
                     skill_id=str(skill.id),
@@ -251,7 +950,13 @@ class SkillExtractionService:
         
         return matches
     
-    def _extract_evidence(self, text: str, skill_name: str, context_chars: int = 100) -> str:
+    def _extract_evidence(
+        self,
+        text: str,
+        skill_name: str,
+        context_chars: int = 100,
+        position: Optional[int] = None
+    ) -> str:
         """
         Extract a snippet of text containing the skill mention
         
@@ -259,15 +964,16 @@ class SkillExtractionService:
             text: Full text
             skill_name: Skill to find
             context_chars: Characters of context to include
+            position: Known offset of the mention (skips searching the text)
             
         Returns:
             Evidence snippet
         """
-        text_lower = text.lower()
-        skill_lower = skill_name.lower()
-        
         # Find skill position
-        pos = text_lower.find(skill_lower)
+        if position is not None:
+            pos = position
+        else:
+            pos = text.lower().find(skill_name.lower())
         if pos == -1:
             # Return first N chars if not found
             return text[:context_chars] + "..."
@@ -284,13 +990,13 @@ class SkillExtractionService:
         
         return snippet
     
-    def extract_from_project(self, project_description: str) -> List[SkillMatch]:
+    def extract_from_project(self, project_description: str, mode: str = 'full') -> List[SkillMatch]:
         """Extract skills from project description"""
-        return self.extract_skills(project_description, source='project')
+        return self.extract_skills(project_description, source='project', mode=mode)
     
-    def extract_from_resume(self, resume_text: str) -> List[SkillMatch]:
+    def extract_from_resume(self, resume_text: str, mode: str = 'full') -> List[SkillMatch]:
         """Extract skills from resume/CV text"""
-        return self.extract_skills(resume_text, source='resume')
+        return self.extract_skills(resume_text, source='resume', mode=mode)
     
     def extract_from_course(self, course_name: str, syllabus: Optional[str] = None) -> List[SkillMatch]:
         """Extract skills from course information"""
@@ -0,0 +1,230 @@
+"""
+Skill Matchers
+Compiled matchers that scan a document once for every skill in the taxonomy
+"""
+from typing import Dict, Hashable, Iterable, Iterator, List, Tuple
+
+
+def _is_word_char(char: str) -> bool:
+    """Mirror the regex definition of a word character (\\w)"""
+    return char.isalnum() or char == '_'
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a set of keywords
+
+    Finds every whole-word occurrence of every keyword in a single pass over
+    the text, so the cost grows with text length rather than with
+    taxonomy size times text length. Word boundaries follow the same rules
+    as the regex pattern r'\\b<keyword>\\b'.
+    """
+
+    def __init__(
+        self,
+        keywords: Iterable[Tuple[str, Hashable]],
+        partial_keywords: Iterable[Tuple[str, Hashable]] = ()
+    ):
+        """
+        Build the automaton
+
+        Args:
+            keywords: (keyword, key) pairs; the key is reported for each match.
+                Several keywords may share the same key.
+            partial_keywords: (keyword, key) pairs matched anywhere, also
+                inside longer words (like `keyword in text`)
+        """
+        # Trie transitions, failure links and outputs per state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, Hashable, bool]]] = [[]]
+
+        for pairs, whole_word in ((keywords, True), (partial_keywords, False)):
+            for keyword, key in pairs:
+                keyword = keyword.lower()
+                if keyword:
+                    self._add(keyword, key, whole_word)
+
+        self._build_failure_links()
+
+    def _add(self, keyword: str, key: Hashable, whole_word: bool = True):
+        """Insert a keyword into the trie"""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].append((len(keyword), key, whole_word))
+
+    def _build_failure_links(self):
+        """Breadth-first construction of failure links"""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+
+                # Inherit matches that end at the failure state
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[Hashable, int, int]]:
+        """
+        Yield every keyword occurrence in the text (whole words only,
+        except for partial keywords)
+
+        Args:
+            text: Lowercased input text
+
+        Yields:
+            Tuples of (key, start, end) in order of match end position
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        text_length = len(text)
+        state = 0
+
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for length, key, whole_word in output[state]:
+                start = position - length + 1
+                end = position + 1
+                if not whole_word:
+                    yield key, start, end
+                    continue
+
+                # Same semantics as \b on both sides of the keyword
+                before = start > 0 and _is_word_char(text[start - 1])
+                if before == _is_word_char(text[start]):
+                    continue
+                after = end < text_length and _is_word_char(text[end])
+                if after == _is_word_char(text[end - 1]):
+                    continue
+
+                yield key, start, end
+
+    def find_all(self, text: str) -> Dict[Hashable, List[Tuple[int, int]]]:
+        """
+        Find all keyword occurrences grouped by key
+
+        Args:
+            text: Input text (matched case-insensitively)
+
+        Returns:
+            Dictionary mapping key to list of (start, end) offsets, in order
+        """
+        matches: Dict[Hashable, List[Tuple[int, int]]] = {}
+        for key, start, end in self.iter_matches(text.lower()):
+            matches.setdefault(key, []).append((start, end))
+
+        for offsets in matches.values():
+            offsets.sort()
+
+        return matches
+
+
+class FuzzyCandidateIndex:
+    """
+    Character n-gram index that shortlists names for fuzzy matching
+
+    A name can only reach a fuzz.partial_ratio score of min_score against a
+    text if the best-matching window of the text is within a small edit
+    distance of the name. By the q-gram lemma such a window still contains
+    most of the name's character n-grams, so names sharing too few n-grams
+    with the text are pruned without being scored. The pruning is exact:
+    every name scoring at or above min_score is always shortlisted.
+    """
+
+    NGRAM_SIZES = (2, 3)
+
+    def __init__(self, names: Iterable[Tuple[str, Hashable]], min_score: int = 90):
+        """
+        Build the index
+
+        Args:
+            names: (name, key) pairs to index
+            min_score: Lowest fuzz.partial_ratio score (0-100) that must survive pruning
+        """
+        # partial_ratio rounds 100 * ratio, so the raw ratio may be 0.5 lower
+        min_ratio = (min_score - 0.5) / 100.0
+
+        self._names: List[Tuple[str, Hashable]] = []
+        self._required: List[Dict[int, int]] = []
+        self._postings: Dict[int, Dict[str, List[Tuple[int, int]]]] = {
+            size: {} for size in self.NGRAM_SIZES
+        }
+
+        for name, key in names:
+            name = name.lower()
+            index = len(self._names)
+            self._names.append((name, key))
+
+            # Worst-case edit distance between the name and a window of the
+            # same length whose similarity ratio is at least min_ratio
+            max_edits = int(2 * len(name) * (1.0 - min_ratio) + 1e-9)
+
+            required = {}
+            for size in self.NGRAM_SIZES:
+                grams = self._ngram_counts(name, size)
+                for gram, count in grams.items():
+                    self._postings[size].setdefault(gram, []).append((index, count))
+                needed = len(name) - size + 1 - max_edits * size
+                if needed > 0:
+                    required[size] = needed
+            self._required.append(required)
+
+    @staticmethod
+    def _ngram_counts(text: str, size: int) -> Dict[str, int]:
+        """Count the character n-grams of a string"""
+        counts: Dict[str, int] = {}
+        for start in range(len(text) - size + 1):
+            gram = text[start:start + size]
+            counts[gram] = counts.get(gram, 0) + 1
+        return counts
+
+    def candidates(self, text: str) -> List[Tuple[str, Hashable]]:
+        """
+        Shortlist names that could fuzzy-match the text
+
+        Args:
+            text: Input text
+
+        Returns:
+            List of (lowercased name, key) pairs worth scoring
+        """
+        text = text.lower()
+
+        # Number of each name's n-gram positions found anywhere in the text
+        hits: Dict[int, List[int]] = {}
+        for size in self.NGRAM_SIZES:
+            postings = self._postings[size]
+            size_hits = [0] * len(self._names)
+            grams = {text[start:start + size] for start in range(len(text) - size + 1)}
+            for gram in grams:
+                for index, count in postings.get(gram, ()):
+                    size_hits[index] += count
+            hits[size] = size_hits
+
+        shortlisted = []
+        for index, (name, key) in enumerate(self._names):
+            # Names longer than the text are compared the other way round
+            if len(name) > len(text) or all(
+                hits[size][index] >= needed
+                for size, needed in self._required[index].items()
+            ):
+                shortlisted.append((name, key))
+
+        return shortlisted
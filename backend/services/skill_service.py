@@ -3,12 +3,14 @@ Skill Management Service
 Handles skill CRUD and student skill scoring
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, and_
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import uuid
 
-from models.database_models import Skill, StudentSkill, SkillAssessment
+from models.database_models import Skill, SkillAlias, StudentSkill, SkillAssessment
+from services.taxonomy_service import get_taxonomy_snapshot, normalize_skill_name
+from services.student_skill_writer import upsert_student_skills
 
 
 class SkillService:
@@ -51,6 +53,92 @@ class SkillService:
         """Get skill by name"""
         return db.query(Skill).filter(Skill.skill_name == skill_name).first()
     
+    @staticmethod
+    def resolve_skill_name(db: Session, name: str) -> Optional[Skill]:
+        """
+        Resolve a skill name or alias to a skill
+        
+        Tries an exact (case-insensitive) skill name, then an exact alias,
+        then falls back to the first skill whose name contains the text.
+        Lookups go through the shared taxonomy snapshot.
+        
+        Args:
+            db: Database session
+            name: Skill name, alias or name fragment
+        
+        Returns:
+            Matching skill or None
+        """
+        skill = get_taxonomy_snapshot(db).resolve(name)
+        return db.get(Skill, skill.id) if skill else None
+    
+    @staticmethod
+    def get_skill_aliases(db: Session, skill_id: uuid.UUID) -> List[SkillAlias]:
+        """Get all aliases of a skill"""
+        return db.query(SkillAlias).filter(
+            SkillAlias.skill_id == skill_id
+        ).order_by(SkillAlias.alias).all()
+    
+    @staticmethod
+    def add_skill_alias(db: Session, skill_id: uuid.UUID, alias: str) -> SkillAlias:
+        """
+        Add an alias to a skill
+        
+        Args:
+            db: Database session
+            skill_id: Skill ID
+            alias: Alternative name (matched case- and whitespace-insensitively)
+        
+        Returns:
+            Created SkillAlias
+        
+        Raises:
+            ValueError: If the alias is empty, equals a skill name or
+                already belongs to a skill
+        """
+        alias = alias.strip()
+        # Stored in the form the taxonomy resolves names by
+        normalized = normalize_skill_name(alias)
+        if not normalized:
+            raise ValueError("Alias cannot be empty")
+        
+        # Skill names are stored as entered, so compare their normalized form
+        skill_names = db.query(Skill.skill_name).filter(
+            func.lower(Skill.skill_name).contains(normalized.split()[0], autoescape=True)
+        )
+        if any(normalize_skill_name(name) == normalized for (name,) in skill_names):
+            raise ValueError(f"'{alias}' is already a skill name")
+        
+        existing = db.query(SkillAlias).filter(SkillAlias.alias_normalized == normalized).first()
+        if existing:
+            raise ValueError(f"Alias '{alias}' already belongs to skill {existing.skill_id}")
+        
+        skill_alias = SkillAlias(skill_id=skill_id, alias=alias, alias_normalized=normalized)
+        db.add(skill_alias)
+        db.commit()
+        db.refresh(skill_alias)
+        
+        return skill_alias
+    
+    @staticmethod
+    def delete_skill_alias(db: Session, skill_id: uuid.UUID, alias_id: uuid.UUID) -> bool:
+        """
+        Delete an alias of a skill
+        
+        Returns:
+            True if the alias existed and was deleted
+        """
+        skill_alias = db.query(SkillAlias).filter(
+            SkillAlias.id == alias_id,
+            SkillAlias.skill_id == skill_id
+        ).first()
+        if not skill_alias:
+            return False
+        
+        db.delete(skill_alias)
+        db.commit()
+        return True
+    
     @staticmethod
     def create_student_skill(
         db: Session,
@@ -93,38 +181,23 @@ class SkillService:
         # Confidence based on evidence count
         confidence = min(1.0, len(evidence_sources) * 0.2)
         
-        # Check if student skill already exists
-        existing = db.query(StudentSkill).filter(
-            and_(
-                StudentSkill.student_id == student_id,
-                StudentSkill.skill_id == skill_id
-            )
-        ).first()
+        # Insert or update in one statement, so writing a pair that already
+        # has a row (student_skills is unique per student and skill) updates it
+        upsert_student_skills(db, [{
+            'student_id': student_id,
+            'skill_id': skill_id,
+            'raw_score': int(total_score),
+            'weighted_score': round(total_score, 2),
+            'confidence_level': round(confidence, 2),
+            'evidence_sources': evidence_sources,
+            'last_updated': datetime.now()
+        }])
+        db.commit()
         
-        if existing:
-            # Update existing
-            existing.raw_score = int(total_score)
-            existing.weighted_score = round(total_score, 2)
-            existing.confidence_level = round(confidence, 2)
-            existing.evidence_sources = evidence_sources
-            existing.last_updated = datetime.now()
-            db.commit()
-            db.refresh(existing)
-            return existing
-        else:
-            # Create new
-            student_skill = StudentSkill(
-                student_id=student_id,
-                skill_id=skill_id,
-                raw_score=int(total_score),
-                weighted_score=round(total_score, 2),
-                confidence_level=round(confidence, 2),
-                evidence_sources=evidence_sources
-            )
-            db.add(student_skill)
-            db.commit()
-            db.refresh(student_skill)
-            return student_skill
+        return db.query(StudentSkill).filter(
+            StudentSkill.student_id == student_id,
+            StudentSkill.skill_id == skill_id
+        ).populate_existing().one()
     
     @staticmethod
     def submit_assessment(
@@ -0,0 +1,115 @@
+"""
+Student Skill Writer
+Bulk upsert of student skill scores, one INSERT ... ON CONFLICT statement
+per chunk of rows
+"""
+import os
+import sqlite3
+import uuid
+from typing import Dict, List, Sequence
+from dotenv import load_dotenv
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models.database_models import StudentSkill
+
+load_dotenv()
+
+# Columns written per row; everything but the key is replaced on conflict
+UPSERT_COLUMNS = (
+    'student_id', 'skill_id', 'raw_score', 'weighted_score',
+    'confidence_level', 'evidence_sources', 'last_updated'
+)
+CONFLICT_COLUMNS = ('student_id', 'skill_id')
+
+# SQLite binds at most 999 parameters per statement in older builds
+SQLITE_MAX_PARAMS = 999
+
+
+def get_upsert_chunk_size() -> int:
+    """Rows per upsert statement (STUDENT_SKILL_UPSERT_CHUNK_SIZE)"""
+    return max(1, int(os.getenv('STUDENT_SKILL_UPSERT_CHUNK_SIZE', 1000)))
+
+
+def build_upsert(dialect_name: str, rows: Sequence[Dict]):
+    """
+    INSERT ... ON CONFLICT (student_id, skill_id) DO UPDATE for a dialect
+
+    Args:
+        dialect_name: 'postgresql' or 'sqlite'
+        rows: Row dictionaries with an id and UPSERT_COLUMNS
+
+    Returns:
+        Insert statement
+    """
+    insert = postgresql.insert if dialect_name == 'postgresql' else sqlite.insert
+    statement = insert(StudentSkill.__table__).values(list(rows))
+    return statement.on_conflict_do_update(
+        index_elements=list(CONFLICT_COLUMNS),
+        set_={
+            column: statement.excluded[column]
+            for column in UPSERT_COLUMNS if column not in CONFLICT_COLUMNS
+        }
+    )
+
+
+def supports_upsert(dialect_name: str) -> bool:
+    """Whether the database has INSERT ... ON CONFLICT DO UPDATE"""
+    if dialect_name == 'postgresql':
+        return True
+    return dialect_name == 'sqlite' and sqlite3.sqlite_version_info >= (3, 24, 0)
+
+
+def upsert_student_skills(db: Session, rows: List[Dict]) -> int:
+    """
+    Insert or update student skill scores in bulk
+
+    PostgreSQL and SQLite get one INSERT ... ON CONFLICT DO UPDATE per
+    chunk; other databases fall back to reading the existing keys per chunk
+    and issuing bulk inserts and updates. The caller commits.
+
+    Args:
+        db: Database session
+        rows: Dictionaries with UPSERT_COLUMNS (one per student and skill)
+
+    Returns:
+        Number of rows written
+    """
+    if not rows:
+        return 0
+
+    dialect_name = db.get_bind().dialect.name
+    chunk_size = get_upsert_chunk_size()
+    if dialect_name == 'sqlite':
+        chunk_size = min(chunk_size, SQLITE_MAX_PARAMS // (len(UPSERT_COLUMNS) + 1))
+
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+
+        if supports_upsert(dialect_name):
+            db.execute(build_upsert(dialect_name, [{'id': uuid.uuid4(), **row} for row in chunk]))
+            continue
+
+        existing = {
+            (student_id, skill_id): row_id
+            for row_id, student_id, skill_id in db.query(
+                StudentSkill.id, StudentSkill.student_id, StudentSkill.skill_id
+            ).filter(
+                StudentSkill.student_id.in_({row['student_id'] for row in chunk}),
+                StudentSkill.skill_id.in_({row['skill_id'] for row in chunk})
+            ).all()
+        }
+        updates, inserts = [], []
+        for row in chunk:
+            row_id = existing.get((row['student_id'], row['skill_id']))
+            if row_id is None:
+                inserts.append({'id': uuid.uuid4(), **row})
+            else:
+                updates.append({'id': row_id, **row})
+
+        if inserts:
+            db.bulk_insert_mappings(StudentSkill, inserts)
+        if updates:
+            db.bulk_update_mappings(StudentSkill, updates)
+
+    return len(rows)
@@ -0,0 +1,188 @@
+"""
+Syllabus Pipeline
+Streams course syllabi from file storage, extracts text page by page and
+persists the skills they map to
+"""
+import codecs
+import hashlib
+import tempfile
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+import uuid
+from sqlalchemy.orm import Session
+
+from models.database_models import Course, CourseSkillSync
+from services.course_skill_mapper import CourseSkillMapper
+from services.file_storage_service import FileStorageService
+
+# PDF text extraction is optional; text syllabi work without it
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+
+# Bytes read from storage at a time
+CHUNK_SIZE = 64 * 1024
+
+# Text files without form feeds are split into pages of about this size
+MAX_PAGE_CHARS = 20000
+
+
+# Downloads larger than this spill from memory to a temporary file
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+
+def spool_stream(stream: BinaryIO) -> Tuple[BinaryIO, str]:
+    """
+    Copy a stream into a seekable temporary file, hashing it on the way
+
+    Returns:
+        Tuple of (spooled file positioned at the start, SHA-256 hex digest);
+        the caller closes the file
+    """
+    digest = hashlib.sha256()
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+        digest.update(chunk)
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled, digest.hexdigest()
+
+
+def iter_text_pages(stream: BinaryIO) -> Iterator[str]:
+    """
+    Pages of a UTF-8 text syllabus
+
+    Pages end at form feeds; long runs without one are split at the last
+    line break before MAX_PAGE_CHARS, so memory stays bounded by a page.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    buffer = ''
+
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+        buffer += decoder.decode(chunk)
+        *pages, buffer = buffer.split('\f')
+        yield from pages
+
+        while len(buffer) > MAX_PAGE_CHARS:
+            cut = buffer.rfind('\n', 0, MAX_PAGE_CHARS)
+            cut = cut + 1 if cut > 0 else MAX_PAGE_CHARS
+            yield buffer[:cut]
+            buffer = buffer[cut:]
+
+    buffer += decoder.decode(b'', final=True)
+    if buffer:
+        yield buffer
+
+
+def iter_pdf_pages(stream: BinaryIO) -> Iterator[str]:
+    """Pages of a PDF syllabus from a seekable stream (requires pypdf)"""
+    if PdfReader is None:
+        raise RuntimeError("pypdf is not installed; cannot read PDF syllabi")
+
+    for page in PdfReader(stream).pages:
+        yield page.extract_text() or ''
+
+
+def iter_syllabus_pages(stream: BinaryIO, object_name: str) -> Iterator[str]:
+    """Pages of a syllabus, by file type (PDFs need a seekable stream)"""
+    if object_name.lower().endswith('.pdf'):
+        return iter_pdf_pages(stream)
+    return iter_text_pages(stream)
+
+
+class SyllabusPipeline:
+    """
+    Maps course syllabi to skills
+
+    For each course with a syllabus_url the file is downloaded once into a
+    temporary spool and hashed on the way; unchanged syllabi (same content
+    and mapping rules) are skipped. Otherwise pages are read from the spool
+    through the course mapper's single-pass keyword/alias matcher and the
+    course's skill mappings are replaced.
+    """
+
+    def __init__(self, db: Session, storage: Optional[FileStorageService] = None):
+        """
+        Initialize pipeline
+
+        Args:
+            db: Database session
+            storage: File storage (defaults to STORAGE_TYPE)
+        """
+        self.db = db
+        self.storage = storage or FileStorageService()
+        self.mapper = CourseSkillMapper(db)
+
+    def ingest_course(self, course: Course, force: bool = False) -> Dict:
+        """
+        Map one course's syllabus to skills
+
+        Args:
+            course: Course to process
+            force: Re-extract even if the syllabus is unchanged
+
+        Returns:
+            Dictionary with status ('mapped', 'unchanged', 'no_syllabus',
+            'failed') and, when mapped, the number of pages read
+        """
+        result = {'course_id': str(course.id), 'course_code': course.course_code}
+        if not course.syllabus_url:
+            return {**result, 'status': 'no_syllabus'}
+
+        object_name = self.storage.object_name_from_url(course.syllabus_url)
+        try:
+            stream = self.storage.open_file(object_name)
+            try:
+                spooled, content_hash = spool_stream(stream)
+            finally:
+                self.storage.close_file(stream)
+
+            with spooled:
+                sync = self.db.get(CourseSkillSync, course.id)
+                rules_version = self.mapper.get_rules_version()
+                if (not force and sync is not None and sync.syllabus_hash == content_hash
+                        and sync.syllabus_rules_version == rules_version
+                        and self.mapper.is_current(course, sync, rules_version)):
+                    return {**result, 'status': 'unchanged'}
+
+                page_count = 0
+
+                def pages():
+                    nonlocal page_count
+                    for page in iter_syllabus_pages(spooled, object_name):
+                        page_count += 1
+                        yield page
+
+                self.mapper.refresh_course_skills(
+                    [course], syllabi={course.id: (pages(), content_hash)}, force=True
+                )
+
+        except Exception as e:
+            self.db.rollback()
+            print(f"WARNING: Could not ingest syllabus for {course.course_code}: {e}")
+            return {**result, 'status': 'failed', 'error': str(e)}
+
+        return {**result, 'status': 'mapped', 'pages': page_count}
+
+    def ingest_courses(self, course_ids: Optional[List[uuid.UUID]] = None, force: bool = False) -> Dict:
+        """
+        Map the syllabi of many courses
+
+        Args:
+            course_ids: Courses to process (default: every course with a syllabus)
+            force: Re-extract even unchanged syllabi
+
+        Returns:
+            Summary with counts per status and the per-course results
+        """
+        query = self.db.query(Course).filter(Course.syllabus_url.isnot(None))
+        if course_ids is not None:
+            query = query.filter(Course.id.in_(course_ids))
+
+        results = [self.ingest_course(course, force=force) for course in query.all()]
+
+        summary = {'total': len(results)}
+        for status in ('mapped', 'unchanged', 'failed'):
+            summary[status] = sum(1 for r in results if r['status'] == status)
+        summary['results'] = results
+        return summary
@@ -0,0 +1,211 @@
+"""
+Taxonomy Service
+Process-wide, versioned snapshot of the skill taxonomy with O(1) name and
+alias lookup, shared by the extraction service and the mappers
+"""
+import os
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from models.database_models import Skill, SkillAlias
+
+load_dotenv()
+
+
+@dataclass(frozen=True)
+class TaxonomySkill:
+    """Immutable copy of a skill row and its aliases"""
+    id: object
+    skill_name: str
+    normalized_name: str
+    skill_category: Optional[str]
+    description: Optional[str]
+    benchmark_score: Optional[int]
+    aliases: Tuple[str, ...] = ()
+
+
+def normalize_skill_name(name: str) -> str:
+    """Lookup form of a skill name or alias"""
+    return ' '.join(name.lower().split())
+
+
+def compute_taxonomy_version(skills: Iterable) -> str:
+    """
+    Content hash of a skill taxonomy
+
+    Changes whenever a skill is added, removed, renamed or re-described, or
+    an alias is added or removed.
+
+    Args:
+        skills: Skills with id, skill_name, description and aliases
+    """
+    digest = hashlib.sha1()
+    for skill in sorted(skills, key=lambda s: str(s.id)):
+        digest.update(f"{skill.id}\x1f{skill.skill_name}\x1f{skill.description or ''}\x1e".encode('utf-8'))
+        for alias in sorted(skill.aliases):
+            digest.update(f"{alias}\x1d".encode('utf-8'))
+    return digest.hexdigest()
+
+
+_MISS = object()
+
+
+class TaxonomySnapshot:
+    """
+    Immutable view of the skill taxonomy at one version
+
+    Skill names and aliases are indexed by normalized form, so resolving a
+    name is a dictionary lookup. Names that need the substring fallback
+    (and names that match nothing) are memoized per snapshot, so each is
+    scanned at most once per taxonomy version.
+    """
+
+    def __init__(self, skills: Iterable[TaxonomySkill]):
+        """
+        Index the skills
+
+        Args:
+            skills: Skills of the taxonomy
+        """
+        self.skills: Tuple[TaxonomySkill, ...] = tuple(sorted(skills, key=lambda s: s.normalized_name))
+        self.version = compute_taxonomy_version(self.skills)
+        self.loaded_at = time.monotonic()
+
+        self._by_id: Dict[str, TaxonomySkill] = {str(skill.id): skill for skill in self.skills}
+        self._by_name: Dict[str, TaxonomySkill] = {skill.normalized_name: skill for skill in self.skills}
+        self._by_alias: Dict[str, TaxonomySkill] = {}
+        for skill in self.skills:
+            for alias in skill.aliases:
+                self._by_alias.setdefault(alias, skill)
+
+        self._resolved: Dict[str, object] = {}
+
+    @classmethod
+    def load(cls, db: Session) -> 'TaxonomySnapshot':
+        """Build a snapshot from the skills and skill_aliases tables"""
+        aliases: Dict[str, list] = {}
+        for skill_id, alias in db.query(SkillAlias.skill_id, SkillAlias.alias_normalized):
+            aliases.setdefault(str(skill_id), []).append(normalize_skill_name(alias))
+
+        return cls(
+            TaxonomySkill(
+                id=skill.id,
+                skill_name=skill.skill_name,
+                normalized_name=normalize_skill_name(skill.skill_name),
+                skill_category=skill.skill_category,
+                description=skill.description,
+                benchmark_score=skill.benchmark_score,
+                aliases=tuple(sorted(aliases.get(str(skill.id), ())))
+            )
+            for skill in db.query(Skill).all()
+        )
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def get(self, skill_id) -> Optional[TaxonomySkill]:
+        """Skill by ID"""
+        return self._by_id.get(str(skill_id))
+
+    def resolve(self, name: str) -> Optional[TaxonomySkill]:
+        """
+        Resolve a skill name or alias
+
+        Tries the exact (case-insensitive) skill name, then an alias, then
+        the first skill whose name contains the text, like the substring
+        lookups this replaces.
+
+        Args:
+            name: Skill name, alias or name fragment
+
+        Returns:
+            Matching skill or None
+        """
+        normalized = normalize_skill_name(name)
+        skill = self._by_name.get(normalized) or self._by_alias.get(normalized)
+        if skill:
+            return skill
+
+        skill = self._resolved.get(normalized)
+        if skill is None:
+            skill = next(
+                (s for s in self.skills if normalized and normalized in s.normalized_name),
+                _MISS
+            )
+            self._resolved[normalized] = skill
+        return None if skill is _MISS else skill
+
+
+# Current snapshot, shared by every session in the process
+_snapshot: Optional[TaxonomySnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot_ttl() -> float:
+    """Seconds before a snapshot is reloaded (TAXONOMY_SNAPSHOT_TTL_SECONDS)"""
+    return float(os.getenv('TAXONOMY_SNAPSHOT_TTL_SECONDS', 300))
+
+
+def get_taxonomy_snapshot(db: Session) -> TaxonomySnapshot:
+    """
+    Get the current taxonomy snapshot, loading it if needed
+
+    The snapshot is rebuilt after a commit that changed skills or aliases
+    in this process, and after TAXONOMY_SNAPSHOT_TTL_SECONDS to pick up
+    changes made by other workers.
+
+    Args:
+        db: Database session used if the snapshot has to be loaded
+
+    Returns:
+        TaxonomySnapshot
+    """
+    global _snapshot
+    snapshot = _snapshot
+    if snapshot is not None and time.monotonic() - snapshot.loaded_at < get_snapshot_ttl():
+        return snapshot
+
+    with _snapshot_lock:
+        snapshot = _snapshot
+        if snapshot is None or time.monotonic() - snapshot.loaded_at >= get_snapshot_ttl():
+            snapshot = TaxonomySnapshot.load(db)
+            _snapshot = snapshot
+    return snapshot
+
+
+def invalidate_taxonomy_snapshot():
+    """Drop the current snapshot so the next access reloads it"""
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
+
+
+def _mark_taxonomy_changed(mapper, connection, target):
+    """Flag the session so the snapshot is invalidated once it commits"""
+    session = object_session(target)
+    if session is not None:
+        session.info['taxonomy_changed'] = True
+    else:
+        invalidate_taxonomy_snapshot()
+
+
+for _model in (Skill, SkillAlias):
+    for _event_name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(_model, _event_name, _mark_taxonomy_changed)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session):
+    if session.info.pop('taxonomy_changed', False):
+        invalidate_taxonomy_snapshot()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_after_rollback(session):
+    session.info.pop('taxonomy_changed', None)
@@ -2,21 +2,28 @@
 Text Preprocessing Service
 Cleans and normalizes text from various sources (projects, resumes, courses)
 """
+import os
 import re
 import string
-from typing import List, Set
+import threading
+from typing import List, Optional, Set
 import spacy
 from spacy.lang.en.stop_words import STOP_WORDS
 
 class TextPreprocessor:
     """Service for cleaning and preprocessing text before skill extraction"""
     
+    # Pipeline components whose output is never used (tokens, noun chunks
+    # and entities only need the tagger, parser and NER)
+    UNUSED_COMPONENTS = ('lemmatizer',)
+    
     def __init__(self):
         """Initialize spaCy model for text processing"""
+        model_name = os.getenv('SPACY_MODEL', 'en_core_web_sm')
         try:
-            self.nlp = spacy.load("en_core_web_sm")
+            self.nlp = spacy.load(model_name, exclude=list(self.UNUSED_COMPONENTS))
         except OSError:
-            print("WARNING: spaCy model not found. Run: python -m spacy download en_core_web_sm")
+            print(f"WARNING: spaCy model not found. Run: python -m spacy download {model_name}")
             self.nlp = None
         
         # Technical stopwords to preserve
@@ -70,8 +77,8 @@ class TextPreprocessor:
             # Fallback to simple split
             return text.split()
         
-        doc = self.nlp(text)
-        return [token.text for token in doc]
+        # Tokens only need the tokenizer, not the full pipeline
+        return [token.text for token in self.nlp.tokenizer(text)]
     
     def remove_stopwords(self, tokens: List[str]) -> List[str]:
         """
@@ -104,7 +111,10 @@ class TextPreprocessor:
         if not self.nlp:
             return []
         
-        doc = self.nlp(text)
+        return self._technical_terms_from_doc(self.nlp(text))
+    
+    def _technical_terms_from_doc(self, doc) -> List[str]:
+        """Collect technical term candidates from a parsed spaCy doc"""
         technical_terms = []
         
         # Extract noun chunks (potential tech terms)
@@ -150,13 +160,18 @@ class TextPreprocessor:
         
         return bullets if bullets else [text]
     
-    def preprocess(self, text: str, extract_bullets: bool = False) -> dict:
+    def preprocess(self, text: str, extract_bullets: bool = False, with_terms: bool = True) -> dict:
         """
         Full preprocessing pipeline
         
+        The full spaCy pipeline runs once per document, only for technical
+        terms; bullet tokens come from the tokenizer alone.
+        
         Args:
             text: Raw input text
             extract_bullets: Whether to extract bullet points
+            with_terms: Whether to extract technical terms (None otherwise,
+                and the pipeline is not run)
             
         Returns:
             Dictionary with preprocessed components
@@ -179,7 +194,7 @@ class TextPreprocessor:
         filtered_tokens = self.remove_stopwords(tokens)
         
         # Extract technical terms
-        tech_terms = self.extract_technical_terms(cleaned)
+        tech_terms = self.extract_technical_terms(cleaned) if with_terms else None
         
         return {
             'original': text,
@@ -190,12 +205,87 @@ class TextPreprocessor:
             'bullet_points': bullet_texts if extract_bullets else None
         }
 
+    def preprocess_many(
+        self,
+        texts: List[str],
+        extract_bullets: bool = False,
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None,
+        with_terms: bool = True
+    ) -> List[dict]:
+        """
+        Preprocess a batch of texts with batched spaCy parsing
+        
+        Produces the same output as calling preprocess() on each text, but
+        parses every document once through nlp.pipe (only when technical
+        terms are wanted) and tokenizes bullets through tokenizer.pipe.
+        
+        Args:
+            texts: Raw input texts
+            extract_bullets: Whether to extract bullet points
+            batch_size: Documents per spaCy batch (defaults to SPACY_BATCH_SIZE)
+            n_process: Worker processes for parsing (defaults to SPACY_N_PROCESS)
+            with_terms: Whether to extract technical terms (skips parsing)
+            
+        Returns:
+            List of preprocessing dictionaries, one per text
+        """
+        batch_size = batch_size or int(os.getenv('SPACY_BATCH_SIZE', 64))
+        n_process = n_process or int(os.getenv('SPACY_N_PROCESS', 1))
+        
+        cleaned_texts = [self.clean_text(text) for text in texts]
+        
+        if extract_bullets:
+            bullet_lists = [self.extract_from_bullet_points(cleaned) for cleaned in cleaned_texts]
+        else:
+            bullet_lists = [[cleaned] for cleaned in cleaned_texts]
+        
+        # Tokenize every bullet of every text in one batched pass
+        all_bullets = [bullet for bullets in bullet_lists for bullet in bullets]
+        if self.nlp:
+            bullet_tokens = iter([
+                [token.text for token in doc]
+                for doc in self.nlp.tokenizer.pipe(all_bullets, batch_size=batch_size)
+            ])
+        else:
+            bullet_tokens = iter([bullet.split() for bullet in all_bullets])
+        
+        if not with_terms:
+            tech_terms = [None] * len(cleaned_texts)
+        elif self.nlp:
+            tech_terms = [
+                self._technical_terms_from_doc(doc)
+                for doc in self.nlp.pipe(cleaned_texts, batch_size=batch_size, n_process=n_process)
+            ]
+        else:
+            tech_terms = [[] for _ in cleaned_texts]
+        
+        results = []
+        for text, cleaned, bullets, terms in zip(texts, cleaned_texts, bullet_lists, tech_terms):
+            tokens = []
+            for _ in bullets:
+                tokens.extend(next(bullet_tokens))
+            
+            results.append({
+                'original': text,
+                'cleaned': cleaned,
+                'tokens': tokens,
+                'filtered_tokens': self.remove_stopwords(tokens),
+                'technical_terms': terms,
+                'bullet_points': bullets if extract_bullets else None
+            })
+        
+        return results
+
 # Singleton instance
 _preprocessor = None
+_preprocessor_lock = threading.Lock()
 
 def get_preprocessor() -> TextPreprocessor:
     """Get or create singleton preprocessor instance"""
     global _preprocessor
     if _preprocessor is None:
-        _preprocessor = TextPreprocessor()
+        with _preprocessor_lock:
+            if _preprocessor is None:
+                _preprocessor = TextPreprocessor()
     return _preprocessor
@@ -0,0 +1,270 @@
+"""
+Vector Index
+Nearest-neighbour search over normalized skill embeddings: exact brute force
+for small taxonomies, an inverted-file (IVF) index for large ones
+"""
+import os
+import math
+from typing import Hashable, List, Optional, Tuple
+import numpy as np
+from dotenv import load_dotenv
+
+from services.embedding_quantization import QuantizedMatrix, as_quantized
+
+load_dotenv()
+
+
+def _top_k(similarities: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Top k columns per row of a similarity matrix, highest first"""
+    k = min(k, similarities.shape[1])
+    if k == 0:
+        empty = np.empty((len(similarities), 0))
+        return empty.astype(np.float32), empty.astype(np.int64)
+
+    if k < similarities.shape[1]:
+        positions = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    else:
+        positions = np.tile(np.arange(k), (len(similarities), 1))
+
+    scores = np.take_along_axis(similarities, positions, axis=1)
+    order = np.argsort(-scores, axis=1)
+    return np.take_along_axis(scores, order, axis=1), np.take_along_axis(positions, order, axis=1)
+
+
+class BruteForceIndex:
+    """
+    Exact inner-product search with one matrix product per query batch
+
+    Best choice up to a few thousand vectors, where the product is cheaper
+    than any candidate selection. Vectors may be stored quantized.
+
+    add() never mutates arrays a search may be reading: it builds new ones
+    and publishes them with single assignments, keys first, so searches can
+    run without the lock writers hold.
+    """
+
+    def __init__(self, keys: List[Hashable], vectors):
+        """
+        Build the index
+
+        Args:
+            keys: Identifier per vector (reported by search)
+            vectors: L2-normalized vectors (array or QuantizedMatrix), one row per key
+        """
+        self.keys = list(keys)
+        self.vectors = as_quantized(vectors)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, keys: List[Hashable], vectors):
+        """Append vectors to the index"""
+        vectors = self.vectors.append(_like(vectors, self.vectors))
+        self.keys = self.keys + list(keys)
+        self.vectors = vectors
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k most similar vectors for each query
+
+        Args:
+            queries: L2-normalized query vectors, one per row
+            k: Number of neighbours per query
+
+        Returns:
+            Tuple of (scores, positions), each of shape (len(queries), k);
+            positions index into self.keys
+        """
+        return _top_k(self.vectors.dot(queries), k)
+
+
+class IVFIndex:
+    """
+    Inverted-file index for approximate inner-product search
+
+    Vectors are clustered with spherical k-means; a query is only compared
+    against the vectors in its n_probe most similar clusters. With about
+    sqrt(N) clusters this scores a small fraction of the taxonomy per query
+    while keeping recall high, because related skills share clusters.
+    New vectors are assigned to their nearest existing cluster, so adding
+    skills does not require retraining.
+
+    The vectors and inverted lists are published together as one tuple, so
+    a search running during add() sees either the old or the new state,
+    never new lists over old vectors.
+    """
+
+    def __init__(
+        self,
+        keys: List[Hashable],
+        vectors,
+        n_lists: Optional[int] = None,
+        n_probe: Optional[int] = None,
+        iterations: int = 10,
+        seed: int = 0
+    ):
+        """
+        Train the index
+
+        Args:
+            keys: Identifier per vector (reported by search)
+            vectors: L2-normalized vectors (array or QuantizedMatrix), one row per key
+            n_lists: Number of clusters (defaults to about sqrt(N))
+            n_probe: Clusters searched per query (defaults to VECTOR_INDEX_NPROBE,
+                or about a tenth of the clusters)
+            iterations: k-means iterations
+            seed: Random seed for centroid initialisation
+        """
+        self.keys = list(keys)
+        vectors = as_quantized(vectors)
+        self.n_lists = n_lists or max(1, int(math.sqrt(len(self.keys))))
+        self.trained_size = len(self.keys)
+
+        self.centroids = self._train(vectors[:], iterations, seed)
+        self.n_probe = n_probe or int(os.getenv('VECTOR_INDEX_NPROBE') or 0) or max(8, self.n_lists // 10)
+        self._state: Tuple[QuantizedMatrix, List[np.ndarray]] = (vectors, self._assign_all(vectors))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def vectors(self) -> QuantizedMatrix:
+        """Indexed vectors, one row per key"""
+        return self._state[0]
+
+    def _train(self, vectors: np.ndarray, iterations: int, seed: int) -> np.ndarray:
+        """Spherical k-means: centroids are re-normalized after each update"""
+        rng = np.random.default_rng(seed)
+        n_lists = min(self.n_lists, len(vectors))
+        centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+
+        for _ in range(iterations):
+            assignments = np.argmax(vectors @ centroids.T, axis=1)
+            for cluster in range(n_lists):
+                members = vectors[assignments == cluster]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    centroids[cluster] = centroid / max(np.linalg.norm(centroid), 1e-12)
+
+        self.n_lists = n_lists
+        return centroids
+
+    def _assign_all(self, vectors: QuantizedMatrix) -> List[np.ndarray]:
+        """Inverted lists (row positions per cluster) of every vector"""
+        assignments = np.argmax(vectors.dot(self.centroids), axis=0)
+        return [np.flatnonzero(assignments == cluster) for cluster in range(self.n_lists)]
+
+    def add(self, keys: List[Hashable], vectors):
+        """Append vectors, assigning each to its nearest existing cluster"""
+        old_vectors, lists = self._state
+        vectors = _like(vectors, old_vectors)
+        first = len(old_vectors)
+
+        lists = list(lists)
+        assignments = np.argmax(vectors.dot(self.centroids), axis=0)
+        for cluster in np.unique(assignments):
+            new_rows = first + np.flatnonzero(assignments == cluster)
+            lists[cluster] = np.concatenate([lists[cluster], new_rows])
+
+        # Keys first: positions from the new state must resolve
+        self.keys = self.keys + list(keys)
+        self._state = (old_vectors.append(vectors), lists)
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find (approximately) the k most similar vectors for each query
+
+        Args:
+            queries: L2-normalized query vectors, one per row
+            k: Number of neighbours per query
+
+        Returns:
+            Tuple of (scores, positions), each of shape (len(queries), k);
+            positions index into self.keys. Rows with fewer than k candidates
+            are padded with score -inf and position -1.
+        """
+        queries = np.asarray(queries)
+        vectors, lists = self._state
+        k = min(k, len(vectors))
+        n_probe = min(self.n_probe, self.n_lists)
+
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        positions = np.full((len(queries), k), -1, dtype=np.int64)
+
+        probes = _top_k(queries @ self.centroids.T, n_probe)[1]
+        for row, (query, clusters) in enumerate(zip(queries, probes)):
+            candidates = np.concatenate([lists[cluster] for cluster in clusters])
+            if not len(candidates):
+                continue
+            row_scores, row_positions = _top_k(vectors.take(candidates).dot(query)[None, :], k)
+            scores[row, :row_scores.shape[1]] = row_scores[0]
+            positions[row, :row_positions.shape[1]] = candidates[row_positions[0]]
+
+        return scores, positions
+
+
+def _like(vectors, reference: QuantizedMatrix) -> QuantizedMatrix:
+    """Vectors in the same storage type as an existing matrix"""
+    if isinstance(vectors, QuantizedMatrix) and vectors.dtype == reference.dtype:
+        return vectors
+    return QuantizedMatrix.quantize(as_quantized(vectors)[:], reference.dtype)
+
+
+def get_ann_threshold() -> int:
+    """Taxonomy size at which the IVF index replaces brute force"""
+    return int(os.getenv('VECTOR_INDEX_ANN_THRESHOLD', 20000))
+
+
+def build_index(keys: List[Hashable], vectors):
+    """
+    Build the appropriate index for the number of vectors
+
+    Args:
+        keys: Identifier per vector
+        vectors: L2-normalized vectors, one row per key
+
+    Returns:
+        BruteForceIndex below VECTOR_INDEX_ANN_THRESHOLD vectors, else IVFIndex
+    """
+    if len(keys) < get_ann_threshold():
+        return BruteForceIndex(keys, vectors)
+    return IVFIndex(keys, vectors)
+
+
+def sync_index(index, keys: List[Hashable], vectors):
+    """
+    Bring an index up to date with the current set of vectors
+
+    Keys are content hashes, so a key that is no longer present means a
+    skill was removed or changed and the index is rebuilt. When skills were
+    only added, the new vectors are appended incrementally. IVF indexes are
+    retrained once they have doubled in size since training, and a brute
+    force index is replaced once the taxonomy crosses the ANN threshold.
+
+    Args:
+        index: Existing index (or None)
+        keys: Current identifier per vector
+        vectors: Current vectors, one row per key
+
+    Returns:
+        Index covering exactly the given keys
+    """
+    if index is None:
+        return build_index(keys, vectors)
+
+    vectors = as_quantized(vectors)
+    current = set(keys)
+    indexed = set(index.keys)
+    if not indexed <= current or index.vectors.dtype != vectors.dtype:
+        return build_index(keys, vectors)
+
+    if isinstance(index, BruteForceIndex) and len(keys) >= get_ann_threshold():
+        return build_index(keys, vectors)
+    if isinstance(index, IVFIndex) and len(keys) > 2 * index.trained_size:
+        return build_index(keys, vectors)
+
+    new_rows = [i for i, key in enumerate(keys) if key not in indexed]
+    if new_rows:
+        index.add([keys[i] for i in new_rows], vectors.take(np.array(new_rows)))
+
+    return index
@@ -0,0 +1,79 @@
+"""
+In-memory SQLite database for service tests
+
+Follows the test_db fixture in conftest.py without importing the app, and
+renders the PostgreSQL column types the models use so the tables can be
+created on SQLite.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import INET, JSONB, UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models.database_models import Base, Student, Skill, Course
+
+
+@compiles(UUID, 'sqlite')
+def _compile_uuid(type_, compiler, **kw):
+    return 'CHAR(32)'
+
+
+@compiles(JSONB, 'sqlite')
+def _compile_jsonb(type_, compiler, **kw):
+    return 'JSON'
+
+
+@compiles(INET, 'sqlite')
+def _compile_inet(type_, compiler, **kw):
+    return 'VARCHAR(45)'
+
+
+SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///:memory:"
+
+
+@pytest.fixture(scope="function")
+def sqlite_db():
+    """Fresh in-memory database session for each test"""
+    engine = create_engine(
+        SQLALCHEMY_TEST_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    session = TestingSessionLocal()
+
+    yield session
+
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def add_student(db, roll_number='CS001'):
+    """Committed student row"""
+    student = Student(
+        roll_number=roll_number, full_name=f"Student {roll_number}",
+        email=f"{roll_number.lower()}@example.com", branch='CS', batch_year=2024
+    )
+    db.add(student)
+    db.commit()
+    return student
+
+
+def add_skill(db, skill_name):
+    """Committed skill row"""
+    skill = Skill(skill_name=skill_name, skill_category='Core Technical')
+    db.add(skill)
+    db.commit()
+    return skill
+
+
+def add_course(db, course_code='CS101', course_name='Data Structures', syllabus_url=None):
+    """Committed course row"""
+    course = Course(course_code=course_code, course_name=course_name, branch='CS', syllabus_url=syllabus_url)
+    db.add(course)
+    db.commit()
+    return course
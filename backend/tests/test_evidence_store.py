@@ -0,0 +1,134 @@
+"""
+Unit tests for EvidenceStore
+"""
+import pytest
+from datetime import date, datetime, timezone
+import uuid
+
+from models.database_models import (
+    EvidenceChange, EvidenceSync, Project, SkillEvidence, SkillScoreChange, StudentCourse
+)
+from services.evidence_store import EvidenceStore, _as_local_datetime
+from services.scoring_service import Evidence
+from tests.db_fixtures import sqlite_db, add_course, add_skill, add_student  # noqa: F401
+
+
+def queued(db):
+    """Queued source changes as (student_id, source_type, source_id)"""
+    return sorted(
+        ((c.student_id, c.source_type, c.source_id) for c in db.query(EvidenceChange)),
+        key=str
+    )
+
+
+def dirty_pairs(db):
+    """Queued rescoring marks as (student_id, skill_id)"""
+    return {(mark.student_id, mark.skill_id) for mark in db.query(SkillScoreChange)}
+
+
+def evidence(skill, source_id, confidence=0.8, source_type='project'):
+    return Evidence(source_type, str(source_id), str(skill.id), skill.skill_name, confidence, datetime(2026, 1, 1), '')
+
+
+@pytest.mark.unit
+class TestEvidenceStore:
+    def test_evidence_dates_normalized(self):
+        assert _as_local_datetime(date(2026, 3, 1)) == datetime(2026, 3, 1)
+        assert _as_local_datetime(datetime(2026, 3, 1, tzinfo=timezone.utc)).tzinfo is None
+        assert _as_local_datetime(None) is None
+
+    def test_source_writes_queue_changes(self, sqlite_db):
+        """Inserting, editing and deleting a project each queue a change"""
+        student = add_student(sqlite_db)
+
+        project = Project(student_id=student.id, project_title='Chat app')
+        sqlite_db.add(project)
+        sqlite_db.commit()
+        project.project_abstract = 'Built with FastAPI'
+        sqlite_db.commit()
+        sqlite_db.delete(project)
+        sqlite_db.commit()
+
+        assert queued(sqlite_db) == [(student.id, 'project', project.id)] * 3
+
+    def test_moved_enrollment_queues_both_courses(self, sqlite_db):
+        student = add_student(sqlite_db)
+        old_course, new_course = add_course(sqlite_db, 'CS101'), add_course(sqlite_db, 'CS201')
+        enrollment = StudentCourse(student_id=student.id, course_id=old_course.id)
+        sqlite_db.add(enrollment)
+        sqlite_db.commit()
+        sqlite_db.query(EvidenceChange).delete()
+
+        enrollment.course_id = new_course.id
+        sqlite_db.commit()
+
+        assert {c[2] for c in queued(sqlite_db)} == {old_course.id, new_course.id}
+
+    def test_course_edit_queues_enrolled_students(self, sqlite_db):
+        enrolled, other = add_student(sqlite_db, 'CS001'), add_student(sqlite_db, 'CS002')
+        course = add_course(sqlite_db)
+        sqlite_db.add(StudentCourse(student_id=enrolled.id, course_id=course.id))
+        sqlite_db.commit()
+        sqlite_db.query(EvidenceChange).delete()
+
+        course.course_name = 'Advanced Data Structures'
+        sqlite_db.commit()
+
+        assert queued(sqlite_db) == [(enrolled.id, 'course', course.id)]
+        assert other.id not in {c[0] for c in queued(sqlite_db)}
+
+    def test_replace_many_and_load_many(self, sqlite_db):
+        """Replacing evidence marks old and new skills and records the version"""
+        first, second = add_student(sqlite_db, 'CS001'), add_student(sqlite_db, 'CS002')
+        python, sql = add_skill(sqlite_db, 'Python'), add_skill(sqlite_db, 'SQL')
+        store = EvidenceStore(sqlite_db)
+        project_id = uuid.uuid4()
+
+        store.replace_many({first.id: [evidence(python, project_id)], second.id: []}, 'v1')
+        store.clear_dirty_skills(store.get_dirty_skills([first.id, second.id]))
+        store.replace_many({first.id: [evidence(sql, project_id, 0.5)]}, 'v1')
+
+        assert dirty_pairs(sqlite_db) == {(first.id, python.id), (first.id, sql.id)}
+        stranger = uuid.uuid4()
+        assert store.get_sync_states([first.id, second.id, stranger], 'v1') == {
+            first.id: True, second.id: True, stranger: False
+        }
+        assert not store.get_sync_state(first.id, 'v2')
+        loaded = store.load_many([first.id, second.id])
+        assert [(row.skill_id, name, float(row.confidence)) for row, name in loaded[first.id]] == [
+            (sql.id, 'SQL', 0.5)
+        ]
+        assert loaded[second.id] == []
+        assert store.load_many([first.id], skill_ids=[python.id]) == {first.id: []}
+        assert sqlite_db.get(EvidenceSync, second.id).evidence_version == 'v1'
+
+    def test_applied_changes_drain_queues(self, sqlite_db):
+        """Applied changes leave the queue; changes made meanwhile stay queued"""
+        student = add_student(sqlite_db)
+        python, docker = add_skill(sqlite_db, 'Python'), add_skill(sqlite_db, 'Docker')
+        store = EvidenceStore(sqlite_db)
+        project = Project(student_id=student.id, project_title='Chat app')
+        sqlite_db.add(project)
+        sqlite_db.commit()
+        store.replace(student.id, [evidence(python, project.id)], 'v1', store.get_changes([student.id]))
+        store.clear_dirty_skills(store.get_dirty_skills([student.id]))
+        sqlite_db.commit()
+
+        project.project_abstract = 'Now containerized'
+        sqlite_db.commit()
+        changes = store.get_changes([student.id])
+        later = Project(student_id=student.id, project_title='Compiler')
+        sqlite_db.add(later)
+        sqlite_db.commit()
+
+        store.apply_changes(changes, {student.id: [evidence(docker, project.id)]})
+
+        assert queued(sqlite_db) == [(student.id, 'project', later.id)]
+        assert dirty_pairs(sqlite_db) == {(student.id, python.id), (student.id, docker.id)}
+        assert [(row.skill_id, row.source_id) for row in sqlite_db.query(SkillEvidence)] == [
+            (docker.id, project.id)
+        ]
+
+        store.clear_dirty_skills(store.get_dirty_skills([student.id]))
+        sqlite_db.commit()
+        assert dirty_pairs(sqlite_db) == set()
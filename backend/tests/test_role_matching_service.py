@@ -0,0 +1,134 @@
+"""
+Unit tests for RoleMatchingService
+"""
+import pytest
+import uuid
+
+import services.skill_extraction_service as extraction_module
+import services.taxonomy_service as taxonomy_module
+from models.database_models import IndustryRole, StudentCourse, StudentRoleMatch, StudentSkill
+from services.role_matching_service import RoleMatchingService
+from tests.db_fixtures import sqlite_db, add_course, add_skill, add_student  # noqa: F401
+
+
+@pytest.fixture
+def matching(sqlite_db, monkeypatch):
+    """RoleMatchingService on an in-memory database, without NLP models"""
+    for name in ('get_semantic_model', 'get_text_preprocessor', 'get_embedding_batcher'):
+        monkeypatch.setattr(extraction_module, name, lambda: None)
+    taxonomy_module.invalidate_taxonomy_snapshot()
+    yield RoleMatchingService(sqlite_db)
+    taxonomy_module.invalidate_taxonomy_snapshot()
+
+
+def add_role(db, title, *requirements):
+    """Committed role requiring (skill name, min score, mandatory) entries with equal weights"""
+    role = IndustryRole(
+        role_title=title, role_category='Software',
+        required_skills=[
+            {'skill_name': name, 'min_score': min_score, 'mandatory': mandatory, 'weight': 0.5}
+            for name, min_score, mandatory in requirements
+        ],
+        typical_companies=['TCS', 'Infosys']
+    )
+    db.add(role)
+    db.commit()
+    return role
+
+
+def set_score(db, student, skill, score):
+    db.add(StudentSkill(
+        student_id=student.id, skill_id=skill.id, raw_score=int(score), weighted_score=score,
+        confidence_level=0.6, evidence_sources=[]
+    ))
+    db.commit()
+
+
+def saved(db, student):
+    """Saved match score per role title"""
+    return {
+        match.role.role_title: float(match.match_score)
+        for match in db.query(StudentRoleMatch).filter(StudentRoleMatch.student_id == student.id)
+    }
+
+
+@pytest.mark.unit
+class TestRoleMatching:
+    def test_compatibility_from_required_skills(self, matching):
+        db = matching.db
+        student = add_student(db)
+        python, sql = add_skill(db, 'Python'), add_skill(db, 'SQL')
+        role = add_role(db, 'Backend Developer', ('Python', 80, True), ('SQL', 50, False))
+        scores = {str(python.id): {'score': 80.0}, str(sql.id): {'score': 25.0}}
+
+        match = matching.calculate_compatibility(student.id, role.id, scores)
+
+        assert match.compatibility_percentage == 75.0
+        assert (match.matched_skills, match.total_required_skills) == (1, 2)
+        assert match.company == 'TCS, Infosys'
+        assert matching.calculate_compatibility(student.id, role.id, {str(sql.id): {'score': 90.0}}) is None
+
+    def test_saved_match_maps_onto_model_columns(self, matching):
+        db = matching.db
+        student = add_student(db)
+        python, sql = add_skill(db, 'Python'), add_skill(db, 'SQL')
+        role = add_role(db, 'Backend Developer', ('Python', 80, True), ('SQL', 50, False))
+        match = matching.calculate_compatibility(
+            student.id, role.id, {str(python.id): {'score': 80.0}, str(sql.id): {'score': 25.0}}
+        )
+
+        matching.save_role_matches(student.id, [match])
+
+        row = db.query(StudentRoleMatch).one()
+        assert float(row.match_score) == 75.0
+        assert row.missing_skills == [{
+            'skill_name': 'SQL', 'current_score': 25.0, 'required_score': 50, 'gap': 25.0, 'mandatory': False
+        }]
+        assert matching.get_saved_matches(student.id)[0]['matched_skills'] == 1
+
+    def test_refresh_replaces_only_roles_using_rescored_skills(self, matching):
+        db = matching.db
+        student = add_student(db)
+        python, docker = add_skill(db, 'Python'), add_skill(db, 'Docker')
+        add_role(db, 'Backend Developer', ('Python', 80, False))
+        devops = add_role(db, 'DevOps Engineer', ('Docker', 80, False))
+        set_score(db, student, python, 80)
+        db.add(StudentRoleMatch(student_id=student.id, role_id=devops.id, match_score=70, missing_skills=[]))
+        db.commit()
+
+        assert matching.refresh_role_matches({student.id: {str(python.id)}}) == 1
+
+        assert saved(db, student) == {'Backend Developer': 100.0, 'DevOps Engineer': 70.0}
+        assert matching.refresh_role_matches({student.id: {str(uuid.uuid4())}}) == 0
+
+    def test_refresh_drops_matches_below_threshold(self, matching):
+        db = matching.db
+        student = add_student(db)
+        python = add_skill(db, 'Python')
+        role = add_role(db, 'Backend Developer', ('Python', 80, False))
+        set_score(db, student, python, 20)
+        db.add(StudentRoleMatch(student_id=student.id, role_id=role.id, match_score=90, missing_skills=[]))
+        db.commit()
+
+        matching.refresh_role_matches({student.id: {str(python.id)}}, min_compatibility=60.0)
+
+        assert saved(db, student) == {}
+
+    def test_refresh_changed_students(self, matching):
+        """New evidence is scored and the roles using it are matched"""
+        db = matching.db
+        student = add_student(db)
+        python = add_skill(db, 'Python')
+        add_skill(db, 'Docker')
+        add_role(db, 'Backend Developer', ('Python', 10, True))
+        add_role(db, 'DevOps Engineer', ('Docker', 10, True))
+        course = add_course(db, 'CS101', course_name='Python Basics')
+        db.add(StudentCourse(student_id=student.id, course_id=course.id))
+        db.commit()
+
+        summary = matching.refresh_changed_students([student.id])
+
+        assert summary == {'students_rescored': 1, 'skills_rescored': 1, 'role_matches_refreshed': 1}
+        assert {row.skill_id for row in db.query(StudentSkill)} == {python.id}
+        assert saved(db, student) == {'Backend Developer': 100.0}
+        assert matching.refresh_changed_students([student.id])['role_matches_refreshed'] == 0
@@ -0,0 +1,400 @@
+"""
+Unit tests for ScoringService and the scoring kernel
+"""
+import pytest
+import numpy as np
+from types import SimpleNamespace
+from datetime import datetime, timedelta
+import uuid
+
+import services.skill_extraction_service as extraction_module
+import services.taxonomy_service as taxonomy_module
+from models.database_models import EvidenceChange, StudentSkill, SkillEvidence, SkillScoreChange, StudentCourse
+from services.scoring_service import ScoringService, Evidence
+from services.scoring_kernel import aggregate_evidence, pack_evidence, time_decay
+from tests.db_fixtures import sqlite_db, add_course, add_skill, add_student  # noqa: F401
+
+
+class FakeEvidenceStore:
+    """In-memory stand-in for EvidenceStore"""
+
+    def __init__(self):
+        self.rows = {}
+        self.sync = {}
+        self.changes = []
+        self.dirty = []
+
+    def queue_change(self, student_id, source_type, source_id):
+        self.changes.append(SimpleNamespace(
+            id=uuid.uuid4(), student_id=student_id, source_type=source_type, source_id=source_id
+        ))
+
+    def get_sync_state(self, student_id, evidence_version):
+        return self.sync.get(student_id) == evidence_version
+
+    def get_sync_states(self, student_ids, evidence_version):
+        return {student_id: self.get_sync_state(student_id, evidence_version) for student_id in student_ids}
+
+    def get_changes(self, student_ids):
+        return [c for c in self.changes if c.student_id in student_ids]
+
+    def replace(self, student_id, evidence, evidence_version, changes=()):
+        self.replace_many({student_id: evidence}, evidence_version, changes)
+
+    def replace_many(self, evidence_by_student, evidence_version, changes=()):
+        for student_id, evidence in evidence_by_student.items():
+            old = self.rows.get(student_id, [])
+            self.rows[student_id] = list(evidence)
+            self.sync[student_id] = evidence_version
+            self._finish(changes, student_id, old + self.rows[student_id])
+
+    def apply_changes(self, changes, evidence_by_student):
+        for student_id in {c.student_id for c in changes}:
+            changed = {str(c.source_id) for c in changes if c.student_id == student_id}
+            kept = [e for e in self.rows.get(student_id, []) if e.source_id not in changed]
+            removed = [e for e in self.rows.get(student_id, []) if e.source_id in changed]
+            added = list(evidence_by_student.get(student_id, []))
+            self.rows[student_id] = kept + added
+            self._finish([c for c in changes if c.student_id == student_id], student_id, removed + added)
+
+    def _finish(self, changes, student_id, touched):
+        applied = {c.id for c in changes}
+        self.changes = [c for c in self.changes if c.id not in applied]
+        for skill_id in {e.skill_id for e in touched}:
+            self.dirty.append(SimpleNamespace(id=uuid.uuid4(), student_id=student_id, skill_id=skill_id))
+
+    def get_dirty_skills(self, student_ids):
+        return [mark for mark in self.dirty if mark.student_id in student_ids]
+
+    def clear_dirty_skills(self, marks):
+        cleared = {mark.id for mark in marks}
+        self.dirty = [mark for mark in self.dirty if mark.id not in cleared]
+
+    def load(self, student_id, skill_id=None):
+        return [
+            (SimpleNamespace(
+                source_type=e.source_type, source_id=e.source_id, skill_id=e.skill_id,
+                confidence=e.confidence, evidence_date=e.date, evidence_text=e.evidence_text
+            ), e.skill_name)
+            for e in self.rows.get(student_id, [])
+            if skill_id is None or e.skill_id == str(skill_id)
+        ]
+
+    def load_many(self, student_ids, skill_ids=None):
+        return {
+            student_id: [
+                row for row in self.load(student_id)
+                if skill_ids is None or row[0].skill_id in {str(skill_id) for skill_id in skill_ids}
+            ]
+            for student_id in student_ids
+        }
+
+
+@pytest.mark.unit
+class TestEvidenceSync:
+    @pytest.fixture
+    def scoring(self):
+        service = ScoringService.__new__(ScoringService)
+        service.evidence_store = FakeEvidenceStore()
+        service.version = 'v1'
+        service.get_evidence_version = lambda: service.version
+        service.collections = 0
+
+        def collect_all_evidence(student_id):
+            service.collections += 1
+            return [Evidence('project', str(uuid.uuid4()), 'skill-1', 'Python', 0.9, datetime(2026, 1, 1), 'Project: X')]
+
+        service.collect_all_evidence = collect_all_evidence
+        service.collect_all_evidence_batch = lambda student_ids: {
+            student_id: service.collect_all_evidence(student_id) for student_id in student_ids
+        }
+        return service
+
+    def test_reads_reuse_stored_evidence(self, scoring):
+        """Evidence is extracted once, then scoring only aggregates"""
+        student_id = uuid.uuid4()
+
+        first = scoring.aggregate_all_skills(student_id)
+        second = scoring.aggregate_all_skills(student_id)
+
+        assert scoring.collections == 1
+        assert first == second
+        assert first['skill-1']['evidence_count'] == 1
+
+    def test_changed_record_reextracted_alone(self, scoring):
+        """A source change re-extracts that record; a new version rebuilds all"""
+        student_id = uuid.uuid4()
+        scoring.sync_evidence(student_id)
+        changed = []
+        scoring.collect_changed_evidence = lambda changes: changed.extend(changes) or {}
+
+        source_id = scoring.evidence_store.rows[student_id][0].source_id
+        scoring.evidence_store.queue_change(student_id, 'project', source_id)
+        assert scoring.sync_evidence(student_id)
+        assert not scoring.sync_evidence(student_id)
+        assert [c.source_id for c in changed] == [source_id]
+        assert scoring.evidence_store.rows[student_id] == []
+
+        scoring.version = 'v2'
+        assert scoring.sync_evidence(student_id)
+        assert scoring.collections == 2
+
+    def test_per_skill_score_loads_only_that_skill(self, scoring):
+        """The per-skill path matches the full aggregation for that skill"""
+        student_id = uuid.uuid4()
+        skill_ids = [uuid.uuid4() for _ in range(3)]
+        scoring.collect_all_evidence = lambda _: [
+            Evidence(source, str(uuid.uuid4()), str(skill_id), f'Skill {n}', 0.5 + 0.1 * n, datetime(2026, 1, 1), '')
+            for n, skill_id in enumerate(skill_ids)
+            for source in ('project', 'course')
+        ]
+        loaded = []
+        load = scoring.evidence_store.load
+        scoring.evidence_store.load = lambda student, skill=None: loaded.append(skill) or load(student, skill)
+
+        score, evidence = scoring.calculate_skill_score(student_id, skill_ids[1])
+        aggregated = scoring.aggregate_all_skills(student_id)
+
+        assert loaded == [skill_ids[1], None]
+        assert len(evidence) == 2
+        assert score == aggregated[str(skill_ids[1])]['score']
+
+    def test_batch_rebuilds_only_stale_students(self, scoring, monkeypatch):
+        """Bulk reads sync in chunks and match the per-student path"""
+        monkeypatch.setenv('EVIDENCE_BATCH_SIZE', '2')
+        student_ids = [uuid.uuid4() for _ in range(5)]
+        scoring.sync_evidence(student_ids[0])
+
+        assert scoring.sync_evidence_batch(student_ids) == 4
+        assert scoring.sync_evidence_batch(student_ids) == 0
+        assert scoring.collections == 5
+
+        batch = scoring.get_evidence_batch(student_ids)
+        assert list(batch) == student_ids
+        assert all(batch[s] == scoring.get_evidence(s) for s in student_ids)
+
+    def test_only_dirty_skills_rescored(self, scoring):
+        """Rescoring covers the skills whose evidence changed, then clears them"""
+        student_id = uuid.uuid4()
+        python, sql, docker = (str(uuid.uuid4()) for _ in range(3))
+        project, cert = str(uuid.uuid4()), str(uuid.uuid4())
+        scoring.collect_all_evidence = lambda _: [
+            Evidence('project', project, python, 'Python', 0.8, datetime(2026, 1, 1), ''),
+            Evidence('certification', cert, sql, 'SQL', 0.9, datetime(2026, 1, 1), '')
+        ]
+        scoring.collect_changed_evidence = lambda changes: {
+            student_id: [Evidence('project', project, docker, 'Docker', 0.7, datetime(2026, 2, 1), '')]
+        }
+        written = []
+        scoring._write_scores = lambda scores, marks: (
+            written.append((scores, {(m.student_id, m.skill_id) for m in marks})),
+            scoring.evidence_store.clear_dirty_skills(marks)
+        )
+
+        assert scoring.update_dirty_scores([student_id]) == {student_id: {python, sql}}
+        assert scoring.update_dirty_scores([student_id]) == {}
+
+        scoring.evidence_store.queue_change(student_id, 'project', uuid.UUID(project))
+        assert scoring.update_dirty_scores([student_id]) == {student_id: {python, docker}}
+
+        scores, marks = written[-1]
+        assert set(scores[student_id]) == {docker}
+        assert marks == {(student_id, python), (student_id, docker)}
+        assert len(written) == 2
+
+    def test_changed_evidence_keeps_only_changed_enrollments(self, monkeypatch):
+        """Course rows of students whose enrollment did not change are dropped"""
+        service = ScoringService.__new__(ScoringService)
+        changed_student, other_student = uuid.uuid4(), uuid.uuid4()
+        course_id, project_id = uuid.uuid4(), uuid.uuid4()
+        calls = {}
+
+        def collector(source_type):
+            def collect(student_ids, source_ids=None):
+                calls[source_type] = (set(student_ids), set(source_ids))
+                return {
+                    student_id: [Evidence(source_type, str(source_id), 'skill', 'Skill', 0.5, None, '')
+                                 for source_id in source_ids]
+                    for student_id in (changed_student, other_student)
+                }
+            return collect
+
+        monkeypatch.setattr(service, '_collect_courses', collector('course'))
+        monkeypatch.setattr(service, '_collect_projects', collector('project'))
+        changes = [
+            SimpleNamespace(student_id=changed_student, source_type='course', source_id=course_id),
+            SimpleNamespace(student_id=other_student, source_type='project', source_id=project_id)
+        ]
+
+        evidence = service.collect_changed_evidence(changes)
+
+        assert calls == {
+            'course': ({changed_student}, {course_id}),
+            'project': ({other_student}, {project_id})
+        }
+        assert [e.source_id for e in evidence[changed_student]] == [str(course_id)]
+        assert [e.source_id for e in evidence[other_student]] == [str(project_id)]
+
+    def test_collect_batch_queries_per_chunk(self, monkeypatch):
+        """Each source is read once per chunk and grouped per student"""
+        monkeypatch.setenv('EVIDENCE_BATCH_SIZE', '2')
+        service = ScoringService.__new__(ScoringService)
+        student_ids = [uuid.uuid4() for _ in range(5)]
+        calls = []
+
+        def collector(source):
+            def collect(chunk):
+                calls.append((source, list(chunk)))
+                return {chunk[0]: [Evidence(source, 'id', 'skill-1', 'Python', 0.5, None, '')]}
+            return collect
+
+        for source in ('projects', 'certifications', 'courses', 'internships', 'assessments'):
+            monkeypatch.setattr(service, f'_collect_{source}', collector(source))
+
+        evidence = service.collect_all_evidence_batch(student_ids)
+
+        assert len(calls) == 15
+        assert [chunk for source, chunk in calls if source == 'projects'] == [
+            student_ids[0:2], student_ids[2:4], student_ids[4:]
+        ]
+        assert [e.source_type for e in evidence[student_ids[0]]] == [
+            'projects', 'certifications', 'courses', 'internships', 'assessments'
+        ]
+        assert evidence[student_ids[1]] == []
+
+
+@pytest.mark.unit
+class TestScoringKernel:
+    NOW = datetime(2026, 6, 15, 12, 30)
+
+    @staticmethod
+    def reference_score(service, evidence_list, now):
+        """Per-item loop the kernel replaces"""
+        total_score = total_weight = 0.0
+        for evidence in evidence_list:
+            credibility = service.CREDIBILITY_WEIGHTS.get(evidence.source_type, 0.5)
+            if evidence.date:
+                months_old = (now - evidence.date).days / 30.0
+                decay = max(0.7, 1.0 - (months_old / 24.0) * 0.3)
+            else:
+                decay = 1.0
+            total_score += evidence.confidence * 100 * credibility * decay
+            total_weight += credibility
+        return min(100.0, total_score / total_weight if total_weight > 0 else 0.0)
+
+    def test_time_decay_matches_calculate_time_decay(self):
+        service = ScoringService.__new__(ScoringService)
+        now = datetime.now()
+        dates = [now - timedelta(days=d, hours=h) for d in (-40, -1, 0, 1, 29, 30, 365, 720, 2000) for h in (0, 5, 23)]
+        columns = pack_evidence(
+            {'s': [Evidence('project', 'x', 'k', 'K', 0.5, d, '') for d in dates + [None]]}, ['project']
+        )
+
+        decay = time_decay(columns.date_ticks, now)
+
+        assert decay.tolist() == [service.calculate_time_decay(d) for d in dates] + [1.0]
+
+    def test_scores_match_loop_exactly(self):
+        """Vectorized scores equal the sequential per-item sums bit for bit"""
+        service = ScoringService.__new__(ScoringService)
+        rng = np.random.default_rng(7)
+        sources = list(service.CREDIBILITY_WEIGHTS) + ['self-reported']
+        evidence_by_student = {
+            uuid.uuid4(): [
+                Evidence(
+                    sources[rng.integers(len(sources))], str(uuid.uuid4()), f'skill-{rng.integers(8)}',
+                    'Skill', round(float(rng.random()), 4),
+                    None if rng.random() < 0.1 else self.NOW - timedelta(minutes=int(rng.integers(-60_000, 2_000_000))),
+                    ''
+                )
+                for _ in range(int(rng.integers(0, 40)))
+            ]
+            for _ in range(300)
+        }
+
+        results = aggregate_evidence(evidence_by_student, service.CREDIBILITY_WEIGHTS, now=self.NOW)
+
+        assert list(results) == list(evidence_by_student)
+        for student_id, evidence_list in evidence_by_student.items():
+            by_skill = {}
+            for evidence in evidence_list:
+                by_skill.setdefault(evidence.skill_id, []).append(evidence)
+            assert set(results[student_id]) == set(by_skill)
+            for skill_id, skill_evidence in by_skill.items():
+                result = results[student_id][skill_id]
+                assert result['score'] == self.reference_score(service, skill_evidence, self.NOW)
+                assert result['evidence_count'] == len(skill_evidence)
+                dated = [e.date for e in skill_evidence if e.date]
+                assert result['last_updated'] == (max(dated) if dated else None)
+                assert result['sources'] == {
+                    source: round(max(e.confidence for e in skill_evidence if e.source_type == source) * 100, 1)
+                    for source in {e.source_type for e in skill_evidence} if source in service.CREDIBILITY_WEIGHTS
+                }
+
+
+@pytest.fixture
+def db_scoring(sqlite_db, monkeypatch):
+    """ScoringService on an in-memory database, without NLP models"""
+    for name in ('get_semantic_model', 'get_text_preprocessor', 'get_embedding_batcher'):
+        monkeypatch.setattr(extraction_module, name, lambda: None)
+    taxonomy_module.invalidate_taxonomy_snapshot()
+    yield ScoringService(sqlite_db)
+    taxonomy_module.invalidate_taxonomy_snapshot()
+
+
+def enroll(db, student, course_code, course_name):
+    """Enroll a student in a new course (mapped from its name on first read)"""
+    course = add_course(db, course_code, course_name=course_name)
+    db.add(StudentCourse(student_id=student.id, course_id=course.id))
+    db.commit()
+    return course
+
+
+@pytest.mark.unit
+class TestScoringDatabase:
+    def test_sync_drains_queued_changes(self, db_scoring):
+        """A first build consumes the changes queued by the student's records"""
+        db = db_scoring.db
+        student = add_student(db)
+        add_skill(db, 'Python')
+        enroll(db, student, 'CS101', 'Python Basics')
+        assert db.query(EvidenceChange).count() == 1
+
+        assert db_scoring.sync_evidence(student.id)
+
+        assert db.query(EvidenceChange).count() == 0
+        assert db.query(SkillEvidence).count() == 1
+        assert not db_scoring.sync_evidence(student.id)
+
+    def test_queued_enrollment_applied_incrementally(self, db_scoring):
+        db = db_scoring.db
+        student = add_student(db)
+        python, sql = add_skill(db, 'Python'), add_skill(db, 'SQL')
+        enroll(db, student, 'CS101', 'Python Basics')
+        db_scoring.sync_evidence(student.id)
+        db.query(SkillScoreChange).delete()
+        db.commit()
+
+        enroll(db, student, 'CS102', 'SQL Basics')
+
+        assert db_scoring.sync_evidence(student.id)
+        assert {e.skill_name for e in db_scoring.get_evidence(student.id)} == {'Python', 'SQL'}
+        assert {mark.skill_id for mark in db.query(SkillScoreChange)} == {sql.id}
+
+    def test_score_removed_with_last_evidence(self, db_scoring):
+        """Dropping the only course teaching a skill removes that skill's score"""
+        db = db_scoring.db
+        student = add_student(db)
+        python, sql = add_skill(db, 'Python'), add_skill(db, 'SQL')
+        enroll(db, student, 'CS101', 'Python Basics')
+        sql_course = enroll(db, student, 'CS102', 'SQL Basics')
+
+        assert db_scoring.update_dirty_scores([student.id]) == {student.id: {str(python.id), str(sql.id)}}
+        assert {row.skill_id for row in db.query(StudentSkill)} == {python.id, sql.id}
+
+        db.delete(db.query(StudentCourse).filter_by(course_id=sql_course.id).one())
+        db.commit()
+
+        assert db_scoring.update_dirty_scores([student.id]) == {student.id: {str(sql.id)}}
+        assert [row.skill_id for row in db.query(StudentSkill)] == [python.id]
+        assert db.query(SkillScoreChange).count() == 0
@@ -0,0 +1,58 @@
+"""
+Unit tests for SkillService skill aliases
+"""
+import pytest
+
+from models.database_models import SkillAlias
+from services.skill_service import SkillService
+from services.taxonomy_service import TaxonomySnapshot, invalidate_taxonomy_snapshot
+from tests.db_fixtures import sqlite_db, add_skill  # noqa: F401
+
+
+@pytest.fixture
+def alias_db(sqlite_db):
+    """Database with a Machine Learning skill; the shared snapshot is dropped around each test"""
+    invalidate_taxonomy_snapshot()
+    add_skill(sqlite_db, 'Machine  Learning')
+    yield sqlite_db
+    invalidate_taxonomy_snapshot()
+
+
+@pytest.mark.unit
+class TestSkillAliases:
+    def test_alias_stored_in_lookup_form(self, alias_db):
+        """Case and repeated whitespace are normalized like taxonomy lookups"""
+        skill = add_skill(alias_db, 'Kubernetes')
+
+        alias = SkillService.add_skill_alias(alias_db, skill.id, '  K8s   Cluster ')
+
+        assert (alias.alias, alias.alias_normalized) == ('K8s   Cluster', 'k8s cluster')
+        assert TaxonomySnapshot.load(alias_db).resolve('k8s cluster').id == skill.id
+
+    def test_alias_unique_after_normalization(self, alias_db):
+        skill = add_skill(alias_db, 'Kubernetes')
+        SkillService.add_skill_alias(alias_db, skill.id, 'K8s Cluster')
+
+        with pytest.raises(ValueError, match='already belongs'):
+            SkillService.add_skill_alias(alias_db, skill.id, 'k8s   CLUSTER')
+        assert alias_db.query(SkillAlias).count() == 1
+
+    @pytest.mark.parametrize('alias', ['machine learning', ' MACHINE\tLearning '])
+    def test_alias_cannot_equal_a_skill_name(self, alias_db, alias):
+        skill = add_skill(alias_db, 'Deep Learning')
+
+        with pytest.raises(ValueError, match='already a skill name'):
+            SkillService.add_skill_alias(alias_db, skill.id, alias)
+
+    def test_wildcards_in_alias_are_literal(self, alias_db):
+        skill = add_skill(alias_db, 'Deep Learning')
+
+        alias = SkillService.add_skill_alias(alias_db, skill.id, 'machine_learning')
+
+        assert alias.alias_normalized == 'machine_learning'
+
+    def test_blank_alias_rejected(self, alias_db):
+        skill = add_skill(alias_db, 'Kubernetes')
+
+        with pytest.raises(ValueError, match='empty'):
+            SkillService.add_skill_alias(alias_db, skill.id, ' \t ')
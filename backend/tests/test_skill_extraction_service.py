@@ -0,0 +1,948 @@
+"""
+Unit tests for SkillExtractionService
+"""
+import pytest
+import os
+import numpy as np
+from types import SimpleNamespace
+import uuid
+import time
+
+import services.skill_extraction_service as extraction_module
+from services.skill_extraction_service import SkillExtractionService
+from services.skill_matchers import KeywordMatcher, FuzzyCandidateIndex
+import services.embedding_cache as embedding_cache_module
+from services.embedding_cache import SkillEmbeddingCache
+import services.extraction_cache as extraction_cache_module
+from services.extraction_cache import ExtractionCache
+from services.embedding_batcher import EmbeddingBatcher
+from services.vector_index import BruteForceIndex, IVFIndex, sync_index
+from services.embedding_quantization import QuantizedMatrix
+import services.text_preprocessor as text_preprocessor_module
+from services.text_preprocessor import TextPreprocessor
+from services.taxonomy_service import TaxonomySkill, TaxonomySnapshot, normalize_skill_name
+from services.certification_mapper import CertificationMapper
+from services.course_skill_mapper import CourseSkillMapper
+import services.taxonomy_service as taxonomy_module
+import spacy
+from spacy.language import Language
+from sqlalchemy import event
+from models.database_models import ExtractionCacheEntry
+from tests.db_fixtures import sqlite_db  # noqa: F401
+from concurrent.futures import ThreadPoolExecutor
+from fuzzywuzzy import fuzz
+
+
+class FakeSentenceTransformer:
+    """Bag-of-words encoder standing in for the sentence-transformer model"""
+
+    DIM = 64
+
+    def __init__(self, *args, **kwargs):
+        self.encode_calls = 0
+
+    def encode(self, texts, normalize_embeddings=False, **kwargs):
+        self.encode_calls += 1
+        matrix = np.zeros((len(texts), self.DIM), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                matrix[row, hash(word) % self.DIM] += 1.0
+        if normalize_embeddings:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = matrix / np.where(norms == 0, 1.0, norms)
+        return matrix
+
+
+def make_skill(name, description=None, aliases=()):
+    return SimpleNamespace(id=uuid.uuid4(), skill_name=name, description=description, aliases=aliases)
+
+
+def make_taxonomy_skill(name, aliases=()):
+    return TaxonomySkill(
+        id=uuid.uuid4(), skill_name=name, normalized_name=normalize_skill_name(name),
+        skill_category='Technical', description=None, benchmark_score=70, aliases=aliases
+    )
+
+
+@pytest.fixture
+def extraction_service(monkeypatch, tmp_path):
+    """Extraction service with an in-memory taxonomy and fake encoder"""
+    monkeypatch.setenv('EMBEDDING_CACHE_DIR', str(tmp_path))
+    fake_model = FakeSentenceTransformer()
+    monkeypatch.setattr(extraction_module, 'get_semantic_model', lambda: fake_model)
+    monkeypatch.setattr(extraction_module, 'get_embedding_batcher', lambda: None)
+
+    service = SkillExtractionService(db=None)
+    service._skill_cache = [
+        make_skill('Python', 'python programming'),
+        make_skill('Machine Learning', 'machine learning models'),
+        make_skill('Docker', 'docker containers'),
+    ]
+    return service
+
+
+@pytest.mark.unit
+class TestEmbeddingBatcher:
+    def test_concurrent_requests_share_one_encode(self):
+        """Requests arriving within the window are encoded together"""
+        model = FakeSentenceTransformer()
+        batcher = EmbeddingBatcher(model, window_ms=200, max_batch_size=4)
+        texts = ['python', 'docker', 'machine learning', 'sql']
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda text: batcher.encode([text]), texts))
+
+        expected = model.encode(texts, normalize_embeddings=True)
+        for text_index, result in enumerate(results):
+            assert np.allclose(result[0], expected[text_index])
+
+        metrics = batcher.get_metrics()
+        assert metrics['requests'] == 4
+        assert metrics['batches'] < 4
+        assert metrics['max_batch_size'] <= 4
+
+    def test_encode_errors_reach_the_caller(self):
+        """A failing model call raises in every waiting caller"""
+        class BrokenModel:
+            def encode(self, texts, **kwargs):
+                raise RuntimeError('model failed')
+
+        batcher = EmbeddingBatcher(BrokenModel(), window_ms=1)
+
+        with pytest.raises(RuntimeError):
+            batcher.encode(['python'])
+
+
+def clustered_vectors(count, dim=32, clusters=20, seed=0):
+    """Normalized vectors grouped around random centres"""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dim))
+    vectors = centres[rng.integers(clusters, size=count)] + 0.3 * rng.normal(size=(count, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+@pytest.mark.unit
+class TestVectorIndex:
+    def test_brute_force_returns_exact_neighbours(self):
+        """Brute force results match a full sort of the similarities"""
+        vectors = clustered_vectors(200)
+        index = BruteForceIndex(list(range(200)), vectors)
+
+        scores, positions = index.search(vectors[:5], k=3)
+
+        expected = np.argsort(-(vectors[:5] @ vectors.T), axis=1)[:, :3]
+        assert np.array_equal(positions, expected)
+        assert np.allclose(scores[:, 0], 1.0, atol=1e-5)
+
+    def test_ivf_recall_against_brute_force(self):
+        """IVF finds most of the exact top-10 neighbours"""
+        vectors = clustered_vectors(3000)
+        queries = clustered_vectors(50, seed=1)
+        exact = BruteForceIndex(list(range(3000)), vectors).search(queries, 10)[1]
+        approximate = IVFIndex(list(range(3000)), vectors, n_probe=8).search(queries, 10)[1]
+
+        recall = np.mean([len(set(a) & set(e)) / 10 for a, e in zip(approximate, exact)])
+
+        assert recall >= 0.9
+
+    def test_sync_index_adds_new_keys_incrementally(self):
+        """Added vectors are appended without rebuilding the index"""
+        vectors = clustered_vectors(100)
+        index = sync_index(None, list(range(80)), vectors[:80])
+
+        updated = sync_index(index, list(range(100)), vectors)
+
+        assert updated is index
+        assert len(updated) == 100
+        assert updated.search(vectors[95:96], 1)[1][0, 0] == 95
+
+    def test_add_leaves_searched_state_untouched(self):
+        """Searches racing add() see whole snapshots and valid positions"""
+        vectors = clustered_vectors(1200)
+        index = IVFIndex(list(range(400)), vectors[:400], n_probe=4)
+        old_vectors, old_lists = index._state
+        old_sizes = [len(rows) for rows in old_lists]
+
+        def search_repeatedly(_):
+            for _ in range(50):
+                positions = index.search(vectors[:8], 5)[1]
+                assert positions.max() < len(index.keys)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            searches = [pool.submit(search_repeatedly, n) for n in range(3)]
+            for start in range(400, 1200, 100):
+                index.add(list(range(start, start + 100)), vectors[start:start + 100])
+            for search in searches:
+                search.result()
+
+        assert len(old_vectors) == 400
+        assert [len(rows) for rows in old_lists] == old_sizes
+        assert index.search(vectors[1100:1101], 1)[1][0, 0] == 1100
+
+    def test_sync_index_rebuilds_when_keys_are_removed(self):
+        """Removed or changed vectors force a rebuild"""
+        vectors = clustered_vectors(100)
+        index = sync_index(None, list(range(100)), vectors)
+
+        updated = sync_index(index, list(range(50)), vectors[:50])
+
+        assert updated is not index
+        assert len(updated) == 50
+
+
+@pytest.fixture
+def blank_preprocessor():
+    """Preprocessor on a tokenizer-only spaCy pipeline"""
+    preprocessor = TextPreprocessor()
+    preprocessor.nlp = spacy.blank('en')
+    # A blank pipeline has no parser, so noun chunks are unavailable
+    preprocessor._technical_terms_from_doc = lambda doc: sorted({t.text for t in doc if len(t.text) > 4})
+    return preprocessor
+
+
+# Components of the packaged English pipelines, in pipeline order
+MODEL_COMPONENTS = ('tok2vec', 'tagger', 'parser', 'attribute_ruler', 'lemmatizer', 'ner')
+
+
+@Language.factory('recording_stub')
+def make_recording_stub(nlp, name):
+    """Pass-through component that records each document it processes"""
+    def component(doc):
+        doc.user_data.setdefault('components', []).append(name)
+        return doc
+    return component
+
+
+@pytest.fixture
+def stub_pipeline_preprocessor(monkeypatch):
+    """Preprocessor loaded through spacy.load with stand-in model components"""
+    load_calls = []
+
+    def load(name, exclude=()):
+        load_calls.append((name, list(exclude)))
+        nlp = spacy.blank('en')
+        for component in MODEL_COMPONENTS:
+            if component not in exclude:
+                nlp.add_pipe('recording_stub', name=component)
+        return nlp
+
+    monkeypatch.setattr(text_preprocessor_module.spacy, 'load', load)
+    preprocessor = TextPreprocessor()
+    # Stub components produce no parse, so noun chunks are unavailable
+    preprocessor._technical_terms_from_doc = lambda doc: sorted(
+        {t.text for t in doc if len(t.text) > 4} | set(doc.user_data['components'])
+    )
+    preprocessor.load_calls = load_calls
+    return preprocessor
+
+
+PREPROCESS_TEXTS = [
+    "- Built REST APIs in Python\n- Deployed with Docker",
+    "Trained machine learning models",
+    "1. SQL reporting 2. Tableau dashboards",
+    "",
+    "• Led a team of 4 • Shipped C++ and C# services on https://example.com",
+]
+
+
+@pytest.mark.unit
+class TestTextPreprocessor:
+    def test_lemmatizer_excluded_from_loaded_pipeline(self, stub_pipeline_preprocessor):
+        """The lemmatizer is never loaded; the parser stays for noun chunks"""
+        nlp = stub_pipeline_preprocessor.nlp
+
+        assert [exclude for _, exclude in stub_pipeline_preprocessor.load_calls] == [['lemmatizer']]
+        assert 'lemmatizer' not in nlp.pipe_names
+        assert {'tagger', 'parser', 'ner'} <= set(nlp.pipe_names)
+
+    def test_tokenize_runs_no_pipeline_components(self, stub_pipeline_preprocessor, monkeypatch):
+        """Tokens come from the tokenizer alone and match a full pipeline run"""
+        nlp = stub_pipeline_preprocessor.nlp
+        text = "built rest apis in python/flask - deployed on aws"
+        expected = [t.text for t in nlp(text)]
+        monkeypatch.setattr(Language, '__call__', lambda *args, **kwargs: pytest.fail('pipeline ran'))
+
+        assert stub_pipeline_preprocessor.tokenize(text) == expected
+
+    def test_tokenize_matches_full_pipeline(self, blank_preprocessor):
+        """Tokens match a full pipeline run"""
+        text = "built rest apis in python/flask - deployed on aws"
+
+        assert blank_preprocessor.tokenize(text) == [t.text for t in blank_preprocessor.nlp(text)]
+
+    @pytest.mark.parametrize('extract_bullets', [False, True])
+    @pytest.mark.parametrize('batch_size', [1, 2, 64])
+    def test_preprocess_many_matches_preprocess(self, stub_pipeline_preprocessor, extract_bullets, batch_size):
+        """Batched preprocessing returns the same output as one-by-one"""
+        preprocessor = stub_pipeline_preprocessor
+
+        batched = preprocessor.preprocess_many(PREPROCESS_TEXTS, extract_bullets=extract_bullets, batch_size=batch_size)
+
+        assert batched == [preprocessor.preprocess(t, extract_bullets=extract_bullets) for t in PREPROCESS_TEXTS]
+        # Technical terms come from a full pipeline run without the lemmatizer
+        assert all('parser' in result['technical_terms'] for result in batched)
+        assert not any('lemmatizer' in result['technical_terms'] for result in batched)
+
+    @pytest.mark.parametrize('batch_size', [1, 64])
+    def test_without_terms_the_pipeline_is_not_run(self, stub_pipeline_preprocessor, monkeypatch, batch_size):
+        """Callers that skip technical terms only pay for the tokenizer"""
+        preprocessor = stub_pipeline_preprocessor
+        with_terms = preprocessor.preprocess_many(PREPROCESS_TEXTS, extract_bullets=True, batch_size=batch_size)
+        monkeypatch.setattr(Language, '__call__', lambda *args, **kwargs: pytest.fail('pipeline ran'))
+        monkeypatch.setattr(Language, 'pipe', lambda *args, **kwargs: pytest.fail('pipeline ran'))
+
+        batched = preprocessor.preprocess_many(
+            PREPROCESS_TEXTS, extract_bullets=True, batch_size=batch_size, with_terms=False
+        )
+
+        assert batched == [
+            preprocessor.preprocess(t, extract_bullets=True, with_terms=False) for t in PREPROCESS_TEXTS
+        ]
+        assert batched == [{**result, 'technical_terms': None} for result in with_terms]
+
+
+@pytest.mark.unit
+class TestKeywordMatcher:
+    def test_finds_all_keywords_in_one_pass(self):
+        """Every keyword occurrence is reported with its offsets"""
+        matcher = KeywordMatcher([('python', 'py'), ('machine learning', 'ml'), ('learning', 'l')])
+
+        matches = matcher.find_all("python for machine learning and python scripting")
+
+        assert matches['py'] == [(0, 6), (32, 38)]
+        assert matches['ml'] == [(11, 27)]
+        assert matches['l'] == [(19, 27)]
+
+    def test_respects_word_boundaries(self):
+        """Keywords inside longer words do not match"""
+        matcher = KeywordMatcher([('java', 'java'), ('c', 'c')])
+
+        matches = matcher.find_all("javascript and c# developer")
+
+        assert 'java' not in matches
+        assert matches['c'] == [(15, 16)]
+
+    def test_matches_case_insensitively(self):
+        """Keywords and text are compared in lowercase"""
+        matcher = KeywordMatcher([('Docker', 'docker')])
+
+        assert matcher.find_all("Deployed with DOCKER") == {'docker': [(14, 20)]}
+
+
+@pytest.mark.unit
+class TestFuzzyCandidateIndex:
+    def test_shortlists_misspelled_names(self):
+        """Near-miss spellings survive pruning"""
+        index = FuzzyCandidateIndex([('Kubernetes', 'k8s'), ('Thermodynamics', 'thermo')])
+
+        candidates = {key for _, key in index.candidates("deployed services on a kubernets cluster")}
+
+        assert 'k8s' in candidates
+        assert 'thermo' not in candidates
+
+    def test_never_prunes_names_above_threshold(self):
+        """Every name scoring at or above the threshold is shortlisted"""
+        names = ['Machine Learning', 'Data Analysis', 'Web Development', 'SQL', 'Docker']
+        texts = [
+            "worked on machine lerning pipelines",
+            "data analsis of sensor readings with sql",
+            "frontend web developmnt in react",
+            "dockr images for deployment",
+        ]
+        index = FuzzyCandidateIndex([(name, name) for name in names], min_score=90)
+
+        for text in texts:
+            candidates = {key for _, key in index.candidates(text)}
+            for name in names:
+                if fuzz.partial_ratio(name.lower(), text) >= 90:
+                    assert name in candidates
+
+
+@pytest.mark.unit
+class TestSkillEmbeddingCache:
+    def test_reuses_rows_for_unchanged_skills(self, tmp_path):
+        """Only skills whose content changed are re-encoded"""
+        model = FakeSentenceTransformer()
+        encoded = []
+
+        def encode(texts):
+            encoded.append(list(texts))
+            return model.encode(texts, normalize_embeddings=True)
+
+        cache = SkillEmbeddingCache('fake-model', cache_dir=str(tmp_path))
+        keys = [cache.row_key(str(i), name, None) for i, name in enumerate(['Python', 'SQL', 'Docker'])]
+        first = cache.get_embeddings(keys, ['python', 'sql', 'docker'], encode)
+
+        changed_keys = keys[:2] + [cache.row_key('2', 'Docker', 'containers')]
+        second = cache.get_embeddings(changed_keys, ['python', 'sql', 'docker containers'], encode)
+
+        assert encoded == [['python', 'sql', 'docker'], ['docker containers']]
+        assert np.allclose(first[:2], second[:2])
+        assert cache.last_build == (1, 2)
+
+    def test_superseded_files_are_pruned(self, tmp_path):
+        """Publishing a taxonomy deletes earlier files and drops their mappings"""
+        model = FakeSentenceTransformer()
+        encode = lambda texts: model.encode(texts, normalize_embeddings=True)
+        cache = SkillEmbeddingCache('fake-model', cache_dir=str(tmp_path), storage_dtype='int8')
+        keys = [cache.row_key(str(i), name, None) for i, name in enumerate(['Python', 'SQL'])]
+        cache.get_embeddings(keys, ['python', 'sql'], encode)
+
+        for name in ['Docker', 'Kubernetes']:
+            keys = keys + [cache.row_key(str(len(keys)), name, None)]
+            matrix = cache.get_embeddings(keys, ['skill'] * len(keys), encode)
+
+        current = cache.taxonomy_key(keys)
+        assert sorted(os.listdir(cache.directory)) == sorted(
+            [f'{current}.npy', f'{current}.json', f'{current}.scales.npy', 'latest.json']
+        )
+        assert embedding_cache_module._loaded_matrices[cache.directory] == (cache._paths(current)[0], matrix)
+        assert cache.get_embeddings(keys, ['skill'] * len(keys), encode) is matrix
+
+    def test_loads_persisted_matrix_without_encoding(self, tmp_path):
+        """A matrix written by one cache instance is reused by another"""
+        model = FakeSentenceTransformer()
+        keys = [SkillEmbeddingCache.row_key('1', 'Python', None)]
+        SkillEmbeddingCache('fake-model', cache_dir=str(tmp_path)).get_embeddings(
+            keys, ['python'], lambda texts: model.encode(texts, normalize_embeddings=True)
+        )
+
+        def fail(texts):
+            raise AssertionError("should not encode")
+
+        matrix = SkillEmbeddingCache('fake-model', cache_dir=str(tmp_path)).get_embeddings(keys, ['python'], fail)
+
+        assert matrix.shape == (1, FakeSentenceTransformer.DIM)
+
+
+    @pytest.mark.parametrize('dtype', ['float16', 'int8'])
+    def test_quantized_storage_round_trips(self, tmp_path, dtype):
+        """Quantized matrices are persisted compactly and reused without re-encoding"""
+        model = FakeSentenceTransformer()
+        keys = [SkillEmbeddingCache.row_key(str(i), name, None) for i, name in enumerate(['Python', 'SQL'])]
+        texts = ['python programming', 'sql queries']
+        first = SkillEmbeddingCache('fake-model', str(tmp_path), storage_dtype=dtype).get_embeddings(
+            keys, texts, lambda t: model.encode(t, normalize_embeddings=True)
+        )
+
+        def fail(texts):
+            raise AssertionError("should not encode")
+
+        second = SkillEmbeddingCache('fake-model', str(tmp_path), storage_dtype=dtype).get_embeddings(
+            keys, texts, fail
+        )
+
+        assert first.dtype == second.dtype == dtype
+        assert np.allclose(second[:], model.encode(texts, normalize_embeddings=True), atol=1e-2)
+
+
+@pytest.mark.unit
+class TestExtractionCache:
+    OPTIONS = {'min_confidence': 0.6, 'mode': 'full'}
+
+    def test_put_many_writes_in_one_commit(self, sqlite_db, monkeypatch):
+        """A batch of results is persisted with one lookup and one commit"""
+        monkeypatch.setenv('EXTRACTION_CACHE_PERSIST', 'True')
+        commits = []
+        event.listen(sqlite_db.get_bind(), 'commit', lambda conn: commits.append(conn))
+        cache = ExtractionCache(sqlite_db, 'taxonomy-1', 'extractor-1')
+        entries = [(f"text {n}", 'project', [{'skill_name': f'Skill {n}'}]) for n in range(20)]
+
+        cache.put_many(entries, self.OPTIONS)
+        cache.put_many([('text 0', 'project', [])], self.OPTIONS)
+        extraction_cache_module.clear_memory_cache()
+
+        assert len(commits) == 2
+        assert sqlite_db.query(ExtractionCacheEntry).count() == 20
+        assert cache.get('text 0', 'project', self.OPTIONS) == []
+        assert cache.get('text 7', 'project', self.OPTIONS) == [{'skill_name': 'Skill 7'}]
+
+    def test_batch_extraction_writes_cache_once(self, extraction_service, monkeypatch):
+        writes = []
+        monkeypatch.setattr(ExtractionCache, 'put', lambda *args: writes.append('put'))
+        monkeypatch.setattr(ExtractionCache, 'put_many', lambda self, entries, options: writes.append(len(entries)))
+        items = [("Shipped services with Docker", 'internship'), ("Python scripts", 'project')] * 2
+        extraction_cache_module.clear_memory_cache()
+
+        extraction_service.extract_skills_batch(items, use_cache=True)
+
+        assert writes == [2]
+
+
+@pytest.mark.unit
+class TestEmbeddingQuantization:
+    @pytest.mark.parametrize('dtype,tolerance', [('float16', 1e-3), ('int8', 1e-2)])
+    def test_dot_matches_float32(self, dtype, tolerance):
+        """Quantized inner products stay close to full precision"""
+        vectors = clustered_vectors(500)
+        queries = clustered_vectors(10, seed=1)
+        quantized = QuantizedMatrix.quantize(vectors, dtype)
+
+        assert np.abs(quantized.dot(queries) - queries @ vectors.T).max() < tolerance
+        assert quantized.nbytes < vectors.nbytes
+
+    def test_int8_index_search(self):
+        """Indexes search int8 storage directly"""
+        vectors = clustered_vectors(300)
+        index = BruteForceIndex(list(range(300)), QuantizedMatrix.quantize(vectors, 'int8'))
+
+        positions = index.search(vectors[:5], 1)[1]
+
+        assert list(positions[:, 0]) == [0, 1, 2, 3, 4]
+
+    def test_extraction_with_int8_storage(self, extraction_service, monkeypatch):
+        """Semantic matching works end to end on int8 skill embeddings"""
+        monkeypatch.setenv('EMBEDDING_STORAGE_DTYPE', 'int8')
+
+        scores = extraction_service._semantic_match("docker containers")
+
+        assert extraction_service._get_skill_embeddings()[1].dtype == 'int8'
+        assert str(extraction_service._skill_cache[2].id) in scores
+
+
+@pytest.mark.unit
+class TestTaxonomySnapshot:
+    def test_resolve_name_alias_and_fragment(self):
+        """Names and aliases resolve by lookup, fragments by substring"""
+        snapshot = TaxonomySnapshot([
+            make_taxonomy_skill('Machine Learning', aliases=('ml',)),
+            make_taxonomy_skill('Python'),
+        ])
+        ml, python = sorted(snapshot.skills, key=lambda s: s.skill_name)
+
+        assert snapshot.resolve('  PYTHON ') is python
+        assert snapshot.resolve('ML') is ml
+        assert snapshot.resolve('learning') is ml
+        assert snapshot.resolve('Rust') is None
+        assert snapshot.get(str(ml.id)) is ml
+
+    def test_misses_are_memoized(self):
+        """A name that matches nothing is only scanned for once"""
+        snapshot = TaxonomySnapshot([make_taxonomy_skill('Python')])
+
+        assert snapshot.resolve('Rust') is None
+        assert 'rust' in snapshot._resolved
+        assert snapshot.resolve('rust') is None
+
+    def test_version_tracks_aliases(self):
+        """Adding an alias yields a new taxonomy version"""
+        skill = make_taxonomy_skill('Python')
+        aliased = TaxonomySkill(**{**skill.__dict__, 'aliases': ('py',)})
+
+        assert TaxonomySnapshot([skill]).version != TaxonomySnapshot([aliased]).version
+
+    def test_snapshot_shared_until_invalidated(self, monkeypatch):
+        """The snapshot is loaded once per process and reloaded after invalidation"""
+        loads = []
+
+        def load(db):
+            loads.append(db)
+            return TaxonomySnapshot([make_taxonomy_skill('Python')])
+
+        monkeypatch.setattr(TaxonomySnapshot, 'load', staticmethod(load))
+        taxonomy_module.invalidate_taxonomy_snapshot()
+
+        first = taxonomy_module.get_taxonomy_snapshot(None)
+        assert taxonomy_module.get_taxonomy_snapshot(None) is first
+        assert len(loads) == 1
+
+        taxonomy_module.invalidate_taxonomy_snapshot()
+        assert taxonomy_module.get_taxonomy_snapshot(None) is not first
+        assert len(loads) == 2
+        taxonomy_module.invalidate_taxonomy_snapshot()
+
+    def test_mapper_resolves_through_snapshot(self, monkeypatch):
+        """Certification mapping issues no skill queries of its own"""
+        snapshot = TaxonomySnapshot([
+            make_taxonomy_skill('Amazon Web Services', aliases=('aws',)),
+            make_taxonomy_skill('Cloud Computing'),
+        ])
+        monkeypatch.setattr(taxonomy_module, '_snapshot', snapshot)
+
+        matches = CertificationMapper(db=None).map_certification('AWS Certified Solutions Architect')
+
+        assert {m['skill_name'] for m in matches} == {'Cloud Computing', 'Amazon Web Services'}
+
+
+@pytest.mark.unit
+class TestCertificationMapper:
+    @pytest.fixture
+    def mapper(self, monkeypatch):
+        names = {name for m in CertificationMapper.CERT_MAPPINGS for name in m.skill_names}
+        snapshot = TaxonomySnapshot([make_taxonomy_skill(name) for name in sorted(names)])
+        monkeypatch.setattr(taxonomy_module, '_snapshot', snapshot)
+        return CertificationMapper(db=None)
+
+    @staticmethod
+    def naive_similarities(title):
+        return {
+            index: fuzz.partial_ratio(mapping.cert_pattern, title.lower())
+            for index, mapping in enumerate(CertificationMapper.CERT_MAPPINGS)
+        }
+
+    def test_pattern_index_keeps_every_match(self, mapper):
+        """Pruned scoring finds the same patterns as scoring every pattern"""
+        titles = [
+            'AWS Certified Solutions Architect - Associate', 'Certified Scrum Master',
+            'PMP', 'Google Data Analytics Professional Certificate', 'Agile Foundations',
+            'Microsoft Azure Fundamentals AZ-900', 'Cisco CCNA', 'Oracle Java SE 11 Developer',
+            'Certified Kubernetes Administrator', 'Deep Learning Specialization', 'Tally ERP',
+        ]
+        for title in titles:
+            expected = {
+                index for index, similarity in self.naive_similarities(title).items()
+                if similarity >= CertificationMapper.MATCH_THRESHOLD
+            }
+            found = {
+                CertificationMapper.CERT_MAPPINGS.index(mapping)
+                for mapping, _ in mapper._score_title(title.lower())
+            }
+            assert found == expected, title
+
+    def test_batch_matches_single_mapping(self, mapper):
+        """Batch results equal per-certification results, in input order"""
+        certifications = [
+            ('AWS Certified Solutions Architect', 'Amazon Web Services'),
+            ('Certified Scrum Master', None),
+            ('AWS Certified Solutions Architect', 'Udemy'),
+            ('', 'Google'),
+            ('Certified Scrum Master', 'Scrum Alliance'),
+        ]
+
+        batch = mapper.map_certifications(certifications)
+
+        assert batch == [mapper.map_certification(title, provider) for title, provider in certifications]
+        assert batch[3] == []
+        assert batch[0][0]['confidence'] > batch[2][0]['confidence']
+
+    def test_reputable_providers(self, mapper):
+        assert mapper._is_reputable_provider('Red Hat Academy')
+        assert mapper._is_reputable_provider('AWS Training')
+        assert not mapper._is_reputable_provider('Local Institute')
+
+
+@pytest.mark.unit
+class TestCourseSkillMapper:
+    @pytest.fixture
+    def mapper(self, monkeypatch):
+        snapshot = TaxonomySnapshot([make_taxonomy_skill('Programming'), make_taxonomy_skill('Algorithms')])
+        monkeypatch.setattr(taxonomy_module, '_snapshot', snapshot)
+        return CourseSkillMapper(db=None)
+
+    @staticmethod
+    def make_course(**fields):
+        values = {'id': uuid.uuid4(), 'course_code': 'CS101', 'course_name': 'Data Structures', 'syllabus_url': None}
+        values.update(fields)
+        return SimpleNamespace(**values)
+
+    def test_mappings_current_until_course_changes(self, mapper):
+        """Stored mappings stay valid until the course fields change"""
+        course = self.make_course()
+        sync = SimpleNamespace(rules_version=mapper.get_rules_version(), source_hash=mapper.get_source_hash(course))
+
+        assert mapper.is_current(course, sync)
+        assert not mapper.is_current(course, None)
+        assert not mapper.is_current(self.make_course(course_name='Operating Systems'), sync)
+        assert not mapper.is_current(self.make_course(syllabus_url='syllabi/cs101.pdf'), sync)
+
+    def test_rules_version_tracks_rules_and_taxonomy(self, mapper, monkeypatch):
+        """Changing the keyword table or the taxonomy invalidates every course"""
+        version = mapper.get_rules_version()
+        assert mapper.get_rules_version() == version
+
+        monkeypatch.setattr(CourseSkillMapper, 'KEYWORD_MAPPINGS', {'compiler': ['Programming']})
+        assert mapper.get_rules_version() != version
+
+        monkeypatch.undo()
+        monkeypatch.setattr(taxonomy_module, '_snapshot', TaxonomySnapshot([make_taxonomy_skill('Programming')]))
+        assert mapper.get_rules_version() != version
+
+
+@pytest.mark.unit
+class TestSkillExtractionService:
+    def test_full_mode_does_not_parse(self, extraction_service, stub_pipeline_preprocessor, monkeypatch):
+        """Extraction only needs cleaned text and bullets, never the spaCy pipeline"""
+        extraction_service.preprocessor = stub_pipeline_preprocessor
+        monkeypatch.setattr(Language, '__call__', lambda *args, **kwargs: pytest.fail('pipeline ran'))
+        monkeypatch.setattr(Language, 'pipe', lambda *args, **kwargs: pytest.fail('pipeline ran'))
+        text = "- Built Python services\n- Shipped Docker images"
+
+        single = extraction_service.extract_skills(text, source='project', use_cache=False)
+        batch = extraction_service.extract_skills_batch(
+            [(text, 'project'), ("Trained machine learning models", 'project')], use_cache=False
+        )
+
+        assert {m.skill_name for m in single} >= {'Python', 'Docker'}
+        assert [m.skill_name for m in batch[0]] == [m.skill_name for m in single]
+
+    def test_semantic_match_encodes_text_once(self, extraction_service):
+        """Semantic stage scores the whole taxonomy with one text encode"""
+        model = extraction_service.semantic_model
+        extraction_service._get_skill_embeddings()
+        calls_before = model.encode_calls
+
+        scores = extraction_service._semantic_match("docker containers")
+
+        assert model.encode_calls == calls_before + 1
+        docker = extraction_service._skill_cache[2]
+        assert str(docker.id) in scores
+        assert scores[str(docker.id)] >= SkillExtractionService.SEMANTIC_THRESHOLD
+
+    def test_semantic_match_respects_top_k(self, extraction_service):
+        """Only the top_k most similar skills are returned"""
+        scores = extraction_service._semantic_match(
+            "python programming machine learning models docker containers",
+            top_k=1
+        )
+
+        assert len(scores) <= 1
+
+    def test_aliases_are_exact_matches(self, extraction_service):
+        """An alias mention counts as an exact match reported as 'alias'"""
+        ml = extraction_service._skill_cache[1]
+        ml.aliases = ('ml',)
+
+        matches = extraction_service.extract_skills(
+            "built an ml pipeline in python", source='project', mode='fast', use_cache=False
+        )
+        by_id = {m.skill_id: m for m in matches}
+
+        assert by_id[str(ml.id)].match_type == 'alias'
+        assert by_id[str(ml.id)].confidence == pytest.approx(0.90)
+        assert by_id[str(extraction_service._skill_cache[0].id)].match_type == 'exact'
+
+    def test_skill_name_preferred_over_alias(self, extraction_service):
+        """Aliases change the taxonomy version; name mentions stay 'exact'"""
+        ml = extraction_service._skill_cache[1]
+        version = extraction_service.get_taxonomy_version()
+        ml.aliases = ('ml',)
+        extraction_service._taxonomy_version = None
+
+        mentions = extraction_service._exact_match("ml and machine learning")
+
+        assert extraction_service.get_taxonomy_version() != version
+        assert mentions[str(ml.id)] == (7, 23, False)
+
+    def test_long_documents_are_matched_per_window(self, extraction_service):
+        """A skill mentioned in one bullet of a long document is still found"""
+        orchestration = make_skill('Kubernetes Orchestration', 'container cluster orchestration')
+        extraction_service._skill_cache.append(orchestration)
+        filler = [f"- prepared weekly finance reporting summaries for team {n}" for n in range(20)]
+        text = ' '.join(filler[:10] + ['- container cluster orchestration'] + filler[10:])
+
+        whole_document = extraction_service._semantic_match(
+            extraction_service.preprocessor.clean_text(text)
+        )
+        matches = extraction_service.extract_skills(text, source='project', use_cache=False)
+        by_id = {m.skill_id: m for m in matches}
+
+        assert str(orchestration.id) not in whole_document
+        assert by_id[str(orchestration.id)].match_type == 'semantic'
+        assert by_id[str(orchestration.id)].evidence_text == 'container cluster orchestration'
+
+    def test_document_windows_are_capped(self, extraction_service):
+        """Very long documents are folded into at most MAX_SEMANTIC_WINDOWS windows"""
+        bullets = [f"built reporting pipeline number {n}" for n in range(200)]
+        cleaned = ' '.join(bullets)
+
+        windows = extraction_service._document_windows(cleaned, bullets)
+
+        assert len(windows) <= SkillExtractionService.MAX_SEMANTIC_WINDOWS
+        assert ' '.join(windows) == cleaned
+
+    def test_fast_mode_skips_fuzzy_and_semantic(self, extraction_service):
+        """Fast mode returns exact matches without touching the model"""
+        extraction_service.preprocessor = SimpleNamespace(
+            clean_text=extraction_service.preprocessor.clean_text
+        )
+        model = extraction_service.semantic_model
+
+        matches = extraction_service.extract_skills(
+            "Pythn scripts deployed with Docker containers",
+            source='project', use_cache=False, mode='fast'
+        )
+
+        assert [(m.skill_name, m.match_type) for m in matches] == [('Docker', 'exact')]
+        assert model.encode_calls == 0
+
+    def test_balanced_mode_adds_fuzzy_matches(self, extraction_service):
+        """Balanced mode finds misspellings that fast mode misses"""
+        text = "Wrote data pipelines in Pythonn"
+
+        fast = extraction_service.extract_skills(text, source='project', use_cache=False, mode='fast')
+        balanced = extraction_service.extract_skills(text, source='project', use_cache=False, mode='balanced')
+
+        assert fast == []
+        assert [(m.skill_name, m.match_type) for m in balanced] == [('Python', 'fuzzy')]
+
+    def test_deadline_skips_stages_that_do_not_fit(self, extraction_service, monkeypatch):
+        """Stages expected to overrun the budget are skipped and flagged"""
+        monkeypatch.setattr(extraction_module, '_stage_costs', {'fuzzy': 0.0, 'semantic': 10.0})
+        model = extraction_service.semantic_model
+
+        result = extraction_service.extract_skills_with_deadline(
+            "Python services deployed with docker containers",
+            source='project', deadline_ms=50, use_cache=False
+        )
+
+        assert result.degraded
+        assert result.skipped_stages == ['semantic']
+        assert {m.match_type for m in result.matches} == {'exact'}
+        assert model.encode_calls == 0
+
+    def test_deadline_cost_scales_with_text_length(self, extraction_service, monkeypatch):
+        """Stage costs are per character, so only long texts are priced out"""
+        monkeypatch.setattr(extraction_module, '_stage_costs', {'fuzzy': 0.0, 'semantic': 2e-5})
+        short = "Python services deployed with docker containers"
+        long = ' '.join([short] * 200)
+
+        assert not extraction_service.extract_skills_with_deadline(
+            short, source='project', deadline_ms=1000, use_cache=False
+        ).degraded
+        assert extraction_service.extract_skills_with_deadline(
+            long, source='project', deadline_ms=50, use_cache=False
+        ).skipped_stages == ['semantic']
+
+    def test_skipped_stage_is_probed_again(self, extraction_service, monkeypatch):
+        """One slow run (e.g. a cold start) does not disable a stage for good"""
+        text = "Python services deployed with docker containers"
+        monkeypatch.setattr(extraction_module, '_stage_costs', {'fuzzy': 0.0, 'semantic': 2.0 / len(text)})
+
+        results = [
+            extraction_service.extract_skills_with_deadline(text, source='project', deadline_ms=1000, use_cache=False)
+            for _ in range(6)
+        ]
+
+        # 2s decays by 20% per skip until it fits in 1s (0.82s), then the
+        # fast measured runs pull the average down further
+        assert [r.degraded for r in results] == [True] * 4 + [False] * 2
+        assert extraction_module._stage_costs['semantic'] * len(text) < 0.8 * 0.82
+
+    def test_semantic_stage_stops_between_window_batches(self, extraction_service, monkeypatch):
+        """Long documents stop encoding once the next batch would overrun"""
+        monkeypatch.setattr(extraction_module, '_stage_costs', {})
+        monkeypatch.setattr(SkillExtractionService, 'DEADLINE_WINDOW_BATCH', 2)
+        model = extraction_service.semantic_model
+        encode = model.encode
+
+        def slow_encode(texts, **kwargs):
+            time.sleep(0.05)
+            return encode(texts, **kwargs)
+
+        text = ' '.join(f"Project {n} used python and docker containers for machine learning." for n in range(60))
+        extraction_service._get_vector_index()
+        full_scores, full_evidence, complete = extraction_service._semantic_stage(text, time.perf_counter() + 60)
+        assert complete
+        assert (full_scores, full_evidence) == extraction_service._semantic_stage(text)[:2]
+
+        monkeypatch.setattr(model, 'encode', slow_encode)
+        model.encode_calls = 0
+        result = extraction_service.extract_skills_with_deadline(
+            text, source='project', deadline_ms=120, use_cache=False
+        )
+
+        assert result.skipped_stages == ['semantic']
+        assert 1 <= model.encode_calls < len(extraction_service._document_windows(text, None)) // 2
+
+    def test_without_deadline_matches_extract_skills(self, extraction_service, monkeypatch):
+        """An unbounded run is complete and identical to extract_skills"""
+        monkeypatch.setattr(extraction_module, '_stage_costs', {})
+        text = "Pythn data pipelines with docker containers and machine learning models"
+
+        result = extraction_service.extract_skills_with_deadline(text, source='project', use_cache=False)
+        expected = extraction_service.extract_skills(text, source='project', use_cache=False)
+
+        assert not result.degraded
+        assert result.skipped_stages == []
+        assert result.matches == expected
+
+    def test_unknown_mode_is_rejected(self, extraction_service):
+        """Unknown modes raise ValueError"""
+        with pytest.raises(ValueError):
+            extraction_service.extract_skills("python", source='project', mode='turbo')
+
+    def test_extract_skills_finds_exact_mentions(self, extraction_service):
+        """Exact mentions are returned with exact match type"""
+        matches = extraction_service.extract_skills(
+            "Built a REST API in Python and shipped it with Docker",
+            source='project'
+        )
+        names = {m.skill_name: m for m in matches}
+
+        assert 'Python' in names
+        assert names['Python'].match_type == 'exact'
+        assert 'Docker' in names
+
+    def test_exact_match_returns_first_offset(self, extraction_service):
+        """Exact stage reports where each skill is first mentioned"""
+        python = extraction_service._skill_cache[0]
+
+        mentions = extraction_service._exact_match("scripts in python and more python")
+
+        assert mentions[str(python.id)] == (11, 17, False)
+
+    def test_exact_matcher_rebuilt_when_taxonomy_changes(self, extraction_service):
+        """A new taxonomy version compiles a new matcher"""
+        matcher = extraction_service._get_exact_matcher()
+        assert extraction_service._get_exact_matcher() is matcher
+
+        extraction_service._skill_cache.append(make_skill('Kubernetes'))
+        extraction_service._taxonomy_version = None
+
+        assert extraction_service._get_exact_matcher() is not matcher
+
+    def test_repeat_extraction_served_from_cache(self, extraction_service, monkeypatch):
+        """Unchanged text is not preprocessed or matched again"""
+        text = "Data pipelines in Python"
+        first = extraction_service.extract_skills(text, source='project')
+
+        def fail(*args, **kwargs):
+            raise AssertionError("NLP pipeline should not run on a cache hit")
+
+        monkeypatch.setattr(extraction_service.preprocessor, 'preprocess', fail)
+        second = extraction_service.extract_skills(text, source='project')
+
+        assert second == first
+
+    def test_cache_invalidated_by_taxonomy_change(self, extraction_service):
+        """A taxonomy change produces fresh extraction results"""
+        text = "Orchestrated containers with Kubernetes"
+        before = extraction_service.extract_skills(text, source='project')
+
+        extraction_service._skill_cache.append(make_skill('Kubernetes'))
+        extraction_service._taxonomy_version = None
+        extraction_service._skill_embeddings = None
+        after = extraction_service.extract_skills(text, source='project')
+
+        assert 'Kubernetes' not in {m.skill_name for m in before}
+        assert 'Kubernetes' in {m.skill_name for m in after}
+
+    def test_batch_extraction_matches_single_extraction(self, extraction_service):
+        """Batch results equal per-document results, in input order"""
+        items = [
+            ("Trained machine learning models in Python", 'project'),
+            ("Shipped services with Docker", 'internship'),
+            ("", 'project'),
+            ("Trained machine learning models in Python", 'project'),
+        ]
+
+        batch = extraction_service.extract_skills_batch(items, use_cache=False)
+        single = [
+            extraction_service.extract_skills(text, source, use_cache=False)
+            for text, source in items
+        ]
+
+        assert batch == single
+
+    def test_batch_extraction_encodes_once(self, extraction_service):
+        """All uncached texts in a batch share one encode call"""
+        model = extraction_service.semantic_model
+        extraction_service._get_skill_embeddings()
+        calls_before = model.encode_calls
+
+        extraction_service.extract_skills_batch(
+            [("python scripts", 'project'), ("docker images", 'project'), ("sql reports", 'resume')],
+            use_cache=False
+        )
+
+        assert model.encode_calls == calls_before + 1
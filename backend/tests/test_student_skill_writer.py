@@ -0,0 +1,120 @@
+"""
+Unit tests for the bulk StudentSkill writer
+"""
+import pytest
+from types import SimpleNamespace
+from datetime import datetime
+import uuid
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+import services.student_skill_writer as writer_module
+from models.database_models import SkillAssessment, StudentSkill
+from services.skill_service import SkillService
+from services.student_skill_writer import SQLITE_MAX_PARAMS, UPSERT_COLUMNS, build_upsert, upsert_student_skills
+from tests.db_fixtures import sqlite_db, add_skill, add_student  # noqa: F401
+
+
+class FakeUpsertSession:
+    """Records the statements an upsert executes"""
+
+    def __init__(self, dialect_name):
+        self.dialect = SimpleNamespace(name=dialect_name)
+        self.statements = []
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=self.dialect)
+
+    def execute(self, statement):
+        self.statements.append(statement)
+
+
+@pytest.mark.unit
+class TestStudentSkillWriter:
+    @staticmethod
+    def make_rows(count):
+        return [
+            {'student_id': uuid.uuid4(), 'skill_id': uuid.uuid4(), 'raw_score': 80, 'weighted_score': 80.5,
+             'confidence_level': 0.4, 'evidence_sources': [{'type': 'project', 'score': 85.0}],
+             'last_updated': datetime(2026, 1, 1)}
+            for _ in range(count)
+        ]
+
+    @pytest.mark.parametrize('dialect', [postgresql.dialect(), sqlite.dialect()])
+    def test_upsert_updates_on_student_skill_conflict(self, dialect):
+        rows = [{'id': uuid.uuid4(), **row} for row in self.make_rows(2)]
+
+        sql = str(build_upsert(dialect.name, rows).compile(dialect=dialect))
+
+        assert 'ON CONFLICT (student_id, skill_id) DO UPDATE SET' in sql
+        for column in UPSERT_COLUMNS[2:]:
+            assert f'{column} = excluded.{column}' in sql
+        assert 'SET id' not in sql and ', id = ' not in sql
+
+    def test_one_statement_per_chunk(self, monkeypatch):
+        monkeypatch.setenv('STUDENT_SKILL_UPSERT_CHUNK_SIZE', '1000')
+        db = FakeUpsertSession('postgresql')
+
+        assert upsert_student_skills(db, self.make_rows(2500)) == 2500
+        assert [len(s.compile(dialect=postgresql.dialect()).params) // (len(UPSERT_COLUMNS) + 1)
+                for s in db.statements] == [1000, 1000, 500]
+        assert upsert_student_skills(db, []) == 0
+
+    def test_sqlite_chunks_fit_parameter_limit(self, monkeypatch):
+        monkeypatch.setenv('STUDENT_SKILL_UPSERT_CHUNK_SIZE', '1000')
+        db = FakeUpsertSession('sqlite')
+
+        assert upsert_student_skills(db, self.make_rows(300)) == 300
+        assert all(len(s.compile(dialect=sqlite.dialect()).params) <= SQLITE_MAX_PARAMS for s in db.statements)
+        assert len(db.statements) == 3
+
+    @pytest.mark.parametrize('native_upsert', [True, False])
+    def test_upsert_round_trip_on_sqlite(self, sqlite_db, monkeypatch, native_upsert):
+        """Existing pairs are updated in place, new pairs inserted, across chunks"""
+        monkeypatch.setattr(writer_module, 'supports_upsert', lambda dialect_name: native_upsert)
+        rows = self.make_rows(300)
+        upsert_student_skills(sqlite_db, rows)
+        sqlite_db.commit()
+        ids = {(r.student_id, r.skill_id): r.id for r in sqlite_db.query(StudentSkill)}
+
+        changed = [{**row, 'raw_score': 55, 'evidence_sources': []} for row in rows[:150]]
+        assert upsert_student_skills(sqlite_db, changed + self.make_rows(10)) == 160
+        sqlite_db.commit()
+
+        stored = {(r.student_id, r.skill_id): r for r in sqlite_db.query(StudentSkill)}
+        assert len(stored) == 310
+        assert all(stored[key].id == row_id for key, row_id in ids.items())
+        assert {stored[(r['student_id'], r['skill_id'])].raw_score for r in changed} == {55}
+        assert stored[(rows[200]['student_id'], rows[200]['skill_id'])].raw_score == 80
+        assert stored[(rows[0]['student_id'], rows[0]['skill_id'])].evidence_sources == []
+
+
+@pytest.mark.unit
+class TestCreateStudentSkill:
+    def test_repeat_writes_update_the_same_row(self, sqlite_db):
+        """A second score for the pair updates its row instead of hitting the unique constraint"""
+        student, skill = add_student(sqlite_db), add_skill(sqlite_db, 'Python')
+
+        first = SkillService.create_student_skill(sqlite_db, student.id, skill.id, [{'type': 'quiz', 'score': 50}])
+        first_id = first.id
+        second = SkillService.create_student_skill(sqlite_db, student.id, skill.id, [
+            {'type': 'quiz', 'score': 100}, {'type': 'project', 'score': 100}
+        ])
+
+        assert sqlite_db.query(StudentSkill).count() == 1
+        assert second is first and second.id == first_id
+        assert (second.raw_score, float(second.weighted_score), float(second.confidence_level)) == (97, 97.5, 0.4)
+
+    def test_recalculate_from_assessments(self, sqlite_db):
+        student, skill = add_student(sqlite_db), add_skill(sqlite_db, 'Python')
+        sqlite_db.add_all([
+            SkillAssessment(student_id=student.id, skill_id=skill.id, assessment_type='quiz', score=score)
+            for score in (40, 90)
+        ])
+        sqlite_db.commit()
+
+        SkillService.recalculate_student_skill(sqlite_db, student.id, skill.id)
+        updated = SkillService.recalculate_student_skill(sqlite_db, student.id, skill.id)
+
+        assert sqlite_db.query(StudentSkill).one() is updated
+        assert [source['score'] for source in updated.evidence_sources] == [40, 90]
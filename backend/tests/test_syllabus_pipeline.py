@@ -0,0 +1,202 @@
+"""
+Unit tests for the syllabus pipeline and syllabus skill matching
+"""
+import pytest
+import io
+from types import SimpleNamespace
+import uuid
+
+import services.syllabus_pipeline as syllabus_module
+import services.skill_extraction_service as extraction_module
+import services.taxonomy_service as taxonomy_module
+from services.course_skill_mapper import CourseSkillMapper
+from services.file_storage_service import FileStorageService
+from services.taxonomy_service import TaxonomySkill, TaxonomySnapshot, normalize_skill_name
+from models.database_models import CourseSkill, CourseSkillSync, StudentCourse
+from services.scoring_service import ScoringService
+from tests.db_fixtures import sqlite_db, add_course, add_skill, add_student  # noqa: F401
+
+
+@pytest.fixture
+def taxonomy_db(sqlite_db):
+    """Database with a few skills and the taxonomy snapshot reloaded from it"""
+    for name in ('Programming', 'Algorithms', 'Docker', 'Kubernetes'):
+        add_skill(sqlite_db, name)
+    taxonomy_module.invalidate_taxonomy_snapshot()
+    yield sqlite_db
+    taxonomy_module.invalidate_taxonomy_snapshot()
+
+
+def syllabus_skills(db, course):
+    """Skill names the course's syllabus was mapped to"""
+    return {
+        mapping.skill.skill_name
+        for mapping in db.query(CourseSkill).filter(
+            CourseSkill.course_id == course.id, CourseSkill.match_type == 'syllabus_keyword'
+        )
+    }
+
+
+def make_taxonomy_skill(name, aliases=()):
+    return TaxonomySkill(
+        id=uuid.uuid4(), skill_name=name, normalized_name=normalize_skill_name(name),
+        skill_category='Technical', description=None, benchmark_score=70, aliases=aliases
+    )
+
+
+@pytest.mark.unit
+class TestSyllabusPipeline:
+    def test_text_pages_split_on_form_feeds(self, monkeypatch):
+        """Pages survive chunk boundaries, including inside multi-byte characters"""
+        monkeypatch.setattr(syllabus_module, 'CHUNK_SIZE', 3)
+        text = 'Unit 1: Python — basics\fUnit 2: Machine learning\fUnit 3: SQL'
+
+        pages = list(syllabus_module.iter_text_pages(io.BytesIO(text.encode('utf-8'))))
+
+        assert pages == text.split('\f')
+
+    def test_long_text_split_at_line_breaks(self, monkeypatch):
+        monkeypatch.setattr(syllabus_module, 'MAX_PAGE_CHARS', 30)
+        text = '\n'.join(f'topic number {n}' for n in range(10))
+
+        pages = list(syllabus_module.iter_text_pages(io.BytesIO(text.encode('utf-8'))))
+
+        assert ''.join(pages) == text
+        assert all(len(page) <= 30 for page in pages)
+
+    def test_syllabus_pages_match_keywords_and_aliases(self, monkeypatch):
+        """Keywords match as substrings (as before), aliases as whole words"""
+        names = {name for names in CourseSkillMapper.KEYWORD_MAPPINGS.values() for name in names}
+        skills = [make_taxonomy_skill(name) for name in sorted(names - {'Docker'})]
+        skills.append(make_taxonomy_skill('Docker', aliases=('containers',)))
+        monkeypatch.setattr(taxonomy_module, '_snapshot', TaxonomySnapshot(skills))
+        mapper = CourseSkillMapper(db=None)
+        pages = ['Week 1: digital circuitsim labs', 'Week 2: deploying with containers', 'maintainers']
+
+        matches = {m['skill_name']: m for m in mapper.map_syllabus_pages(pages)}
+        single = {m['skill_name'] for m in mapper._match_by_syllabus(' '.join(pages))}
+
+        assert {'Circuit Design', 'Electronics', 'Docker'} == set(matches) == single
+        assert matches['Docker']['evidence_text'] == 'Week 2: deploying with containers'
+
+    def test_syllabus_pages_match_skill_names(self, monkeypatch):
+        """Skill names match like aliases, without needing a course keyword"""
+        skills = [make_taxonomy_skill('Kubernetes'), make_taxonomy_skill('Apache Kafka', aliases=('kafka',))]
+        monkeypatch.setattr(taxonomy_module, '_snapshot', TaxonomySnapshot(skills))
+        mapper = CourseSkillMapper(db=None)
+
+        matches = mapper.map_syllabus_pages(['Unit 4: Deploying on KUBERNETES', 'Streams with Kafka'])
+
+        assert {m['skill_name'] for m in matches} == {'Kubernetes', 'Apache Kafka'}
+
+    def test_local_storage_round_trip(self, monkeypatch, tmp_path):
+        """Local storage stands in for the bucket, confined to its directory"""
+        monkeypatch.setenv('STORAGE_TYPE', 'local')
+        monkeypatch.setenv('LOCAL_STORAGE_DIR', str(tmp_path))
+        storage = FileStorageService()
+
+        result = storage.upload_file(io.BytesIO(b'syllabus'), 'cs101.txt', 'syllabi')
+        with storage.open_file(result['object_name']) as f:
+            assert f.read() == b'syllabus'
+
+        assert storage.object_name_from_url(f"s3://esr-documents/{result['object_name']}") == result['object_name']
+        assert [f['object_name'] for f in storage.list_files('syllabi/')] == [result['object_name']]
+        with pytest.raises(ValueError):
+            storage.open_file('../outside.txt')
+
+    def test_syllabus_matches_kept_only_for_same_course_fields(self, taxonomy_db):
+        """A remap keeps syllabus matches unless the syllabus URL may have changed"""
+        course = add_course(taxonomy_db, syllabus_url='syllabi/cs101-v1.txt')
+        mapper = CourseSkillMapper(taxonomy_db)
+        mapper.refresh_course_skills([course], syllabi={course.id: (['Deploying Docker images'], 'hash-1')})
+
+        assert mapper.refresh_course_skills([course], force=True) == 1
+        assert syllabus_skills(taxonomy_db, course) == {'Docker'}
+        assert taxonomy_db.get(CourseSkillSync, course.id).syllabus_hash == 'hash-1'
+
+        course.syllabus_url = 'syllabi/cs101-v2.txt'
+        taxonomy_db.commit()
+        assert mapper.refresh_course_skills([course]) == 1
+        assert syllabus_skills(taxonomy_db, course) == set()
+        assert taxonomy_db.get(CourseSkillSync, course.id).syllabus_hash is None
+
+    def test_ingest_downloads_each_syllabus_once(self, taxonomy_db, monkeypatch, tmp_path):
+        """One download per ingest hashes and parses; every stream is released"""
+        monkeypatch.setenv('STORAGE_TYPE', 'local')
+        monkeypatch.setenv('LOCAL_STORAGE_DIR', str(tmp_path))
+        storage = FileStorageService()
+        uploaded = storage.upload_file(io.BytesIO(b'Week 1: Docker\fWeek 2: Kubernetes'), 'cs101.txt', 'syllabi')
+        course = add_course(taxonomy_db, syllabus_url=uploaded['object_name'])
+        opened, closed = [], []
+        open_file, close_file = storage.open_file, storage.close_file
+        monkeypatch.setattr(storage, 'open_file', lambda name: opened.append(name) or open_file(name))
+        monkeypatch.setattr(storage, 'close_file', lambda stream: closed.append(stream) or close_file(stream))
+        pipeline = syllabus_module.SyllabusPipeline(taxonomy_db, storage)
+
+        assert pipeline.ingest_course(course)['pages'] == 2
+        assert pipeline.ingest_course(course)['status'] == 'unchanged'
+
+        assert len(opened) == len(closed) == 2
+        assert all(stream.closed for stream in closed)
+        assert syllabus_skills(taxonomy_db, course) == {'Docker', 'Kubernetes'}
+
+    def test_minio_stream_returns_connection(self):
+        """Closing a MinIO response releases its pooled connection"""
+        storage = FileStorageService.__new__(FileStorageService)
+        storage.storage_type = 'minio'
+        calls = []
+        stream = SimpleNamespace(close=lambda: calls.append('close'), release_conn=lambda: calls.append('release'))
+
+        storage.close_file(stream)
+
+        assert calls == ['close', 'release']
+
+    def test_ingest_updates_stored_course_evidence(self, taxonomy_db, monkeypatch, tmp_path):
+        """Enrolled students pick up skills from a newly ingested syllabus"""
+        for name in ('get_semantic_model', 'get_text_preprocessor', 'get_embedding_batcher'):
+            monkeypatch.setattr(extraction_module, name, lambda: None)
+        monkeypatch.setenv('STORAGE_TYPE', 'local')
+        monkeypatch.setenv('LOCAL_STORAGE_DIR', str(tmp_path))
+        storage = FileStorageService()
+        uploaded = storage.upload_file(io.BytesIO(b'Deploying with Kubernetes'), 'cs101.txt', 'syllabi')
+        student = add_student(taxonomy_db)
+        course = add_course(taxonomy_db, syllabus_url=uploaded['object_name'])
+        taxonomy_db.add(StudentCourse(student_id=student.id, course_id=course.id))
+        taxonomy_db.commit()
+        scoring = ScoringService(taxonomy_db)
+        before = {e.skill_name for e in scoring.get_evidence(student.id)}
+
+        syllabus_module.SyllabusPipeline(taxonomy_db, storage).ingest_course(course)
+        after = {e.skill_name for e in scoring.get_evidence(student.id)}
+
+        assert 'Kubernetes' not in before
+        assert after == before | {'Kubernetes'}
+
+    def test_reingest_after_taxonomy_change(self, sqlite_db, monkeypatch, tmp_path):
+        """Skills added after ingest are matched in the stored syllabus on re-ingest"""
+        for name in ('get_semantic_model', 'get_text_preprocessor', 'get_embedding_batcher'):
+            monkeypatch.setattr(extraction_module, name, lambda: None)
+        monkeypatch.setenv('STORAGE_TYPE', 'local')
+        monkeypatch.setenv('LOCAL_STORAGE_DIR', str(tmp_path))
+        add_skill(sqlite_db, 'Docker')
+        taxonomy_module.invalidate_taxonomy_snapshot()
+        storage = FileStorageService()
+        uploaded = storage.upload_file(io.BytesIO(b'Deploying Docker images on Kubernetes'), 'cs101.txt', 'syllabi')
+        student = add_student(sqlite_db)
+        course = add_course(sqlite_db, syllabus_url=uploaded['object_name'])
+        sqlite_db.add(StudentCourse(student_id=student.id, course_id=course.id))
+        sqlite_db.commit()
+        pipeline = syllabus_module.SyllabusPipeline(sqlite_db, storage)
+        assert pipeline.ingest_course(course)['status'] == 'mapped'
+        assert syllabus_skills(sqlite_db, course) == {'Docker'}
+
+        add_skill(sqlite_db, 'Kubernetes')
+        # Reading scores remaps the course under the new taxonomy, keeping
+        # the old syllabus matches
+        ScoringService(sqlite_db).get_evidence(student.id)
+        assert syllabus_skills(sqlite_db, course) == {'Docker'}
+
+        assert pipeline.ingest_course(course)['status'] == 'mapped'
+        assert syllabus_skills(sqlite_db, course) == {'Docker', 'Kubernetes'}
+        assert pipeline.ingest_course(course)['status'] == 'unchanged'
+        taxonomy_module.invalidate_taxonomy_snapshot()
@@ -92,7 +92,7 @@ echo -e "${GREEN}✓ Privileges granted${NC}"
 # Run schema
 echo "📐 Creating database schema..."
 psql -d "$DB_NAME" -f schema.sql > /dev/null
-echo -e "${GREEN}✓ Schema created (16 tables)${NC}"
+echo -e "${GREEN}✓ Schema created (22 tables)${NC}"
 
 # Seed skills
 echo "🧠 Seeding skills taxonomy (28 skills)..."
@@ -100,6 +100,12 @@ psql -d "$DB_NAME" -f seed_skills.sql > /dev/null
 SKILL_COUNT=$(psql -d "$DB_NAME" -tAc "SELECT COUNT(*) FROM skills;")
 echo -e "${GREEN}✓ Inserted $SKILL_COUNT skills${NC}"
 
+# Seed skill aliases
+echo "🔤 Seeding skill aliases..."
+psql -d "$DB_NAME" -f seed_skill_aliases.sql > /dev/null
+ALIAS_COUNT=$(psql -d "$DB_NAME" -tAc "SELECT COUNT(*) FROM skill_aliases;")
+echo -e "${GREEN}✓ Inserted $ALIAS_COUNT skill aliases${NC}"
+
 # Seed roles
 echo "💼 Seeding industry roles (15 roles)..."
 psql -d "$DB_NAME" -f seed_roles.sql > /dev/null
@@ -119,10 +125,10 @@ echo "================================"
 
 # Test 1: Check table count
 TABLE_COUNT=$(psql -d "$DB_NAME" -tAc "SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = 'public';")
-if [ "$TABLE_COUNT" -eq 16 ]; then
-    echo -e "${GREEN}✓ All 16 tables created${NC}"
+if [ "$TABLE_COUNT" -eq 22 ]; then
+    echo -e "${GREEN}✓ All 22 tables created${NC}"
 else
-    echo -e "${RED}❌ Expected 16 tables, found $TABLE_COUNT${NC}"
+    echo -e "${RED}❌ Expected 22 tables, found $TABLE_COUNT${NC}"
 fi
 
 # Test 2: Sample skills
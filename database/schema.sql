@@ -50,6 +50,15 @@ CREATE TABLE skills (
     created_at TIMESTAMP DEFAULT NOW()
 );
 
+-- Skill Aliases (abbreviations and synonyms matched like skill names)
+CREATE TABLE skill_aliases (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    skill_id UUID NOT NULL REFERENCES skills(id) ON DELETE CASCADE,
+    alias VARCHAR(100) NOT NULL, -- "k8s", "Postgres", "DSA"
+    alias_normalized VARCHAR(100) UNIQUE NOT NULL, -- lowercased alias; each alias names one skill
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
 -- Student Skills (Actual Scores)
 CREATE TABLE student_skills (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -193,6 +202,77 @@ CREATE TABLE skill_mapping_overrides (
     created_at TIMESTAMP DEFAULT NOW()
 );
 
+-- ================================================================
+-- CACHE TABLES
+-- ================================================================
+
+-- Skill Extraction Cache (NLP results keyed by text + taxonomy version)
+CREATE TABLE extraction_cache (
+    cache_key VARCHAR(64) PRIMARY KEY, -- sha256 of text hash, source, versions and options
+    text_hash VARCHAR(64) NOT NULL,
+    source VARCHAR(30) NOT NULL, -- project, resume, internship, course
+    taxonomy_version VARCHAR(64) NOT NULL, -- content hash of the skills table
+    extractor_version VARCHAR(100) NOT NULL,
+    matches JSONB NOT NULL, -- [{"skill_id": "uuid", "skill_name": "Python", "confidence": 0.9, ...}]
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Course → Skill Mappings (computed once per course, shared by all enrolled students)
+CREATE TABLE course_skills (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    course_id UUID NOT NULL REFERENCES courses(id) ON DELETE CASCADE,
+    skill_id UUID NOT NULL REFERENCES skills(id) ON DELETE CASCADE,
+    confidence DECIMAL(3,2) NOT NULL,
+    match_type VARCHAR(30) NOT NULL, -- course_code_pattern, course_name_keyword, syllabus_keyword
+    evidence_text TEXT
+);
+
+-- Skill Evidence (extracted once per source record, aggregated by scoring)
+CREATE TABLE skill_evidence (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    student_id UUID NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    skill_id UUID NOT NULL REFERENCES skills(id) ON DELETE CASCADE,
+    source_type VARCHAR(20) NOT NULL, -- project, certification, course, internship, assessment
+    source_id UUID NOT NULL,
+    confidence DECIMAL(5,4) NOT NULL, -- 0.0 to 1.0
+    evidence_date TIMESTAMP,
+    evidence_text TEXT
+);
+
+-- Version each student's stored evidence was fully built with
+CREATE TABLE evidence_sync (
+    student_id UUID PRIMARY KEY REFERENCES students(id) ON DELETE CASCADE,
+    evidence_version VARCHAR(64) NOT NULL, -- extractor + taxonomy + course mapping rules
+    synced_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Source records changed since their evidence was extracted
+CREATE TABLE evidence_changes (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    student_id UUID NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    source_type VARCHAR(20) NOT NULL, -- project, certification, course, internship, assessment
+    source_id UUID NOT NULL, -- record ID (course ID for enrollments)
+    changed_at TIMESTAMP DEFAULT NOW()
+);
+
+-- (student, skill) pairs whose evidence changed since their score was written
+CREATE TABLE skill_score_changes (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    student_id UUID NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    skill_id UUID NOT NULL REFERENCES skills(id) ON DELETE CASCADE,
+    changed_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Inputs each course's mappings were computed from; a mismatch triggers a remap
+CREATE TABLE course_skill_sync (
+    course_id UUID PRIMARY KEY REFERENCES courses(id) ON DELETE CASCADE,
+    rules_version VARCHAR(64) NOT NULL, -- hash of mapper rules + taxonomy version
+    source_hash VARCHAR(64) NOT NULL, -- hash of course code, name and syllabus URL
+    syllabus_hash VARCHAR(64), -- content hash of the last ingested syllabus file
+    syllabus_rules_version VARCHAR(64), -- rules version the syllabus matches were computed with
+    mapped_at TIMESTAMP DEFAULT NOW()
+);
+
 -- ================================================================
 -- INDEXES FOR PERFORMANCE
 -- ================================================================
@@ -205,7 +285,13 @@ CREATE INDEX idx_student_role_matches_student ON student_role_matches(student_id
 CREATE INDEX idx_student_role_matches_role ON student_role_matches(role_id);
 CREATE INDEX idx_skill_assessments_student ON skill_assessments(student_id);
 CREATE INDEX idx_courses_branch ON courses(branch);
+CREATE INDEX idx_skill_aliases_skill ON skill_aliases(skill_id);
 CREATE INDEX idx_industry_roles_category ON industry_roles(role_category);
+CREATE INDEX idx_extraction_cache_taxonomy ON extraction_cache(taxonomy_version);
+CREATE INDEX idx_course_skills_course ON course_skills(course_id);
+CREATE INDEX idx_skill_evidence_student_skill ON skill_evidence(student_id, skill_id); -- also serves student-only lookups
+CREATE INDEX idx_evidence_changes_student ON evidence_changes(student_id);
+CREATE INDEX idx_skill_score_changes_student ON skill_score_changes(student_id);
 
 -- JSONB indexes for filtering
 CREATE INDEX idx_skills_branches ON skills USING GIN (branches);
@@ -236,8 +322,14 @@ CREATE TRIGGER update_industry_roles_updated_at BEFORE UPDATE ON industry_roles
 
 COMMENT ON TABLE students IS 'Core student information and academic records';
 COMMENT ON TABLE skills IS 'Master skill taxonomy across all engineering branches';
+COMMENT ON TABLE skill_aliases IS 'Alternative skill names compiled into the exact-match extraction stage';
 COMMENT ON TABLE student_skills IS 'Actual student skill scores with evidence tracking';
 COMMENT ON TABLE industry_roles IS 'Industry role definitions with skill requirements';
 COMMENT ON TABLE student_role_matches IS 'Cached role match calculations for performance';
+COMMENT ON TABLE extraction_cache IS 'Cached NLP skill extraction results, invalidated by taxonomy version';
+COMMENT ON TABLE skill_evidence IS 'Stored skill evidence per source record; scoring aggregates it instead of re-running NLP';
+COMMENT ON TABLE evidence_changes IS 'Changed source records; only their evidence is re-extracted';
+COMMENT ON TABLE skill_score_changes IS 'Dirty (student, skill) pairs; only these scores and the role matches using them are recomputed';
+COMMENT ON TABLE course_skills IS 'Materialized course to skill mappings, recomputed when the course or mapping rules change';
 COMMENT ON COLUMN student_skills.evidence_sources IS 'Multi-source scoring: quiz 40%, project 35%, cert 25%';
 COMMENT ON COLUMN skills.benchmark_score IS 'Industry minimum acceptable score (default 70/100)';
@@ -0,0 +1,46 @@
+-- ================================================================
+-- SKILL ALIASES - COMMON ABBREVIATIONS AND SYNONYMS
+-- Engineering Skills Radar Seed Data
+-- Run after seed_skills.sql
+-- ================================================================
+
+INSERT INTO skill_aliases (skill_id, alias, alias_normalized)
+SELECT s.id, a.alias, LOWER(a.alias)
+FROM (VALUES
+    -- Computer Science & IT
+    ('Data Structures & Algorithms', 'DSA'),
+    ('Data Structures & Algorithms', 'Data Structures'),
+    ('Object-Oriented Programming', 'OOP'),
+    ('Object-Oriented Programming', 'OOPS'),
+    ('Database Management', 'DBMS'),
+    ('Database Management', 'RDBMS'),
+    ('Database Management', 'SQL'),
+    ('Database Management', 'PostgreSQL'),
+    ('Database Management', 'Postgres'),
+    ('Database Management', 'MySQL'),
+    ('Database Management', 'MongoDB'),
+    ('Web Development', 'Web Dev'),
+    ('Web Development', 'Frontend Development'),
+    ('Web Development', 'Backend Development'),
+    ('Web Development', 'Full Stack'),
+    ('Computer Networks', 'Computer Networking'),
+    ('Computer Networks', 'TCP/IP'),
+
+    -- Mechanical
+    ('CAD/CAM', 'SolidWorks'),
+    ('CAD/CAM', 'CATIA'),
+    ('Fluid Mechanics', 'CFD'),
+
+    -- Civil
+    ('AutoCAD/STAAD.Pro', 'AutoCAD'),
+    ('AutoCAD/STAAD.Pro', 'STAAD.Pro'),
+    ('AutoCAD/STAAD.Pro', 'STAAD Pro'),
+
+    -- Electrical & Electronics
+    ('Embedded Systems', 'Arduino'),
+    ('Embedded Systems', 'Raspberry Pi'),
+    ('Signal Processing', 'DSP'),
+    ('Control Systems', 'PID Control')
+) AS a(skill_name, alias)
+JOIN skills s ON s.skill_name = a.skill_name
+ON CONFLICT (alias_normalized) DO NOTHING;